@@ -0,0 +1,216 @@
+"""
+Admission Control
+Bounds how much work the chat endpoint takes on at once
+Up to max_concurrency requests run; up to max_queue more wait, each for at
+most queue_timeout_s. Anything beyond that is shed at once with a suggested
+Retry-After, so a traffic spike gets fast 503s instead of an ever-growing
+queue. Blocking (thread) and asyncio variants are provided.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+from settings import Settings
+
+# Weight of the latest request in the moving average of service time
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class Overloaded(RuntimeError):
+    """Raised when a request is shed; retry_after is the suggested wait in seconds"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Service overloaded ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _AdmissionStats(ABC):
+    """Limits and counters shared by both variants"""
+
+    def __init__(self, max_concurrency: Optional[int], max_queue: Optional[int], queue_timeout_s: Optional[float]):
+        self.max_concurrency = max_concurrency or Settings.SERVICE_MAX_CONCURRENCY
+        self.max_queue = Settings.SERVICE_MAX_QUEUE if max_queue is None else max_queue
+        self.queue_timeout_s = Settings.SERVICE_QUEUE_TIMEOUT_S if queue_timeout_s is None else queue_timeout_s
+        self.active = 0
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+        self.mean_service_s = 1.0
+
+    def _retry_after(self, waiting: int) -> int:
+        """Seconds until the queue ahead has likely drained"""
+        return max(1, math.ceil(self.mean_service_s * (waiting + 1) / self.max_concurrency))
+
+    def _shed(self, reason: str, waiting: int) -> Overloaded:
+        if reason == "queue full":
+            self.shed_queue_full += 1
+        else:
+            self.shed_timeout += 1
+        return Overloaded(reason, self._retry_after(waiting))
+
+    def _admit(self, wait_s: float) -> None:
+        self.active += 1
+        self.admitted += 1
+        self.total_wait_s += wait_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+
+    def _release(self, service_s: float) -> None:
+        self.active -= 1
+        self.mean_service_s += SERVICE_TIME_SMOOTHING * (service_s - self.mean_service_s)
+
+    @property
+    @abstractmethod
+    def queue_depth(self) -> int:
+        """Requests currently waiting for a slot"""
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Admission counters
+
+        Returns:
+            Dictionary with active, queue_depth, limits, admitted and shed
+            counts, and mean/max queue wait in milliseconds
+        """
+        return {
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+            "mean_wait_ms": round(self.total_wait_s / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "max_wait_ms": round(self.max_wait_s * 1000, 1)
+        }
+
+
+class AdmissionControl(_AdmissionStats):
+    """Thread-based admission control (for threaded HTTP servers)"""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout_s: Optional[float] = None
+    ):
+        """
+        Initialize the limits
+
+        Args:
+            max_concurrency: Requests run at once (defaults to Settings.SERVICE_MAX_CONCURRENCY)
+            max_queue: Requests allowed to wait (defaults to Settings.SERVICE_MAX_QUEUE)
+            queue_timeout_s: Longest a request may wait (defaults to Settings.SERVICE_QUEUE_TIMEOUT_S)
+        """
+        super().__init__(max_concurrency, max_queue, queue_timeout_s)
+        self._condition = threading.Condition()
+        self._waiting = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Hold a slot for the duration of the with block
+
+        Raises:
+            Overloaded: If the queue is full or the wait exceeded queue_timeout_s
+        """
+        start = time.perf_counter()
+        with self._condition:
+            if self.active >= self.max_concurrency or self._waiting:
+                if self._waiting >= self.max_queue:
+                    raise self._shed("queue full", self._waiting)
+                self._waiting += 1
+                try:
+                    admitted = self._condition.wait_for(
+                        lambda: self.active < self.max_concurrency, self.queue_timeout_s
+                    )
+                finally:
+                    self._waiting -= 1
+                if not admitted:
+                    raise self._shed("queue timeout", self._waiting)
+            admitted_at = time.perf_counter()
+            self._admit(admitted_at - start)
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._release(time.perf_counter() - admitted_at)
+                self._condition.notify()
+
+
+class AsyncAdmissionControl(_AdmissionStats):
+    """asyncio admission control; waiters are admitted first-come, first-served"""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout_s: Optional[float] = None
+    ):
+        """Same arguments as AdmissionControl"""
+        super().__init__(max_concurrency, max_queue, queue_timeout_s)
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the async with block
+
+        Raises:
+            Overloaded: If the queue is full or the wait exceeded queue_timeout_s
+        """
+        start = time.perf_counter()
+        if self.active >= self.max_concurrency or self.queue_depth:
+            waiting = self.queue_depth
+            if waiting >= self.max_queue:
+                raise self._shed("queue full", waiting)
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                # A released slot is handed straight to the waiter (see _hand_off)
+                await asyncio.wait({waiter}, timeout=self.queue_timeout_s)
+            except BaseException:
+                if waiter.done():
+                    # Cancelled just after being handed a slot: pass it on
+                    self.active -= 1
+                    self._hand_off()
+                else:
+                    waiter.cancel()
+                raise
+            if not waiter.done():
+                waiter.cancel()
+                raise self._shed("queue timeout", self.queue_depth)
+            self.active -= 1  # The hand-off already counted this request as active
+        admitted_at = time.perf_counter()
+        self._admit(admitted_at - start)
+
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - admitted_at)
+            self._hand_off()
+
+    def _hand_off(self) -> None:
+        while self._waiters and self.active < self.max_concurrency:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                waiter.set_result(None)
@@ -12,8 +12,15 @@ import sys
 sys.path.append(os.path.dirname(__file__))
 
 from settings import Settings
-from groq_client import generate_response
-from upstash_client import UpstashVectorClient
+from admission import AdmissionControl, Overloaded
+from chat_service import answer_question, stream_events
+from health import check_dependencies
+
+# Client disconnects surface as one of these when writing to the socket
+DISCONNECT_ERRORS = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+# Bounds concurrent answers (and their queue) when served by a threaded server
+admission = AdmissionControl()
 
 
 class handler(BaseHTTPRequestHandler):
@@ -31,35 +38,13 @@ class handler(BaseHTTPRequestHandler):
                 self.send_error(400, "Missing 'question' in request body")
                 return
             
-            # Initialize vector client (read-only)
-            vector_client = UpstashVectorClient(read_only=True)
-            
-            # Query vectors
-            results = vector_client.query_text(question, top_k=3)
-            
-            # Build context
-            context_docs = []
-            for result in results:
-                metadata = result.get('metadata', {})
-                content = metadata.get('content', '')
-                if content:
-                    context_docs.append(content)
-            
-            if not context_docs:
-                answer = "I don't have specific information about that topic."
-            else:
-                context = "\n\n".join(context_docs)
-                prompt = f"""Based on the following information about yourself, answer the question.
-Speak in first person.
-
-Your Information:
-{context}
-
-Question: {question}
-
-Provide a helpful, professional response:"""
+            with admission.admit():
+                # Server-Sent Events when asked for, via the Accept header or {"stream": true}
+                if data.get('stream') or 'text/event-stream' in self.headers.get('Accept', ''):
+                    self.stream_answer(question)
+                    return
                 
-                answer = generate_response(prompt, temperature=0.7, max_tokens=500)
+                response = answer_question(question)
             
             # Send response
             self.send_response(200)
@@ -67,22 +52,68 @@ Provide a helpful, professional response:"""
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            response = {
-                'answer': answer,
-                'sources': len(results)
-            }
-            
             self.wfile.write(json.dumps(response).encode('utf-8'))
             
+        except Overloaded as e:
+            print(f"🚦 Shed request: {e}")
+            self.send_response(503)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Retry-After', str(e.retry_after))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(json.dumps({'error': str(e)}).encode('utf-8'))
         except Exception as e:
             self.send_error(500, str(e))
     
+    def stream_answer(self, question: str):
+        """
+        Stream the answer as Server-Sent Events (see chat_service.stream_events)
+        If the client disconnects, the upstream Groq stream is closed.
+        """
+        events = stream_events(question)
+        # Retrieval runs before the headers go out, so its errors still become a 500
+        first_event = next(events)
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        
+        try:
+            self.send_event(*first_event)
+            for event, data in events:
+                self.send_event(event, data)
+        except DISCONNECT_ERRORS:
+            print("🔌 Client disconnected, cancelling the Groq stream")
+        except Exception as e:
+            # The 200 is already out, so do_POST's send_error would corrupt the stream
+            print(f"❌ Stream failed: {e}")
+            try:
+                self.send_event('error', {'message': str(e)})
+            except DISCONNECT_ERRORS:
+                pass
+        finally:
+            events.close()
+    
+    def send_event(self, event: str, data: dict):
+        """Write one Server-Sent Event and flush it to the client"""
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+    
     def do_GET(self):
-        """Health check"""
+        """Health check (dependency probes are cached for HEALTH_CACHE_TTL_S)"""
+        dependencies = check_dependencies()
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
         self.end_headers()
-        self.wfile.write(json.dumps({'status': 'ok', 'service': 'Digital Twin API'}).encode('utf-8'))
+        self.wfile.write(json.dumps({
+            'status': dependencies['status'],
+            'service': 'Digital Twin API',
+            'admission': admission.stats(),
+            'dependencies': dependencies
+        }).encode('utf-8'))
     
     def do_OPTIONS(self):
         """Handle CORS preflight"""
@@ -0,0 +1,111 @@
+"""
+Import-Time Benchmark
+Measures the cold import time of each entry module in a fresh interpreter
+(python -X importtime) and fails when one exceeds its budget or pulls in an
+SDK that should only load on first use
+
+Usage:
+    python benchmark_imports.py
+    python benchmark_imports.py --repeat 10 --top 15
+    python benchmark_imports.py --budget chat_server=150
+
+Exits with status 1 when a budget is exceeded, so it can gate CI.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Cumulative import time allowed per entry module, in milliseconds (with
+# headroom for slower machines; chat_server took ~330ms with eager SDK imports)
+IMPORT_BUDGET_MS: Dict[str, float] = {
+    "settings": 25,
+    "chat_service": 125,
+    "api.chat": 150,
+    "chat_server": 150,
+    "digital_twin_mcp_server": 150,
+}
+
+# Loaded on first use only; importing an entry module must not pull these in
+DEFERRED_MODULES = ("groq", "httpx", "numpy", "upstash_vector", "tiktoken")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_once(module: str) -> Tuple[float, Dict[str, float], List[str]]:
+    """
+    Import a module in a fresh interpreter
+
+    Returns:
+        (total ms, {module: self ms}, deferred modules that were loaded)
+    """
+    check = f"import sys; import {module}; print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        cwd=HERE, capture_output=True, text=True
+    )
+    if result.returncode:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    total_ms = 0.0
+    self_ms: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        self_ms[name.strip()] = int(own) / 1000
+        if name.strip() == module:
+            total_ms = int(cumulative) / 1000
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return total_ms, self_ms, loaded
+
+
+def run_module(module: str, repeat: int, top: int) -> Tuple[float, List[str]]:
+    """Median import time over repeat runs; prints the slowest modules"""
+    runs = [import_once(module) for _ in range(repeat)]
+    median_ms = statistics.median(total for total, _, _ in runs)
+    _, self_ms, loaded = min(runs, key=lambda run: abs(run[0] - median_ms))
+
+    print(f"\n📦 {module}: {median_ms:.1f}ms (median of {repeat})")
+    for name, ms in sorted(self_ms.items(), key=lambda item: -item[1])[:top]:
+        print(f"   {ms:>7.1f}ms  {name}")
+    return median_ms, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold import time of the entry modules")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per module (the median is reported)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest modules to list per entry module")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS",
+                        help="Override a budget (repeatable)")
+    args = parser.parse_args()
+
+    budgets = dict(IMPORT_BUDGET_MS)
+    for override in args.budget:
+        module, _, ms = override.partition("=")
+        budgets[module] = float(ms)
+
+    rows = []
+    for module, budget_ms in budgets.items():
+        median_ms, loaded = run_module(module, args.repeat, args.top)
+        rows.append((module, median_ms, budget_ms, loaded))
+
+    print("\n" + "=" * 60)
+    print("📊 Import time vs budget")
+    print("=" * 60)
+    failed = 0
+    width = max(len(module) for module, *_ in rows)
+    for module, median_ms, budget_ms, loaded in rows:
+        ok = median_ms <= budget_ms and not loaded
+        failed += not ok
+        note = f"  loads {', '.join(loaded)}" if loaded else ""
+        print(f"{'✅' if ok else '❌'} {module:<{width}} {median_ms:>7.1f}ms / {budget_ms:.0f}ms{note}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Cache Utilities
+Thread-safe, size-bounded LRU cache with per-entry TTL
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU cache whose entries also expire after ttl_seconds
+    Reads refresh recency but not age, so an entry is never served past its TTL.
+    Hit, miss and eviction counters are kept for reporting.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = 300.0):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Entry lifetime in seconds (None = never expires)
+
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at is None or time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, expires_in: Optional[float] = None) -> None:
+        """
+        Store value under key, evicting the least recently used entry if full
+
+        Args:
+            key: Cache key
+            value: Value to store
+            expires_in: Lifetime of this entry in seconds (defaults to ttl_seconds)
+        """
+        lifetime = self.ttl_seconds if expires_in is None else expires_in
+        expires_at = None if lifetime is None else time.monotonic() + lifetime
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters
+
+        Returns:
+            Dictionary with size, hits, misses, evictions and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,320 @@
+"""
+Chat Server
+Long-running ASGI service for the /api/chat contract
+Clients are built once at startup and shared by every request; requests run
+concurrently up to SERVICE_MAX_CONCURRENCY with a bounded wait queue beyond
+that (excess load gets a 503 with Retry-After), and shutdown waits for
+in-flight answers to finish. Admission counters are served at /metrics.
+Health reports cached dependency probes, refreshed in the background when
+stale, so polling it never waits on Groq or the vector database. The
+serverless handler in api/chat.py serves the same contract through
+chat_service.
+
+Run with: python chat_server.py [--host 0.0.0.0] [--port 8000] [--workers 2]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from admission import AsyncAdmissionControl, Overloaded
+from chat_service import answer_question_async, stream_events_async
+from groq_client import close_async_groq_client, get_async_groq_client
+from health import cached_status, check_dependencies, is_stale, print_health
+from settings import Settings
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+SERVICE_NAME = "Digital Twin API"
+
+CORS_HEADERS: List[Tuple[bytes, bytes]] = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+    (b"access-control-allow-headers", b"Content-Type"),
+]
+
+
+class ChatServer:
+    """
+    ASGI application serving POST /api/chat (JSON or Server-Sent Events),
+    GET /health and GET /api/chat (health) and GET /metrics (Prometheus text)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        shutdown_grace_s: Optional[float] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout_s: Optional[float] = None
+    ):
+        """
+        Initialize the application
+
+        Args:
+            max_concurrency: Requests answered at once; later ones wait
+                (defaults to Settings.SERVICE_MAX_CONCURRENCY)
+            shutdown_grace_s: Seconds shutdown waits for in-flight requests
+                (defaults to Settings.SHUTDOWN_GRACE_S)
+            max_queue: Requests allowed to wait for a slot; more are shed
+                (defaults to Settings.SERVICE_MAX_QUEUE)
+            queue_timeout_s: Longest a request may wait before it is shed
+                (defaults to Settings.SERVICE_QUEUE_TIMEOUT_S)
+        """
+        self.admission = AsyncAdmissionControl(max_concurrency, max_queue, queue_timeout_s)
+        self.max_concurrency = self.admission.max_concurrency
+        self.shutdown_grace_s = Settings.SHUTDOWN_GRACE_S if shutdown_grace_s is None else shutdown_grace_s
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.in_flight = 0
+        self.served = 0
+        self.draining = False
+        self.started_at = time.time()
+        self._health_refresh: Optional[asyncio.Future] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"].rstrip("/") or "/"
+        method = scope["method"]
+        if method == "OPTIONS":
+            await _send_response(send, 200, b"", [])
+        elif method == "GET" and path in ("/health", "/api/health", "/api/chat"):
+            self._refresh_dependencies()
+            await _send_json(send, 200 if not self.draining else 503, self.health())
+        elif method == "GET" and path == "/metrics":
+            await _send_response(send, 200, self.metrics().encode("utf-8"), [
+                (b"content-type", b"text/plain; version=0.0.4")
+            ])
+        elif method == "POST" and path == "/api/chat":
+            await self._chat(scope, receive, send)
+        else:
+            await _send_json(send, 404, {"error": "Not found"})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def startup(self) -> None:
+        """Probe dependencies (in parallel) and build the shared clients before the first request"""
+        start_time = time.time()
+        Settings.warn_if_missing()
+        try:
+            # The vector probe also builds the shared read-only vector client
+            print_health(await asyncio.to_thread(check_dependencies))
+            if Settings.GROQ_API_KEY:
+                get_async_groq_client()
+            print(f"✅ Chat service ready in {(time.time() - start_time) * 1000:.0f}ms "
+                  f"(max {self.max_concurrency} concurrent requests)")
+        except Exception as e:
+            # Still serve; requests retry the client setup and health reports the problem
+            print(f"⚠️ Client warm-up failed: {e}")
+
+    async def shutdown(self) -> None:
+        """Stop accepting chats, wait for in-flight ones, then close clients"""
+        self.draining = True
+        if self.in_flight:
+            print(f"⏳ Draining {self.in_flight} in-flight request(s)...")
+            try:
+                await asyncio.wait_for(self._idle.wait(), self.shutdown_grace_s)
+            except asyncio.TimeoutError:
+                print(f"⚠️ {self.in_flight} request(s) still running after {self.shutdown_grace_s}s")
+        await close_async_groq_client()
+        print("👋 Chat service stopped")
+
+    def _refresh_dependencies(self) -> None:
+        """Re-probe stale dependencies in the background; health serves the cached result meanwhile"""
+        if (self._health_refresh is None or self._health_refresh.done()) and is_stale():
+            self._health_refresh = asyncio.ensure_future(asyncio.to_thread(check_dependencies))
+
+    def health(self) -> Dict[str, Any]:
+        """Service status and the cached dependency probes, without calling any upstream"""
+        dependencies = cached_status()
+        if self.draining:
+            status = "draining"
+        else:
+            status = "degraded" if dependencies["status"] == "degraded" else "ok"
+        return {
+            "status": status,
+            "service": SERVICE_NAME,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "served": self.served,
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "admission": self.admission.stats(),
+            "dependencies": dependencies
+        }
+
+    def metrics(self) -> str:
+        """Admission counters in the Prometheus text format"""
+        stats = self.admission.stats()
+        return "".join(f"{line}\n" for line in [
+            "# TYPE digital_twin_requests_active gauge",
+            f"digital_twin_requests_active {stats['active']}",
+            "# TYPE digital_twin_queue_depth gauge",
+            f"digital_twin_queue_depth {stats['queue_depth']}",
+            "# TYPE digital_twin_requests_admitted_total counter",
+            f"digital_twin_requests_admitted_total {stats['admitted']}",
+            "# TYPE digital_twin_requests_shed_total counter",
+            f'digital_twin_requests_shed_total{{reason="queue_full"}} {stats["shed_queue_full"]}',
+            f'digital_twin_requests_shed_total{{reason="queue_timeout"}} {stats["shed_timeout"]}',
+            "# TYPE digital_twin_queue_wait_seconds gauge",
+            f'digital_twin_queue_wait_seconds{{stat="mean"}} {stats["mean_wait_ms"] / 1000}',
+            f'digital_twin_queue_wait_seconds{{stat="max"}} {stats["max_wait_ms"] / 1000}',
+        ])
+
+    async def _chat(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.draining:
+            await _send_json(send, 503, {"error": "Service is shutting down"})
+            return
+
+        try:
+            data = json.loads(await _read_body(receive) or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            await _send_json(send, 400, {"error": "Invalid JSON body"})
+            return
+        question = data.get("question", "") if isinstance(data, dict) else ""
+        if not question:
+            await _send_json(send, 400, {"error": "Missing 'question' in request body"})
+            return
+
+        accept = dict(scope.get("headers", [])).get(b"accept", b"").decode("latin-1")
+        stream = data.get("stream") or "text/event-stream" in accept
+
+        self.in_flight += 1
+        self._idle.clear()
+        try:
+            async with self.admission.admit():
+                if stream:
+                    await self._stream(question, receive, send)
+                else:
+                    await _send_json(send, 200, await answer_question_async(question))
+            self.served += 1
+        except Overloaded as e:
+            print(f"🚦 Shed request: {e}")
+            await _send_json(send, 503, {"error": str(e)}, [(b"retry-after", str(e.retry_after).encode())])
+        except Exception as e:
+            print(f"❌ Chat request failed: {e}")
+            await _send_json(send, 500, {"error": str(e)})
+        finally:
+            self.in_flight -= 1
+            if not self.in_flight:
+                self._idle.set()
+
+    async def _stream(self, question: str, receive: Receive, send: Send) -> None:
+        """Send the answer as Server-Sent Events; a client disconnect cancels generation"""
+        events = stream_events_async(question)
+        try:
+            # Retrieval runs before the response starts, so its errors still become a 500
+            first_event = await events.__anext__()
+            await _send_response(send, 200, None, [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ])
+
+            async def pump() -> None:
+                await _send_event(send, *first_event)
+                async for event, data in events:
+                    await _send_event(send, event, data)
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+            writer = asyncio.ensure_future(pump())
+            disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+            try:
+                await asyncio.wait({writer, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+                if not writer.done():
+                    print("🔌 Client disconnected, cancelling the Groq stream")
+                    writer.cancel()
+                await asyncio.wait({writer})
+                # The response has started, so a failure can only be logged
+                if not writer.cancelled() and writer.exception():
+                    print(f"❌ Stream failed: {writer.exception()}")
+            finally:
+                disconnect.cancel()
+        finally:
+            await events.aclose()
+
+
+async def _read_body(receive: Receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return body
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _wait_for_disconnect(receive: Receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _send_response(send: Send, status: int, body: Optional[bytes], headers: List[Tuple[bytes, bytes]]) -> None:
+    """Start a response; body None leaves it open for streaming"""
+    await send({"type": "http.response.start", "status": status, "headers": headers + CORS_HEADERS})
+    if body is not None:
+        await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send: Send, status: int, data: Dict[str, Any], headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+    body = json.dumps(data).encode("utf-8")
+    await _send_response(send, status, body, [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ] + (headers or []))
+
+
+async def _send_event(send: Send, event: str, data: Dict[str, Any]) -> None:
+    message = f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+    await send({"type": "http.response.body", "body": message, "more_body": True})
+
+
+app = ChatServer()
+
+
+def main() -> int:
+    """Serve the app with uvicorn"""
+    parser = argparse.ArgumentParser(description="Digital Twin chat service")
+    parser.add_argument("--host", default=Settings.SERVICE_HOST, help="Listen address (SERVICE_HOST)")
+    parser.add_argument("--port", type=int, default=Settings.PORT, help="Listen port (PORT)")
+    parser.add_argument("--workers", type=int, default=Settings.WEB_CONCURRENCY, help="Worker processes (WEB_CONCURRENCY)")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ uvicorn is not installed. Install it with: pip install uvicorn")
+        return 1
+
+    print(f"🚀 Starting chat service on {args.host}:{args.port} ({args.workers} worker(s))")
+    uvicorn.run(
+        "chat_server:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        lifespan="on",
+        timeout_graceful_shutdown=int(Settings.SHUTDOWN_GRACE_S)
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
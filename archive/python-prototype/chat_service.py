@@ -0,0 +1,171 @@
+"""
+Chat Service
+The /api/chat request logic shared by the serverless handler (api/chat.py)
+and the long-running ASGI service (chat_server.py)
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from context_packer import RAG_PROMPT_TEMPLATE, PackedPrompt, pack_context
+from groq_client import (
+    DEFAULT_SYSTEM_PROMPT, generate_response, generate_response_async,
+    generate_response_streaming, generate_response_streaming_async
+)
+from streaming import StreamMetrics, coalesce_chunks, coalesce_chunks_async
+from vector_clients import get_vector_client
+
+NO_CONTEXT_ANSWER = "I don't have specific information about that topic."
+
+TEMPERATURE = 0.7
+MAX_TOKENS = 500
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+def retrieve_context(question: str) -> Tuple[List[Dict], Optional[PackedPrompt]]:
+    """
+    Query the shared vector client and pack the best chunks into the token budget
+
+    Returns:
+        (results, packed prompt); the prompt is None when nothing usable was found
+    """
+    # Shared read-only vector client (built once per process)
+    vector_client = get_vector_client(read_only=True)
+
+    # Query vectors
+    results = vector_client.query_text(question, top_k=3)
+
+    # Build context
+    context_docs = []
+    for result in results:
+        metadata = result.get('metadata', {})
+        content = metadata.get('content', '')
+        if content:
+            context_docs.append((result.get('score', 0), content))
+
+    if not context_docs:
+        return results, None
+
+    # Best chunks first, within the input-token budget
+    return results, pack_context(question, context_docs, system_prompt=DEFAULT_SYSTEM_PROMPT, template=RAG_PROMPT_TEMPLATE)
+
+
+def _response_body(answer: str, results: List[Dict], packed: Optional[PackedPrompt]) -> Dict[str, Any]:
+    return {
+        'answer': answer,
+        'sources': len(results),
+        'prompt_tokens': packed.total_tokens if packed else 0
+    }
+
+
+def _sources_event(results: List[Dict], packed: Optional[PackedPrompt]) -> Event:
+    return 'sources', {
+        'sources': [
+            {'id': result.get('id'), 'title': result.get('metadata', {}).get('title', ''), 'score': result.get('score', 0)}
+            for result in results
+        ],
+        'prompt_tokens': packed.total_tokens if packed else 0
+    }
+
+
+def _done_event(start: float, retrieval_ms: float, metrics: List[StreamMetrics]) -> Event:
+    ttft_s = metrics[0].ttft_s if metrics else None
+    return 'done', {
+        'retrieval_ms': round(retrieval_ms, 1),
+        'ttft_ms': round(ttft_s * 1000, 1) if ttft_s is not None else None,
+        'total_ms': round((time.perf_counter() - start) * 1000, 1),
+        'tokens_per_second': round(metrics[0].tokens_per_second, 1) if metrics else 0.0
+    }
+
+
+def answer_question(question: str) -> Dict[str, Any]:
+    """
+    Answer a question in one piece
+
+    Returns:
+        JSON body with answer, sources (count) and prompt_tokens
+    """
+    results, packed = retrieve_context(question)
+    if packed is None:
+        return _response_body(NO_CONTEXT_ANSWER, results, packed)
+    answer = generate_response(packed.prompt, temperature=TEMPERATURE, max_tokens=MAX_TOKENS)
+    return _response_body(answer, results, packed)
+
+
+async def answer_question_async(question: str) -> Dict[str, Any]:
+    """Same as answer_question, without blocking the event loop"""
+    results, packed = await asyncio.to_thread(retrieve_context, question)
+    if packed is None:
+        return _response_body(NO_CONTEXT_ANSWER, results, packed)
+    answer = await generate_response_async(packed.prompt, temperature=TEMPERATURE, max_tokens=MAX_TOKENS)
+    return _response_body(answer, results, packed)
+
+
+def stream_events(question: str) -> Iterator[Event]:
+    """
+    Answer a question as a stream of (event, data) pairs
+    Events: "sources" (retrieved chunks), "token" (answer text; the first
+    chunk at once, later ones batched to cut writes), then "done" with
+    timings, or "error" if generation fails. Closing the iterator closes the
+    upstream Groq stream.
+
+    Args:
+        question: User's question
+
+    Yields:
+        (event name, JSON-serialisable data)
+    """
+    start = time.perf_counter()
+    results, packed = retrieve_context(question)
+    retrieval_ms = (time.perf_counter() - start) * 1000
+    yield _sources_event(results, packed)
+
+    metrics = []
+    chunks = iter([NO_CONTEXT_ANSWER])
+    try:
+        if packed is not None:
+            chunks = coalesce_chunks(generate_response_streaming(
+                packed.prompt, temperature=TEMPERATURE, max_tokens=MAX_TOKENS, on_metrics=metrics.append
+            ))
+        for chunk in chunks:
+            yield 'token', {'text': chunk}
+    except Exception as e:
+        yield 'error', {'message': str(e)}
+        return
+    finally:
+        # Stops an unfinished generation instead of paying for unread tokens
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+
+    yield _done_event(start, retrieval_ms, metrics)
+
+
+async def stream_events_async(question: str) -> AsyncIterator[Event]:
+    """Same as stream_events, without blocking the event loop"""
+    start = time.perf_counter()
+    results, packed = await asyncio.to_thread(retrieve_context, question)
+    retrieval_ms = (time.perf_counter() - start) * 1000
+    yield _sources_event(results, packed)
+
+    if packed is None:
+        yield 'token', {'text': NO_CONTEXT_ANSWER}
+        yield _done_event(start, retrieval_ms, [])
+        return
+
+    metrics = []
+    chunks = coalesce_chunks_async(generate_response_streaming_async(
+        packed.prompt, temperature=TEMPERATURE, max_tokens=MAX_TOKENS, on_metrics=metrics.append
+    ))
+    try:
+        async for chunk in chunks:
+            yield 'token', {'text': chunk}
+    except Exception as e:
+        yield 'error', {'message': str(e)}
+        return
+    finally:
+        await chunks.aclose()
+
+    yield _done_event(start, retrieval_ms, metrics)
@@ -0,0 +1,77 @@
+"""
+Client Registry
+Process-wide, lazily created client singletons
+Building a Groq or Upstash client per call pays for TLS handshakes and
+object setup every time; the registry hands out one warm client per name
+and replaces it when the credentials it was built from change.
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def credentials_fingerprint(*values: Optional[str]) -> str:
+    """Stable digest of the settings a client was built from (secrets are never stored)"""
+    digest = hashlib.sha256()
+    for value in values:
+        digest.update((value or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ClientRegistry:
+    """
+    Thread-safe registry of lazily constructed clients
+    Each entry remembers the fingerprint of the settings used to build it.
+    Asking for a name with a different fingerprint builds a fresh client;
+    the old one is dropped rather than closed, since other threads may
+    still be using it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, Tuple[str, Any]] = {}
+
+    def get(self, name: str, factory: Callable[[], Any], fingerprint: str = "") -> Any:
+        """
+        Return the client registered under name, creating it if needed
+
+        Args:
+            name: Registry key (e.g. "groq", "vector:ro")
+            factory: Zero-argument callable that builds the client
+            fingerprint: Digest of the settings the client depends on
+
+        Returns:
+            The shared client instance
+        """
+        entry = self._clients.get(name)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+
+        with self._lock:
+            # Another thread may have built it while we waited for the lock
+            entry = self._clients.get(name)
+            if entry is not None and entry[0] == fingerprint:
+                return entry[1]
+
+            client = factory()
+            self._clients[name] = (fingerprint, client)
+            return client
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Drop one client, or every client if name is None
+
+        Args:
+            name: Registry key to drop (all keys when omitted)
+        """
+        with self._lock:
+            if name is None:
+                self._clients.clear()
+            else:
+                self._clients.pop(name, None)
+
+
+# Shared by every module in the process
+registry = ClientRegistry()
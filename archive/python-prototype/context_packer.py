@@ -0,0 +1,146 @@
+"""
+Context Packer
+Builds RAG prompts within an input-token budget
+Retrieved chunks are added best-score first until the budget is reached; the
+system prompt, prompt template and question are always kept whole.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+from settings import Settings
+
+# Llama 3 averages about 4 characters per token on English text
+CHARS_PER_TOKEN = 4.0
+
+# Chat formatting tokens added around each message (role headers, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+CHUNK_SEPARATOR = "\n\n"
+
+RAG_PROMPT_TEMPLATE = """Based on the following information about yourself, answer the question.
+Speak in first person as if you are describing your own background.
+
+Your Information:
+{context}
+
+Question: {question}
+
+Provide a helpful, professional response:"""
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    # Imported on first count so cold starts skip it
+    try:
+        import tiktoken
+    except ImportError:  # Optional: fall back to a character-based estimate
+        return None
+    # Groq's Llama models use a tiktoken-style BPE; cl100k_base is the closest public match
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """
+    Count (or estimate) the tokens text uses for a model
+
+    Args:
+        text: Text to measure
+        model: Target model name
+
+    Returns:
+        Token count: exact BPE count when tiktoken is installed, otherwise
+        a characters-per-token estimate
+    """
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = "") -> str:
+    """
+    Shorten text to about max_tokens, keeping its beginning and its end
+    The end usually holds the question, so the middle is dropped instead.
+
+    Args:
+        text: Text to shorten
+        max_tokens: Token limit
+        model: Target model name
+
+    Returns:
+        text unchanged if it fits, otherwise head + " ... " + tail
+    """
+    tokens = count_tokens(text, model)
+    if tokens <= max_tokens:
+        return text
+
+    keep_chars = int(len(text) * max_tokens / tokens) // 2
+    return f"{text[:keep_chars]}\n...\n{text[len(text) - keep_chars:]}"
+
+
+@dataclass
+class PackedPrompt:
+    """A prompt built within a token budget, with its token accounting"""
+    prompt: str
+    system_tokens: int
+    prompt_tokens: int
+    budget: int
+    chunks_used: int
+    chunks_dropped: int
+
+    @property
+    def total_tokens(self) -> int:
+        return self.system_tokens + self.prompt_tokens + 2 * MESSAGE_OVERHEAD_TOKENS
+
+
+def pack_context(
+    question: str,
+    chunks: Sequence[Tuple[float, str]],
+    system_prompt: str = "",
+    template: str = RAG_PROMPT_TEMPLATE,
+    budget: Optional[int] = None,
+    model: str = ""
+) -> PackedPrompt:
+    """
+    Build a RAG prompt from the highest-scoring chunks that fit the budget
+
+    Args:
+        question: User question (always included)
+        chunks: (score, text) pairs of retrieved context, in any order
+        system_prompt: System prompt the request will be sent with (always included)
+        template: Prompt template with {context} and {question} placeholders
+        budget: Input-token budget for system prompt + prompt
+            (defaults to Settings.CONTEXT_TOKEN_BUDGET)
+        model: Target model name, for token counting
+
+    Returns:
+        PackedPrompt with the prompt text and token counts
+    """
+    budget = Settings.CONTEXT_TOKEN_BUDGET if budget is None else budget
+    system_tokens = count_tokens(system_prompt, model)
+    base_tokens = count_tokens(template.format(context="", question=question), model)
+    remaining = budget - system_tokens - base_tokens - 2 * MESSAGE_OVERHEAD_TOKENS
+    separator_tokens = count_tokens(CHUNK_SEPARATOR, model)
+
+    selected = []
+    for score, text in sorted(chunks, key=lambda chunk: chunk[0], reverse=True):
+        cost = count_tokens(text, model) + (separator_tokens if selected else 0)
+        # A long chunk that does not fit is skipped; a shorter, lower-score one still may
+        if cost <= remaining:
+            selected.append(text)
+            remaining -= cost
+
+    prompt = template.format(context=CHUNK_SEPARATOR.join(selected), question=question)
+    return PackedPrompt(
+        prompt=prompt,
+        system_tokens=system_tokens,
+        prompt_tokens=count_tokens(prompt, model),
+        budget=budget,
+        chunks_used=len(selected),
+        chunks_dropped=len(chunks) - len(selected)
+    )
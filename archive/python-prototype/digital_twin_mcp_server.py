@@ -7,16 +7,30 @@ Professional implementation with modular architecture
 
 import json
 import time
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # Import our modular clients
 from settings import Settings
-from groq_client import generate_response, validate_groq_connection
+from context_packer import PackedPrompt, pack_context
+from groq_client import (
+    DEFAULT_SYSTEM_PROMPT, generate_response, generate_response_streaming
+)
+from health import check_dependencies, print_health
+from profile_chunker import chunk_profile
 from upstash_client import UpstashVectorClient
+from vector_clients import get_vector_client
+from semantic_cache import SemanticCache, get_semantic_cache, profile_fingerprint
+from single_flight import SingleFlight
+from streaming import coalesce_chunks
 
 # Constants
 JSON_FILE = "digitaltwin.json"
 DEFAULT_MODEL = "llama-3.1-8b-instant"
+NO_RESULTS_MESSAGE = "I don't have specific information about that topic. The profile may need to be uploaded to the vector database first."
+NO_CONTENT_MESSAGE = "I found some information but couldn't extract details. Please try rephrasing your question."
+
+# Concurrent identical questions share one retrieval and one generation
+_rag_flight = SingleFlight()
 
 
 def setup_vector_database() -> Optional[UpstashVectorClient]:
@@ -30,8 +44,9 @@ def setup_vector_database() -> Optional[UpstashVectorClient]:
     print("🔄 Setting up Upstash Vector database...")
     
     try:
-        # Use read-write client for setup
-        client = UpstashVectorClient(read_only=False)
+        # Use the shared read-write client for setup (Upstash or local, per VECTOR_BACKEND),
+        # so a local index loaded here is the one the health probe and chat service read
+        client = get_vector_client(read_only=False)
         
         # Check current vector count
         info = client.info()
@@ -49,13 +64,15 @@ def setup_vector_database() -> Optional[UpstashVectorClient]:
                 print(f"❌ {JSON_FILE} not found!")
                 return None
             
-            # Prepare vectors from content chunks
+            # Prepare vectors from content chunks, or chunk a structured profile by its schema
             vectors = []
             content_chunks = profile_data.get('content_chunks', [])
             
             if not content_chunks:
-                print("❌ No content chunks found in profile data")
-                return None
+                vectors = chunk_profile(profile_data)
+                if not vectors:
+                    print("❌ No content chunks found in profile data")
+                    return None
             
             for chunk in content_chunks:
                 enriched_text = f"{chunk['title']}: {chunk['content']}"
@@ -75,6 +92,10 @@ def setup_vector_database() -> Optional[UpstashVectorClient]:
             # Upload vectors
             client.upsert_texts(vectors)
             print(f"✅ Successfully uploaded {len(vectors)} content chunks!")
+            
+            # Persist the local index so later boots map it instead of re-embedding
+            if getattr(client, 'path', None):
+                client.save()
         
         print("✅ Vector database ready!")
         return client
@@ -115,70 +136,203 @@ def query_vectors(
 def rag_query(
     vector_client: UpstashVectorClient,
     question: str,
-    model: str = DEFAULT_MODEL
+    model: str = DEFAULT_MODEL,
+    use_cache: bool = True
 ) -> str:
     """
     Perform RAG query using Upstash Vector + Groq
+    Near-duplicate questions are answered from the semantic cache when enabled,
+    and identical questions already in flight share one retrieval and one
+    generation.
     
     Args:
         vector_client: UpstashVectorClient instance  
         question: User's question
         model: Groq model to use
+        use_cache: Set False to bypass the semantic cache for this question
         
     Returns:
         Generated response string
     """
-    start_time = time.time()
-    
     try:
-        # Step 1: Query vector database
-        print(f"\n🔍 Searching for: '{question}'")
-        results = query_vectors(vector_client, question, top_k=3)
-        
-        if not results or len(results) == 0:
-            return "I don't have specific information about that topic. The profile may need to be uploaded to the vector database first."
-        
-        # Step 2: Extract relevant content
-        print("🧠 Analyzing your professional profile...")
-        
-        top_docs = []
-        for result in results:
-            metadata = result.get('metadata', {})
-            title = metadata.get('title', 'Information')
-            content = metadata.get('content', '')
-            score = result.get('score', 0)
-            
-            print(f"  📄 {title} (relevance: {score:.3f})")
-            if content:
-                top_docs.append(f"{title}: {content}")
-        
-        if not top_docs:
-            return "I found some information but couldn't extract details. Please try rephrasing your question."
+        cache = get_semantic_cache() if use_cache else None
+        profile = profile_fingerprint(JSON_FILE) if cache else ""
+        if cache:
+            cached_answer = cache.lookup(question, model, profile)
+            if cached_answer is not None:
+                return cached_answer
         
-        # Step 3: Generate response with context
-        print("⚡ Generating personalized response with Groq...")
-        
-        context = "\n\n".join(top_docs)
-        prompt = f"""Based on the following information about yourself, answer the question.
-Speak in first person as if you are describing your own background.
+        flight_key = (" ".join(question.split()).casefold(), model, id(vector_client), use_cache)
+        return _rag_flight.do(
+            flight_key,
+            lambda: _answer_question(vector_client, question, model, cache, profile)
+        )
+    
+    except Exception as e:
+        print(f"❌ Error during RAG query: {e}")
+        return f"An error occurred while processing your question: {e}"
 
-Your Information:
-{context}
 
-Question: {question}
+def _answer_question(
+    vector_client: UpstashVectorClient,
+    question: str,
+    model: str,
+    cache: Optional[SemanticCache],
+    profile: str
+) -> str:
+    """Retrieve context and generate an answer (the uncached part of rag_query)"""
+    start_time = time.time()
+    
+    _, packed, fallback = _retrieve_context(vector_client, question, model)
+    if packed is None:
+        return fallback
+    
+    print("⚡ Generating personalized response with Groq...")
+    response = generate_response(packed.prompt, model=model)
+    
+    duration = time.time() - start_time
+    print(f"✓ Response generated in {duration:.2f}s\n")
+    
+    if cache:
+        cache.store(question, response, model, duration, profile)
+    return response
 
-Provide a helpful, professional response:"""
-        
-        response = generate_response(prompt, model=model)
+
+def _retrieve_context(
+    vector_client: UpstashVectorClient,
+    question: str,
+    model: str
+) -> Tuple[List[Dict[str, Any]], Optional[PackedPrompt], str]:
+    """
+    Query the vector database and pack the best chunks into the token budget
+    
+    Returns:
+        (sources, packed prompt, fallback answer); the prompt is None and the
+        fallback answer set when nothing usable was retrieved
+    """
+    # Step 1: Query vector database
+    print(f"\n🔍 Searching for: '{question}'")
+    results = query_vectors(vector_client, question, top_k=3)
+    
+    if not results or len(results) == 0:
+        return [], None, NO_RESULTS_MESSAGE
+    
+    # Step 2: Extract relevant content
+    print("🧠 Analyzing your professional profile...")
+    
+    sources = []
+    top_docs = []
+    for result in results:
+        metadata = result.get('metadata', {})
+        title = metadata.get('title', 'Information')
+        content = metadata.get('content', '')
+        score = result.get('score', 0)
         
-        duration = time.time() - start_time
-        print(f"✓ Response generated in {duration:.2f}s\n")
+        print(f"  📄 {title} (relevance: {score:.3f})")
+        if content:
+            sources.append({"id": result.get('id'), "title": title, "score": score})
+            top_docs.append((score, f"{title}: {content}"))
+    
+    if not top_docs:
+        return [], None, NO_CONTENT_MESSAGE
+    
+    # Step 3: Pack the best chunks into the token budget
+    packed = pack_context(question, top_docs, system_prompt=DEFAULT_SYSTEM_PROMPT, model=model)
+    print(
+        f"📏 Prompt: {packed.total_tokens}/{packed.budget} tokens "
+        f"({packed.chunks_used} chunks, {packed.chunks_dropped} dropped)"
+    )
+    return sources, packed, ""
+
+
+def rag_query_stream(
+    vector_client: UpstashVectorClient,
+    question: str,
+    model: str = DEFAULT_MODEL,
+    use_cache: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of rag_query
+    Retrieval runs first and its sources are yielded as a leading event; the
+    answer then streams token by token, so output starts after the time to
+    first token instead of after the whole generation.
+    
+    Args:
+        vector_client: UpstashVectorClient instance
+        question: User's question
+        model: Groq model to use
+        use_cache: Set False to bypass the semantic and response caches
         
-        return response
+    Yields:
+        {"event": "sources", "sources": [{"id", "title", "score"}, ...], "cached": bool}
+        {"event": "token", "text": str} for each chunk of the answer (the first
+            at once, later ones batched by coalesce_chunks)
+        {"event": "done", "retrieval_ms", "ttft_ms", "total_ms", "tokens_per_second"}
+        or, if generation fails, {"event": "error", "message": str} as the last event
+    """
+    start = time.perf_counter()
+    metrics = []
+    cache = get_semantic_cache() if use_cache else None
+    profile = profile_fingerprint(JSON_FILE) if cache else ""
+    cached_answer = cache.lookup(question, model, profile) if cache else None
+    
+    def timing(retrieval_ms: float) -> Dict[str, Any]:
+        ttft_ms = metrics[0].ttft_s * 1000 if metrics and metrics[0].ttft_s is not None else None
+        return {
+            "event": "done",
+            "retrieval_ms": retrieval_ms,
+            "ttft_ms": ttft_ms if ttft_ms is not None else (time.perf_counter() - start) * 1000,
+            "total_ms": (time.perf_counter() - start) * 1000,
+            "tokens_per_second": metrics[0].tokens_per_second if metrics else 0.0
+        }
     
+    if cached_answer is not None:
+        yield {"event": "sources", "sources": [], "cached": True}
+        yield {"event": "token", "text": cached_answer}
+        yield timing(0.0)
+        return
+    
+    try:
+        sources, packed, fallback = _retrieve_context(vector_client, question, model)
     except Exception as e:
         print(f"❌ Error during RAG query: {e}")
-        return f"An error occurred while processing your question: {e}"
+        yield {"event": "error", "message": f"An error occurred while processing your question: {e}"}
+        return
+    retrieval_ms = (time.perf_counter() - start) * 1000
+    yield {"event": "sources", "sources": sources, "cached": False}
+    
+    if packed is None:
+        yield {"event": "token", "text": fallback}
+        yield timing(retrieval_ms)
+        return
+    
+    print("⚡ Streaming personalized response with Groq...")
+    chunks = []
+    try:
+        for chunk in coalesce_chunks(generate_response_streaming(
+            packed.prompt, model=model, use_cache=use_cache, on_metrics=metrics.append
+        )):
+            chunks.append(chunk)
+            yield {"event": "token", "text": chunk}
+    except Exception as e:
+        print(f"❌ Error during RAG query: {e}")
+        yield {"event": "error", "message": f"An error occurred while processing your question: {e}"}
+        return
+    
+    if cache:
+        cache.store(question, "".join(chunks), model, time.perf_counter() - start, profile)
+    yield timing(retrieval_ms)
+
+
+def print_cache_stats() -> None:
+    """Print semantic cache hit rate and latency saved, if the cache is enabled"""
+    cache = get_semantic_cache()
+    if cache:
+        stats = cache.stats()
+        print(
+            f"📊 Semantic cache: {stats['hits']}/{stats['hits'] + stats['misses']} hits "
+            f"({stats['hit_rate']:.0%}), {stats['seconds_saved']:.1f}s saved"
+        )
 
 
 def main():
@@ -202,9 +356,11 @@ def main():
         print("\nPlease add the missing variables to your .env file and try again.")
         return
     
-    # Validate Groq connection
-    print("🔍 Testing Groq API connection...")
-    if not validate_groq_connection():
+    # Probe Groq and the vector database in parallel (metadata calls, no completion)
+    print("🔍 Checking dependencies...")
+    status = check_dependencies()
+    print_health(status)
+    if not status["checks"]["groq"]["ok"]:
         print("❌ Failed to connect to Groq API. Please check your GROQ_API_KEY.")
         return
     
@@ -236,13 +392,23 @@ def main():
             
             if question.lower() in ["exit", "quit", "q"]:
                 print("\n👋 Thanks for chatting with your Digital Twin!")
+                print_cache_stats()
                 break
             
             if not question:
                 continue
             
-            answer = rag_query(vector_client, question)
-            print(f"\n🤖 Digital Twin: {answer}\n")
+            # Stream the answer so it starts appearing at the first token
+            answering = False
+            for event in rag_query_stream(vector_client, question):
+                if event["event"] == "token":
+                    if not answering:
+                        print("\n🤖 Digital Twin: ", end="", flush=True)
+                        answering = True
+                    print(event["text"], end="", flush=True)
+                elif event["event"] == "error":
+                    print(f"\n❌ {event['message']}", end="")
+            print("\n")
             
         except KeyboardInterrupt:
             print("\n\n👋 Goodbye!")
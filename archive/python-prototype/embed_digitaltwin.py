@@ -9,22 +9,46 @@ KEY MIGRATION CHANGES:
 ✅ ADDED: Raw text upsert (no pre-computed vectors needed)
 
 This script demonstrates the complete migration from ChromaDB to Upstash Vector.
+
+Re-ingestion is incremental: chunk IDs are derived from chunk content, and a
+local manifest records a hash of every chunk already uploaded, so a run
+upserts only new or changed chunks and deletes the ones that disappeared.
+
+Uploads run in batches, and each completed batch is appended to a journal
+next to the manifest. If a run fails or is interrupted, rerunning it skips
+the chunks the journal already records. Nothing is asked on the terminal
+when stdin is not interactive (or --reset/--no-reset is given).
+
+Usage:
+    python embed_digitaltwin.py              # Upload changes since the last run
+    python embed_digitaltwin.py --full       # Ignore the manifest and re-upload everything
+    python embed_digitaltwin.py --no-reset   # Headless: never prompt or wipe the index
 """
 
+import argparse
+import hashlib
 import json
+import os
 import sys
-from typing import List, Dict, Tuple
+import time
+from typing import Any, List, Dict, Optional, Set, Tuple
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 # Import our modular clients (migration architecture)
+from profile_chunker import chunk_profile
 from settings import Settings
-from upstash_client import UpstashVectorClient
+from vector_clients import create_vector_client
 
 console = Console()
 
 # Configuration
 JSON_FILE = "digitaltwin.json"
+MANIFEST_VERSION = 1
+
+
+class IngestionError(RuntimeError):
+    """Raised when ingestion fails; completed batches stay journaled for the next run"""
 
 
 def load_profile_data(filename: str = JSON_FILE) -> Dict:
@@ -44,9 +68,17 @@ def load_profile_data(filename: str = JSON_FILE) -> Dict:
         sys.exit(1)
 
 
+def chunk_hash(text: str, metadata: Dict) -> str:
+    """Hash of everything uploaded for a chunk (text and metadata)"""
+    payload = json.dumps([text, metadata], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def flatten_profile_to_chunks(profile: Dict) -> List[Tuple[str, str, Dict]]:
     """
     Convert nested profile JSON into flat chunks for vector storage
+    Every section declared in profile_chunker.PROFILE_SCHEMA is chunked into
+    windows of about CHUNK_TARGET_TOKENS, with content-derived IDs.
     
     MIGRATION NOTE: This replaces manual embedding generation.
     Instead of: text → embed → (id, vector, metadata)
@@ -56,226 +88,163 @@ def flatten_profile_to_chunks(profile: Dict) -> List[Tuple[str, str, Dict]]:
         List of (id, text, metadata) tuples
     """
     console.print("\n🔄 Converting profile to vector chunks...")
-    chunks = []
-    chunk_id = 0
+    chunks = chunk_profile(profile)
+    console.print(f"✓ Created {len(chunks)} chunks from profile", style="green")
+    return chunks
+
+
+def manifest_target() -> Optional[str]:
+    """
+    Identity of the index being written, so each backend keeps its own manifest entry
     
-    # Helper to create chunks
-    def add_chunk(title: str, content: str, chunk_type: str, category: str = "", tags: List[str] = None):
-        nonlocal chunk_id
-        chunk_id += 1
-        
-        # MIGRATION: Raw text instead of pre-computed embeddings
-        enriched_text = f"{title}: {content}"
-        
-        chunks.append((
-            f"chunk-{chunk_id}",
-            enriched_text,  # ← Upstash will auto-embed this text
-            {
-                "title": title,
-                "type": chunk_type,
-                "content": content,
-                "category": category,
-                "tags": tags or []
-            }
-        ))
+    Returns:
+        Target name, or None for an in-memory local index, which is discarded
+        when the process exits and so must never be recorded as ingested
+    """
+    if Settings.VECTOR_BACKEND == "local":
+        return f"local:{os.path.abspath(Settings.LOCAL_VECTOR_PATH)}" if Settings.LOCAL_VECTOR_PATH else None
+    return f"upstash:{Settings.UPSTASH_VECTOR_REST_URL}"
+
+
+def load_manifest(path: str, target: str) -> Optional[Dict[str, str]]:
+    """
+    Chunk hashes recorded by the last successful run against target
     
-    # Personal Information
-    if 'personal' in profile:
-        p = profile['personal']
-        add_chunk(
-            "Personal Summary",
-            p.get('summary', ''),
-            "personal",
-            "overview",
-            ["about", "introduction"]
-        )
-        add_chunk(
-            "Elevator Pitch",
-            p.get('elevator_pitch', ''),
-            "personal",
-            "overview",
-            ["pitch", "introduction"]
-        )
-        
-        # Add personal details chunk
-        personal_details = []
-        if p.get('marital_status'):
-            personal_details.append(f"Marital Status: {p['marital_status']}")
-        if p.get('relationship_status'):
-            personal_details.append(f"Relationship Status: {p['relationship_status']}")
-        if p.get('nationality'):
-            personal_details.append(f"Nationality: {p['nationality']}")
-        if p.get('Age'):
-            personal_details.append(f"Age: {p['Age']}")
-        if p.get('gender'):
-            personal_details.append(f"Gender: {p['gender']}")
-        if p.get('location'):
-            personal_details.append(f"Location: {p['location']}")
-        
-        if personal_details:
-            add_chunk(
-                "Personal Details",
-                ". ".join(personal_details),
-                "personal",
-                "details",
-                ["personal", "demographics", "marital", "status"]
-            )
+    Returns:
+        {chunk_id: chunk_hash}, or None if target has never been ingested
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError:
+        console.print(f"⚠️  Ignoring unreadable manifest {path}", style="yellow")
+        return None
     
-    # Work Experience
-    if 'experience' in profile:
-        for idx, exp in enumerate(profile['experience'], 1):
-            # Main experience summary
-            exp_type = exp.get('type', 'Experience')
-            title = f"{exp_type}: {exp.get('project_name', exp.get('company', 'Unknown'))}"
-            
-            # Combine key details
-            details = []
-            if exp.get('role'):
-                details.append(f"Role: {exp['role']}")
-            if exp.get('duration'):
-                details.append(f"Duration: {exp['duration']}")
-            if exp.get('context'):
-                details.append(f"Context: {exp['context']}")
-            
-            add_chunk(
-                title,
-                '. '.join(details),
-                "experience",
-                "work_history",
-                ["experience", exp_type.lower()]
-            )
-            
-            # STAR achievements
-            if 'achievements_star' in exp:
-                for star_idx, star in enumerate(exp['achievements_star'], 1):
-                    star_text = f"Situation: {star.get('situation', '')}. Task: {star.get('task', '')}. Action: {star.get('action', '')}. Result: {star.get('result', '')}"
-                    add_chunk(
-                        f"{title} - Achievement {star_idx}",
-                        star_text,
-                        "achievement",
-                        "accomplishments",
-                        ["star", "achievement", exp_type.lower()]
-                    )
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    entry = manifest.get('targets', {}).get(target)
+    return dict(entry['chunks']) if entry else None
+
+
+def save_manifest(path: str, target: str, hashes: Dict[str, str]) -> None:
+    """Record the uploaded chunk hashes for target (written atomically)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError("old manifest version")
+    except (FileNotFoundError, ValueError):
+        manifest = {'version': MANIFEST_VERSION, 'targets': {}}
     
-    # Technical Skills
-    if 'skills' in profile and 'technical' in profile['skills']:
-        tech = profile['skills']['technical']
-        
-        # Programming languages
-        if 'programming_languages' in tech:
-            for lang in tech['programming_languages']:
-                lang_text = f"{lang['language']} ({lang['proficiency']}): {', '.join(lang.get('concepts', []))}"
-                add_chunk(
-                    f"Programming: {lang['language']}",
-                    lang_text,
-                    "skill",
-                    "technical",
-                    ["programming", lang['language'].lower()]
-                )
+    manifest['targets'][target] = {'updated_at': time.time(), 'chunks': hashes}
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+class IngestJournal:
+    """
+    Append-only log of the batches completed by an unfinished run
+    One JSON line per upserted batch or delete, flushed to disk before the
+    next batch starts. Lines for other targets are ignored, and the file is
+    removed once the manifest records the finished run.
+    """
     
-    # Education
-    if 'education' in profile:
-        edu = profile['education']
-        edu_text = f"Studying {edu.get('degree', '')} at {edu.get('university', '')}. Currently in {edu.get('current_year', '')}. GPA: {edu.get('gpa', '')}. Expected graduation: {edu.get('expected_graduation', '')}"
-        add_chunk(
-            "Education Background",
-            edu_text,
-            "education",
-            "academic",
-            ["education", "university"]
-        )
-        
-        # Coursework
-        if 'relevant_coursework' in edu:
-            coursework_text = "Relevant coursework: " + ", ".join(edu['relevant_coursework'])
-            add_chunk(
-                "Academic Coursework",
-                coursework_text,
-                "education",
-                "academic",
-                ["coursework", "education"]
-            )
+    def __init__(self, path: str, target: str):
+        self.path = path
+        self.target = target
+    
+    def completed(self) -> Tuple[Dict[str, str], Set[str]]:
+        """
+        Work recorded by an interrupted run against this target
         
-        # Additional Qualifications (inside education)
-        if 'additional_qualifications' in edu:
-            for qual in edu['additional_qualifications']:
-                qual_text = f"{qual.get('qualification', '')} from {qual.get('institution', '')}. Certified by {qual.get('certification_body', '')}. Skills: {', '.join(qual.get('skills_gained', []))}. {qual.get('relevance', '')}"
-                add_chunk(
-                    f"Qualification: {qual.get('qualification', '')}",
-                    qual_text,
-                    "qualification",
-                    "education",
-                    ["qualification", "certification", "diploma"]
-                )
+        Returns:
+            ({chunk_id: chunk_hash} already upserted, chunk IDs already deleted)
+        """
+        upserted: Dict[str, str] = {}
+        deleted: Set[str] = set()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return upserted, deleted
         
-        # Certifications and Accomplishments (inside education)
-        if 'certifications_and_accomplishments' in edu:
-            for cert in edu['certifications_and_accomplishments']:
-                cert_type = cert.get('type', 'Accomplishment')
-                cert_name = cert.get('name', cert.get('qualification', 'Unknown'))
-                
-                if cert_type == "Technical Project":
-                    # Detailed project accomplishment
-                    project_text = f"{cert_name} ({cert.get('date_completed', '')}). Technologies: {', '.join(cert.get('technologies', []))}. Achievements: {'. '.join(cert.get('achievements', []))}. Business impact: {cert.get('business_impact', '')}. Key metrics: {str(cert.get('key_metrics', {}))}"
-                    add_chunk(
-                        f"Technical Project: {cert_name}",
-                        project_text,
-                        "accomplishment",
-                        "projects",
-                        ["project", "accomplishment", "docker", "devops"] + [tech.lower() for tech in cert.get('technologies', [])]
-                    )
-                elif cert_type in ["Technical Certification", "Online Learning"]:
-                    # Certification details
-                    cert_text = f"{cert_name} from {cert.get('issuer', '')} ({cert.get('date_completed', '')}). Skills: {', '.join(cert.get('skills', []))}"
-                    add_chunk(
-                        f"Certification: {cert_name}",
-                        cert_text,
-                        "certification",
-                        "education",
-                        ["certification", "learning", cert.get('issuer', '').lower()]
-                    )
-                elif cert_type == "Academic Achievement":
-                    # Academic honors
-                    achievement_text = f"{cert_name} at {cert.get('institution', '')} ({cert.get('date_awarded', '')}). {cert.get('criteria', '')}"
-                    add_chunk(
-                        f"Achievement: {cert_name}",
-                        achievement_text,
-                        "achievement",
-                        "academic",
-                        ["achievement", "academic", "honor"]
-                    )
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A line cut short by a crash
+            if entry.get('target') != self.target:
+                continue
+            upserted.update(entry.get('upserted', {}))
+            deleted.update(entry.get('deleted', []))
+        return upserted, deleted
     
-    # Career Goals
-    if 'career_goals' in profile:
-        goals = profile['career_goals']
-        goals_text = f"Immediate: {goals.get('immediate', '')}. Short-term: {goals.get('short_term', '')}. Long-term: {goals.get('long_term', '')}"
-        add_chunk(
-            "Career Goals",
-            goals_text,
-            "goals",
-            "career",
-            ["goals", "career"]
-        )
+    def record(self, upserted: Optional[Dict[str, str]] = None, deleted: Optional[List[str]] = None) -> None:
+        """Durably append one completed step"""
+        entry = {'target': self.target, 'upserted': upserted or {}, 'deleted': deleted or []}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
     
-    # Salary & Location
-    if 'salary_location' in profile:
-        sal = profile['salary_location']
-        sal_text = f"Salary expectations: {sal.get('salary_expectations', '')}. Location preferences: {', '.join(sal.get('location_preferences', []))}. Work authorization: {sal.get('work_authorization', '')}"
-        add_chunk(
-            "Salary and Location Preferences",
-            sal_text,
-            "preferences",
-            "compensation",
-            ["salary", "location"]
-        )
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def diff_chunks(
+    chunks: List[Tuple[str, str, Dict]],
+    previous: Dict[str, str]
+) -> Tuple[List[Tuple[str, str, Dict]], List[str], Dict[str, str]]:
+    """
+    Compare chunks with the manifest of the last run
     
-    console.print(f"✓ Created {len(chunks)} chunks from profile", style="green")
-    return chunks
+    Returns:
+        (chunks to upsert, IDs to delete, {chunk_id: chunk_hash} for all chunks)
+    """
+    hashes = {chunk_id: chunk_hash(text, metadata) for chunk_id, text, metadata in chunks}
+    changed = [chunk for chunk in chunks if previous.get(chunk[0]) != hashes[chunk[0]]]
+    removed = sorted(chunk_id for chunk_id in previous if chunk_id not in hashes)
+    return changed, removed, hashes
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
 
+def _confirm_reset(current_count: int, reset: Optional[bool]) -> bool:
+    """Decide whether to wipe an index whose existing vectors are unknown to the manifest"""
+    if reset is not None:
+        return reset
+    if not sys.stdin.isatty():
+        console.print(f"⚠️  Not resetting {current_count} existing vectors; those not in the profile are deleted "
+                      f"(non-interactive; pass --reset to wipe)", style="yellow")
+        return False
+    console.print(f"⚠️  Database already contains {current_count} vectors", style="yellow")
+    return input("Reset database before upload? (y/n): ").strip().lower() == 'y'
 
-def ingest_to_upstash(chunks: List[Tuple[str, str, Dict]]) -> None:
+
+def ingest_to_upstash(
+    chunks: List[Tuple[str, str, Dict]],
+    manifest_path: Optional[str] = None,
+    full: bool = False,
+    reset: Optional[bool] = None,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Upload chunks to Upstash Vector
+    Only chunks that are new or changed since the last run (per the manifest)
+    are upserted, and chunks no longer in the profile are deleted. Without a
+    manifest (first run, --full) every chunk is upserted and any vector in the
+    index whose ID is not in chunks is deleted. Each completed batch is
+    journaled, so a rerun after a failure resumes where the failed run stopped.
+    An in-memory local index keeps no manifest or journal.
     
     MIGRATION HIGHLIGHT:
     ❌ OLD (ChromaDB): collection.add(ids=ids, embeddings=vectors, metadatas=metadata)
@@ -285,56 +254,150 @@ def ingest_to_upstash(chunks: List[Tuple[str, str, Dict]]) -> None:
     - Model: mixedbread-ai/mxbai-embed-large-v1
     - Dimensions: 1024
     - Similarity: COSINE
+    
+    Args:
+        chunks: (id, text, metadata) tuples from flatten_profile_to_chunks
+        manifest_path: Manifest of uploaded chunk hashes (defaults to Settings.INGEST_MANIFEST_PATH);
+            the journal is kept alongside it
+        full: Ignore the manifest and upload every chunk
+        reset: Whether to wipe an index the manifest knows nothing about rather
+            than delete only the vectors not in chunks; None asks on an
+            interactive terminal and does not wipe otherwise
+        batch_size: Chunks per upsert batch (defaults to Settings.INGEST_BATCH_SIZE)
+    
+    Returns:
+        Counts of upserted, deleted, unchanged and resumed chunks, plus
+        seconds, chunks_per_second and batch latency percentiles
+    
+    Raises:
+        IngestionError: If the upload fails (completed batches stay journaled)
     """
     console.print("\n📤 Uploading to Upstash Vector Database...")
     console.print("   [Migration] Using automatic server-side embedding", style="cyan")
     console.print("   [Migration] No manual embedding generation needed!", style="cyan")
     
+    manifest_path = manifest_path or Settings.INGEST_MANIFEST_PATH
+    batch_size = batch_size or Settings.INGEST_BATCH_SIZE
+    target = manifest_target()
+    journal = IngestJournal(manifest_path + '.journal', target) if target else None
+    start_time = time.perf_counter()
+    
     try:
-        # Initialize client in read-write mode
-        client = UpstashVectorClient(read_only=False)
+        # Initialize client in read-write mode (Upstash or local, per VECTOR_BACKEND)
+        client = create_vector_client(read_only=False)
         
         # Check current state
         info = client.info()
         current_count = info.get('vectorCount', 0)
         console.print(f"\n📊 Current vectors in database: {current_count}")
         
-        # Option to reset
-        if current_count > 0:
-            console.print(f"⚠️  Database already contains {current_count} vectors", style="yellow")
-            response = input("Reset database before upload? (y/n): ").strip().lower()
-            if response == 'y':
+        if target is None:
+            console.print("⚠️  In-memory index: no manifest is kept, so every chunk is uploaded", style="yellow")
+        previous = None if full or target is None else load_manifest(manifest_path, target)
+        journaled, journaled_deletes = journal.completed() if journal else ({}, set())
+        if previous is None:
+            previous = {}
+            # An interrupted run's journal means the existing vectors are its own progress
+            if current_count > 0 and not journaled and _confirm_reset(current_count, reset):
                 console.print("🗑️  Resetting database...", style="yellow")
                 client.reset()
                 console.print("✓ Database reset complete", style="green")
+            elif current_count > 0:
+                # Hashes of the existing vectors are unknown, so all chunks are re-upserted,
+                # and IDs that are not in the new chunk set are deleted as removed
+                previous = {chunk_id: "" for chunk_id in client.list_ids()}
+        
+        if journaled or journaled_deletes:
+            console.print(f"↩️  Resuming: {len(journaled)} chunks and {len(journaled_deletes)} deletes "
+                          f"already done by an interrupted run", style="cyan")
+            previous = {chunk_id: h for chunk_id, h in {**previous, **journaled}.items()
+                        if chunk_id not in journaled_deletes}
+        
+        changed, removed, hashes = diff_chunks(chunks, previous)
+        resumed = sum(1 for chunk_id, _, _ in chunks if journaled.get(chunk_id) == hashes[chunk_id])
+        unchanged = len(chunks) - len(changed)
+        console.print(f"🔍 {len(changed)} new or changed, {len(removed)} removed, {unchanged} unchanged chunks")
+        
+        if removed:
+            client.delete(removed)
+            if journal:
+                journal.record(deleted=removed)
+        
+        batch_seconds: List[float] = []
+        
+        def checkpoint(batch: List[Tuple], timing: Dict[str, Any]) -> None:
+            if journal:
+                journal.record(upserted={item[0]: hashes[item[0]] for item in batch})
+            batch_seconds.append(timing['seconds'])
+        
+        if changed:
+            # Upload chunks with progress bar
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console
+            ) as progress:
+                task = progress.add_task(f"Uploading {len(changed)} chunks...", total=1)
+                
+                # MIGRATION: Direct upsert with raw text (no embeddings)
+                client.upsert_texts(changed, batch_size=batch_size, on_batch=checkpoint)
+                
+                progress.update(task, completed=1)
+        
+        # Persist the local index for mmap-based warm starts
+        if (changed or removed or journaled) and getattr(client, 'path', None):
+            client.save()
         
-        # Upload chunks with progress bar
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task(f"Uploading {len(chunks)} chunks...", total=1)
-            
-            # MIGRATION: Direct upsert with raw text (no embeddings)
-            client.upsert_texts(chunks)
-            
-            progress.update(task, completed=1)
+        # Recorded only after the index is updated; the journal covers the run until then
+        if journal:
+            save_manifest(manifest_path, target, hashes)
+            journal.clear()
         
-        console.print(f"\n✅ Successfully uploaded {len(chunks)} chunks to Upstash!", style="green bold")
+        seconds = time.perf_counter() - start_time
+        stats = {
+            'upserted': len(changed),
+            'deleted': len(removed),
+            'unchanged': unchanged,
+            'resumed': resumed,
+            'batches': len(batch_seconds),
+            'seconds': seconds,
+            'chunks_per_second': len(changed) / seconds if seconds > 0 else 0.0,
+            'batch_p50_ms': _percentile(batch_seconds, 0.5) * 1000,
+            'batch_p95_ms': _percentile(batch_seconds, 0.95) * 1000,
+            'batch_max_ms': max(batch_seconds, default=0.0) * 1000
+        }
+        
+        console.print(f"\n✅ Uploaded {len(changed)} and deleted {len(removed)} chunks!", style="green bold")
+        console.print(
+            f"⏱️  {stats['seconds']:.2f}s, {stats['chunks_per_second']:.1f} chunks/s in {stats['batches']} batches "
+            f"(batch p50 {stats['batch_p50_ms']:.0f}ms, p95 {stats['batch_p95_ms']:.0f}ms, "
+            f"max {stats['batch_max_ms']:.0f}ms)"
+        )
         
         # Verify upload
         final_info = client.info()
         final_count = final_info.get('vectorCount', 0)
         console.print(f"📊 Final vector count: {final_count}")
         
+        return stats
+        
     except Exception as e:
         console.print(f"\n❌ Upload failed: {e}", style="red bold")
-        sys.exit(1)
+        if journal:
+            console.print("   Completed batches are journaled; rerun to resume.", style="yellow")
+        raise IngestionError(f"Ingestion failed: {e}") from e
 
 
 def main():
     """Main ingestion pipeline"""
+    parser = argparse.ArgumentParser(description="Upload digitaltwin.json to the vector database")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and re-upload every chunk")
+    parser.add_argument("--reset", action=argparse.BooleanOptionalAction, default=None,
+                        help="Wipe an index the manifest does not know about (or with --no-reset, delete only "
+                             "vectors not in the profile) instead of asking")
+    parser.add_argument("--batch-size", type=int, default=None, help="Chunks per upsert batch (INGEST_BATCH_SIZE)")
+    args = parser.parse_args()
+    
     console.print("=" * 70, style="cyan")
     console.print("🚀 Digital Twin Profile Ingestion", style="cyan bold")
     console.print("   ChromaDB → Upstash Vector Migration", style="cyan")
@@ -367,8 +430,11 @@ def main():
     if len(chunks) > 3:
         console.print(f"\n  ... and {len(chunks) - 3} more chunks")
     
-    # Upload to Upstash
-    ingest_to_upstash(chunks)
+    # Upload to Upstash (only what changed since the last run)
+    try:
+        ingest_to_upstash(chunks, full=args.full, reset=args.reset, batch_size=args.batch_size)
+    except IngestionError:
+        sys.exit(1)
     
     console.print("\n" + "=" * 70, style="green")
     console.print("✅ Migration Complete!", style="green bold")
@@ -5,6 +5,7 @@ Demonstrates real-time streaming responses from Groq
 
 from groq_client import generate_response_streaming
 from settings import Settings
+from streaming import coalesce_chunks
 
 def main():
     """Example of streaming Groq API responses"""
@@ -24,12 +25,12 @@ def main():
     print("Question: What is Python?\n")
     print("Response: ", end="", flush=True)
     
-    for chunk in generate_response_streaming(
+    for chunk in coalesce_chunks(generate_response_streaming(
         prompt="What is Python? Answer in 2-3 sentences.",
         system_prompt="You are a helpful programming tutor. Be concise.",
         temperature=1.0,
         max_tokens=200
-    ):
+    )):
         print(chunk, end="", flush=True)
     
     print("\n")
@@ -40,12 +41,12 @@ def main():
     print("Question: Explain APIs in simple terms.\n")
     print("Response: ", end="", flush=True)
     
-    for chunk in generate_response_streaming(
+    for chunk in coalesce_chunks(generate_response_streaming(
         prompt="Explain what an API is to a non-technical person in 2 sentences.",
         system_prompt="You are a tech explainer. Use simple analogies.",
         temperature=0.7,
         max_tokens=150
-    ):
+    )):
         print(chunk, end="", flush=True)
     
     print("\n")
@@ -69,11 +70,11 @@ def main():
         print("\n🤖 AI: ", end="", flush=True)
         
         try:
-            for chunk in generate_response_streaming(
+            for chunk in coalesce_chunks(generate_response_streaming(
                 prompt=question,
                 temperature=0.8,
                 max_tokens=300
-            ):
+            )):
                 print(chunk, end="", flush=True)
             print("\n")
         except Exception as e:
@@ -0,0 +1,96 @@
+"""
+Test Stand-Ins
+In-memory replacements for the Groq SDK and vector clients shared by the
+offline test suites, so no API key or network access is needed
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from local_vector_client import LocalVectorClient
+from upstash_client import UpstashVectorClient
+
+
+def make_completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def make_chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class FakeAsyncStream:
+    """
+    Async Groq stream of pieces, or endless when pieces is None
+    Can stall before its first chunk or fail part-way.
+    """
+
+    def __init__(self, pieces=None, stall=0.0, fail_after=None):
+        self.pieces = None if pieces is None else list(pieces)
+        self.stall = stall
+        self.fail_after = fail_after
+        self.sent = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.stall and not self.sent:
+            await asyncio.sleep(self.stall)
+        await asyncio.sleep(0.01)
+        if self.sent == self.fail_after:
+            raise ConnectionError("connection reset")
+        if self.closed or self.pieces == []:
+            raise StopAsyncIteration
+        self.sent += 1
+        return make_chunk("token " if self.pieces is None else self.pieces.pop(0))
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAsyncGroq:
+    """
+    Async Groq client that fails the first `failures` calls, then answers
+    after delay seconds, tracking how many calls overlap
+    """
+
+    def __init__(self, failures=0, delay=0.0, stream=None):
+        self.failures = failures
+        self.delay = delay
+        self.stream = stream
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **params):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.calls <= self.failures:
+            raise ConnectionError("503 service unavailable")
+        if params["stream"]:
+            return self.stream or FakeAsyncStream(["Hel", "lo"])
+        return make_completion(" Hello ")
+
+
+def make_local_client(items, **kwargs) -> LocalVectorClient:
+    """Writable in-memory local index holding items"""
+    client = LocalVectorClient(read_only=False, dimension=256, **kwargs)
+    client.upsert_texts(items)
+    return client
+
+
+def make_upstash_client(index, cache_size=0, url="https://fake-index") -> UpstashVectorClient:
+    """UpstashVectorClient wired to a stand-in index instead of the SDK"""
+    client = UpstashVectorClient.__new__(UpstashVectorClient)
+    client.index = index
+    client.read_only = False
+    client._init_cache(url, cache_size, 300.0)
+    return client
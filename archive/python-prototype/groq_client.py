@@ -1,22 +1,66 @@
 """
 Groq AI Integration
 Handles LLM inference using Groq's ultra-fast API with LLaMA models
-Supports both streaming and non-streaming responses
+Supports both streaming and non-streaming responses, with blocking and
+asyncio-native variants
 """
 
+import asyncio
 import time
-from typing import Optional, Iterator
-from groq import Groq
+from functools import partial
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional, Iterator, Tuple
+from client_registry import credentials_fingerprint, registry
+from context_packer import count_tokens, truncate_tokens
+from rate_limiter import RateLimiter, backoff_delay, parse_duration
+from response_cache import ResponseCache, make_key
+from single_flight import AsyncSingleFlight, SingleFlight
+from streaming import FirstTokenTimeout, StreamMetrics, first_chunk, first_chunk_async, measure_stream, measure_stream_async
 from settings import Settings
 
+if TYPE_CHECKING:  # The SDK is imported on first use, keeping cold starts fast
+    from groq import AsyncGroq, Groq
+
 DEFAULT_MODEL = "llama-3.1-8b-instant"
 MAX_RETRIES = 3
 RETRY_DELAY_MS = 1000
+RETRY_MAX_DELAY_S = 20.0
+RETRY_DEADLINE_S = 60.0  # Total time budget for one request's attempts and backoff
+DEFAULT_TIMEOUT_S = 30.0
+MAX_PROMPT_TOKENS = 8000  # Safety limit for raw prompts; RAG prompts are packed well below it
+
+# Keep-alive pool shared by every async request on an event loop
+ASYNC_MAX_CONNECTIONS = 200
+ASYNC_MAX_KEEPALIVE_CONNECTIONS = 50
+
+DEFAULT_SYSTEM_PROMPT = (
+    "You are an AI digital twin. Answer questions as if you are the person, "
+    "speaking in first person about your background, skills, and experience."
+)
+
+_async_client: Optional["AsyncGroq"] = None
+_async_client_key: Optional[tuple] = None
+
+# Identical concurrent requests share one Groq call (or one fanned-out stream)
+_flight = SingleFlight()
+_async_flight = AsyncSingleFlight()
+
+
+def _create_groq_client() -> "Groq":
+    from groq import Groq
+    
+    try:
+        # Retries are ours (rate-limit aware), so the SDK's own are disabled
+        return Groq(api_key=Settings.GROQ_API_KEY, max_retries=0)
+    except Exception as error:
+        print(f"❌ Failed to initialize Groq client: {error}")
+        raise RuntimeError(f"Failed to initialize Groq client: {error}")
 
 
-def get_groq_client() -> Groq:
+def get_groq_client() -> "Groq":
     """
-    Initialize and return Groq client instance
+    Return the process-wide Groq client
+    Created on first use and reused afterwards, so calls share one warm
+    keep-alive connection pool. A new client is built if GROQ_API_KEY changes.
     
     Returns:
         Groq: Configured Groq client
@@ -27,12 +71,254 @@ def get_groq_client() -> Groq:
     if not Settings.GROQ_API_KEY:
         raise ValueError("Missing required environment variable: GROQ_API_KEY")
     
-    try:
-        client = Groq(api_key=Settings.GROQ_API_KEY)
-        return client
-    except Exception as error:
-        print(f"❌ Failed to initialize Groq client: {error}")
-        raise RuntimeError(f"Failed to initialize Groq client: {error}")
+    return registry.get("groq", _create_groq_client, credentials_fingerprint(Settings.GROQ_API_KEY))
+
+
+def get_async_groq_client() -> "AsyncGroq":
+    """
+    Return the AsyncGroq client shared by all requests on the running event loop
+    The client owns one keep-alive connection pool, so concurrent requests
+    reuse warm connections instead of opening their own. A new client is
+    created if called from a different event loop or GROQ_API_KEY changes.
+    
+    Returns:
+        AsyncGroq: Shared async Groq client
+        
+    Raises:
+        ValueError: If API key is missing
+    """
+    global _async_client, _async_client_key
+    
+    if not Settings.GROQ_API_KEY:
+        raise ValueError("Missing required environment variable: GROQ_API_KEY")
+    
+    key = (asyncio.get_running_loop(), credentials_fingerprint(Settings.GROQ_API_KEY))
+    if _async_client is None or _async_client_key != key:
+        import httpx
+        from groq import AsyncGroq
+        
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=DEFAULT_TIMEOUT_S
+        )
+        _async_client = AsyncGroq(api_key=Settings.GROQ_API_KEY, http_client=http_client, max_retries=0)
+        _async_client_key = key
+    
+    return _async_client
+
+
+async def close_async_groq_client() -> None:
+    """Close the shared async client and its connection pool (e.g. on shutdown)"""
+    global _async_client, _async_client_key
+    
+    client, _async_client, _async_client_key = _async_client, None, None
+    if client is not None:
+        await client.close()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide Groq rate limiter
+    Seeded from GROQ_REQUESTS_PER_MINUTE / GROQ_TOKENS_PER_MINUTE and kept in
+    line with Groq's rate-limit headers after every call.
+    """
+    return registry.get(
+        "groq-rate-limiter",
+        lambda: RateLimiter(Settings.GROQ_REQUESTS_PER_MINUTE, Settings.GROQ_TOKENS_PER_MINUTE),
+        credentials_fingerprint(str(Settings.GROQ_REQUESTS_PER_MINUTE), str(Settings.GROQ_TOKENS_PER_MINUTE))
+    )
+
+
+def _estimate_tokens(prompt: str, system_prompt: Optional[str], max_tokens: int, model: str) -> int:
+    """Tokens a request counts against the limit: its input plus the completion allowance"""
+    return count_tokens(prompt, model) + count_tokens(system_prompt or DEFAULT_SYSTEM_PROMPT, model) + max_tokens
+
+
+def _send_completion(client: "Groq", **params):
+    """Create a completion, feeding Groq's rate-limit headers to the limiter"""
+    raw_api = getattr(client.chat.completions, "with_raw_response", None)
+    if raw_api is None:
+        return client.chat.completions.create(**params)
+    
+    raw = raw_api.create(**params)
+    get_rate_limiter().update_from_headers(raw.headers)
+    return raw.parse()
+
+
+async def _send_completion_async(client: "AsyncGroq", **params):
+    """Async variant of _send_completion"""
+    raw_api = getattr(client.chat.completions, "with_raw_response", None)
+    if raw_api is None:
+        return await client.chat.completions.create(**params)
+    
+    raw = await raw_api.create(**params)
+    get_rate_limiter().update_from_headers(raw.headers)
+    return await raw.parse()
+
+
+def _stream_contents(completion) -> Iterator[str]:
+    """Text content of each streamed chunk, skipping empty deltas"""
+    for chunk in completion:
+        content = chunk.choices[0].delta.content if chunk.choices else None
+        if content:
+            yield content
+
+
+async def _stream_contents_async(completion) -> AsyncIterator[str]:
+    async for chunk in completion:
+        content = chunk.choices[0].delta.content if chunk.choices else None
+        if content:
+            yield content
+
+
+def _close_stream(completion) -> None:
+    close = getattr(completion, "close", None)
+    if close:
+        close()
+
+
+async def _close_stream_async(completion) -> None:
+    close = getattr(completion, "close", None)
+    if close:
+        await close()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Return the process-wide response cache, or None if it is disabled
+    Enabled by setting RESPONSE_CACHE_SIZE; RESPONSE_CACHE_PATH adds a sqlite
+    tier shared across restarts and processes.
+    """
+    if Settings.RESPONSE_CACHE_SIZE <= 0:
+        return None
+    
+    return registry.get(
+        "response-cache",
+        lambda: ResponseCache(
+            max_entries=Settings.RESPONSE_CACHE_SIZE,
+            ttl_seconds=Settings.RESPONSE_CACHE_TTL_S,
+            path=Settings.RESPONSE_CACHE_PATH or None
+        ),
+        credentials_fingerprint(
+            str(Settings.RESPONSE_CACHE_SIZE), str(Settings.RESPONSE_CACHE_TTL_S), Settings.RESPONSE_CACHE_PATH
+        )
+    )
+
+
+def _cached_response(
+    use_cache: bool,
+    prompt: str,
+    system_prompt: Optional[str],
+    model: str,
+    temperature: float,
+    max_tokens: int
+) -> Tuple[Optional[ResponseCache], Optional[str], Optional[List[str]]]:
+    """Return (cache, key, cached chunks) for a request; all None when caching is off"""
+    cache = get_response_cache() if use_cache else None
+    if cache is None:
+        return None, None, None
+    
+    key = make_key(prompt, system_prompt, model, temperature, max_tokens)
+    chunks = cache.get(key)
+    if chunks is not None:
+        print(f"⚡ Cached response ({sum(len(chunk) for chunk in chunks)} chars)")
+    return cache, key, chunks
+
+
+def _prepare_prompt(prompt: str, model: str = DEFAULT_MODEL) -> str:
+    """
+    Validate the prompt and shorten it if it exceeds MAX_PROMPT_TOKENS
+    The middle is dropped so the question at the end survives; use
+    context_packer.pack_context to stay within budget in the first place.
+    """
+    if not prompt or not prompt.strip():
+        raise ValueError("Prompt cannot be empty")
+    
+    if count_tokens(prompt, model) > MAX_PROMPT_TOKENS:
+        print(f"⚠️ Prompt is very long, trimming its middle to {MAX_PROMPT_TOKENS} tokens")
+        prompt = truncate_tokens(prompt, MAX_PROMPT_TOKENS, model)
+    
+    return prompt
+
+
+def _usage_note(completion) -> str:
+    """Token usage reported by Groq, for tuning the context budget"""
+    usage = getattr(completion, "usage", None)
+    if usage is None:
+        return ""
+    return f", {usage.prompt_tokens} prompt + {usage.completion_tokens} completion tokens"
+
+
+def _build_messages(prompt: str, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+    return [
+        {
+            "role": "system",
+            "content": system_prompt or DEFAULT_SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def _retry_delay(error: Exception, attempt: int, model: str, start_time: float) -> float:
+    """
+    Classify a failed Groq attempt
+    Rate limits honour Retry-After (and pause every caller sharing the
+    limiter); other transient errors back off exponentially with jitter.
+    
+    Args:
+        error: Exception raised by the attempt
+        attempt: 1-based attempt number
+        model: Requested model (for error messages)
+        start_time: time.time() when the request started (for the deadline)
+    
+    Returns:
+        Seconds to wait before the next attempt
+        
+    Raises:
+        RuntimeError: If the error is not retryable, or retries or the
+            RETRY_DEADLINE_S budget are exhausted for rate limits and timeouts
+    """
+    error_msg = str(error).lower()
+    status = getattr(error, "status_code", None)
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    delay = backoff_delay(attempt, RETRY_DELAY_MS / 1000, RETRY_MAX_DELAY_S)
+    out_of_time = time.time() - start_time + delay > RETRY_DEADLINE_S
+    
+    # Rate limit errors
+    if status == 429 or "429" in error_msg or "rate limit" in error_msg:
+        get_rate_limiter().update_from_headers(headers)
+        retry_after = parse_duration(headers.get("retry-after")) if headers else None
+        delay = max(delay, retry_after or 0)
+        if attempt < MAX_RETRIES and time.time() - start_time + delay <= RETRY_DEADLINE_S:
+            print(f"⚠️ Rate limit hit, waiting {delay:.1f}s before retry...")
+            return delay
+        raise RuntimeError("Groq API rate limit exceeded. Please try again later.")
+    
+    # Authentication errors
+    if status == 401 or "401" in error_msg or "unauthorized" in error_msg:
+        raise RuntimeError("Invalid Groq API key. Please check your credentials.")
+    
+    # Model not found
+    if status == 404 or "404" in error_msg or "model_not_found" in error_msg:
+        raise RuntimeError(f"Model '{model}' not found. Please use a valid Groq model.")
+    
+    # Timeout errors
+    if "timeout" in error_msg or "timed out" in error_msg or isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        if attempt < MAX_RETRIES and not out_of_time:
+            print("⚠️ Request timeout, retrying...")
+            return delay
+        raise RuntimeError("Groq API request timed out. Please try again.")
+    
+    # Retry for other transient errors, within the deadline
+    if out_of_time:
+        raise RuntimeError(f"Groq retry deadline of {RETRY_DEADLINE_S:.0f}s exceeded: {error}")
+    return delay
 
 
 def generate_response(
@@ -41,10 +327,17 @@ def generate_response(
     model: str = DEFAULT_MODEL,
     temperature: float = 0.7,
     max_tokens: int = 1024,
-    stream: bool = False
+    stream: bool = False,
+    use_cache: bool = True,
+    first_token_timeout: Optional[float] = None,
+    on_metrics: Optional[Callable[[StreamMetrics], None]] = None
 ) -> str | Iterator[str]:
     """
     Generate AI response using Groq with context and retry logic
+    Identical requests are answered from the response cache when it is enabled,
+    and identical concurrent requests share one in-flight Groq call.
+    A stream that fails or stalls before its first token is retried
+    transparently; once tokens have been emitted, a failure raises.
     
     Args:
         prompt: User prompt/question
@@ -53,6 +346,11 @@ def generate_response(
         temperature: Sampling temperature (0.0-2.0)
         max_tokens: Maximum tokens in response
         stream: If True, returns an iterator for streaming; if False, returns complete string
+        use_cache: Set False to bypass the response cache for this call
+        first_token_timeout: Seconds to wait for a stream's first token before
+            retrying (defaults to Settings.STREAM_FIRST_TOKEN_TIMEOUT_S)
+        on_metrics: Called with the stream's StreamMetrics (TTFT, tokens/sec)
+            when it ends
         
     Returns:
         str | Iterator[str]: Generated response text or streaming iterator
@@ -61,41 +359,56 @@ def generate_response(
         ValueError: If prompt is invalid
         RuntimeError: If generation fails after retries
     """
-    start_time = time.time()
+    request_start = time.perf_counter()
     
     # Input validation
-    if not prompt or not prompt.strip():
-        raise ValueError("Prompt cannot be empty")
+    prompt = _prepare_prompt(prompt, model)
+    if first_token_timeout is None:
+        first_token_timeout = Settings.STREAM_FIRST_TOKEN_TIMEOUT_S
     
-    if len(prompt) > 8000:
-        print("⚠️ Prompt is very long, truncating to 8000 characters")
-        prompt = prompt[:8000]
+    cache, cache_key, cached = _cached_response(use_cache, prompt, system_prompt, model, temperature, max_tokens)
+    if cached is not None:
+        return measure_stream(iter(cached), request_start, on_metrics) if stream else "".join(cached)
     
-    client = get_groq_client()
-    default_system_prompt = (
-        "You are an AI digital twin. Answer questions as if you are the person, "
-        "speaking in first person about your background, skills, and experience."
+    flight_key = cache_key or make_key(prompt, system_prompt, model, temperature, max_tokens)
+    generate = partial(
+        _generate, prompt, system_prompt, model, temperature, max_tokens, stream, cache, cache_key, first_token_timeout
     )
+    if stream:
+        return measure_stream(_flight.stream(flight_key, generate), request_start, on_metrics)
+    return _flight.do(flight_key, generate)
+
+
+def _generate(
+    prompt: str,
+    system_prompt: Optional[str],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    stream: bool,
+    cache: Optional[ResponseCache],
+    cache_key: Optional[str],
+    first_token_timeout: Optional[float] = None
+) -> str | Iterator[str]:
+    """Call Groq with retries (the uncached, uncoalesced part of generate_response)"""
+    start_time = time.time()
+    client = get_groq_client()
+    limiter = get_rate_limiter()
+    estimated_tokens = _estimate_tokens(prompt, system_prompt, max_tokens, model)
     
     last_error = None
     
     # Retry loop for transient failures
     for attempt in range(1, MAX_RETRIES + 1):
         try:
+            # Wait for our share of the rate limit instead of stampeding into 429s
+            limiter.acquire(estimated_tokens)
             print(f"🤖 Generating response with Groq (attempt {attempt}/{MAX_RETRIES})...")
             
-            completion = client.chat.completions.create(
+            completion = _send_completion(
+                client,
                 model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": system_prompt or default_system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=_build_messages(prompt, system_prompt),
                 temperature=temperature,
                 max_tokens=max_tokens,
                 top_p=1,
@@ -105,18 +418,32 @@ def generate_response(
             
             # Handle streaming response
             if stream:
+                # Stalls and failures before the first token are retried by this loop
+                contents = _stream_contents(completion)
+                first = first_chunk(contents, first_token_timeout, partial(_close_stream, completion))
+                if first is None:
+                    raise RuntimeError("Groq returned an empty stream")
+                
                 def stream_generator():
                     """Generator for streaming chunks"""
+                    chunks = [first]
                     try:
-                        for chunk in completion:
-                            content = chunk.choices[0].delta.content
-                            if content:
-                                yield content
+                        yield first
+                        for content in contents:
+                            chunks.append(content)
+                            yield content
                     except Exception as e:
-                        print(f"❌ Streaming error: {e}")
-                        yield f"\n[Error: {e}]"
+                        # Tokens were already emitted, so retrying would repeat them
+                        print(f"❌ Streaming error after {len(chunks)} chunks: {e}")
+                        raise RuntimeError(f"Groq stream failed after {len(chunks)} chunks: {e}") from e
+                    finally:
+                        _close_stream(completion)
+                    
+                    # Only complete streams are cached
+                    if cache is not None:
+                        cache.set(cache_key, chunks)
                 
-                print(f"✓ Streaming response initiated")
+                print(f"✓ Streaming response initiated (first token after {int((time.time() - start_time) * 1000)}ms)")
                 return stream_generator()
             
             # Handle non-streaming response
@@ -126,8 +453,10 @@ def generate_response(
             if not response:
                 raise RuntimeError("Groq returned empty response")
             
-            print(f"✓ Response generated in {duration_ms}ms ({len(response)} chars)")
+            print(f"✓ Response generated in {duration_ms}ms ({len(response)} chars{_usage_note(completion)})")
             
+            if cache is not None:
+                cache.set(cache_key, [response])
             return response
             
         except Exception as error:
@@ -136,38 +465,10 @@ def generate_response(
             
             print(f"❌ Groq generation failed (attempt {attempt}/{MAX_RETRIES}) after {duration_ms}ms: {error}")
             
-            error_msg = str(error).lower()
-            
-            # Handle specific Groq API errors
-            
-            # Rate limit errors
-            if "429" in error_msg or "rate limit" in error_msg:
-                print("⚠️ Rate limit hit, waiting before retry...")
-                if attempt < MAX_RETRIES:
-                    time.sleep((RETRY_DELAY_MS * attempt) / 1000)  # Exponential backoff
-                    continue
-                raise RuntimeError("Groq API rate limit exceeded. Please try again later.")
-            
-            # Authentication errors
-            if "401" in error_msg or "unauthorized" in error_msg:
-                raise RuntimeError("Invalid Groq API key. Please check your credentials.")
-            
-            # Model not found
-            if "404" in error_msg or "model_not_found" in error_msg:
-                raise RuntimeError(f"Model '{model}' not found. Please use a valid Groq model.")
-            
-            # Timeout errors
-            if "timeout" in error_msg:
-                print("⚠️ Request timeout, retrying...")
-                if attempt < MAX_RETRIES:
-                    time.sleep(RETRY_DELAY_MS / 1000)
-                    continue
-                raise RuntimeError("Groq API request timed out. Please try again.")
-            
-            # Retry for other transient errors
+            # Handle specific Groq API errors (raises if not retryable)
+            delay = _retry_delay(error, attempt, model, start_time)
             if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY_MS / 1000)
-                continue
+                time.sleep(delay)
     
     # If all retries failed
     raise RuntimeError(
@@ -180,7 +481,10 @@ def generate_response_streaming(
     system_prompt: Optional[str] = None,
     model: str = DEFAULT_MODEL,
     temperature: float = 1.0,
-    max_tokens: int = 1024
+    max_tokens: int = 1024,
+    use_cache: bool = True,
+    first_token_timeout: Optional[float] = None,
+    on_metrics: Optional[Callable[[StreamMetrics], None]] = None
 ) -> Iterator[str]:
     """
     Generate streaming AI response using Groq
@@ -192,6 +496,9 @@ def generate_response_streaming(
         model: Groq model to use
         temperature: Sampling temperature
         max_tokens: Maximum tokens in response
+        use_cache: Set False to bypass the response cache for this call
+        first_token_timeout: Seconds to wait for the first token before retrying
+        on_metrics: Called with the stream's StreamMetrics when it ends
         
     Yields:
         str: Chunks of the generated response
@@ -206,28 +513,266 @@ def generate_response_streaming(
         model=model,
         temperature=temperature,
         max_tokens=max_tokens,
-        stream=True
+        stream=True,
+        use_cache=use_cache,
+        first_token_timeout=first_token_timeout,
+        on_metrics=on_metrics
     )
     
     # result is an iterator
     yield from result
 
 
-def validate_groq_connection() -> bool:
+async def _create_completion_async(
+    prompt: str,
+    system_prompt: Optional[str],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    stream: bool,
+    timeout: Optional[float],
+    first_token_timeout: Optional[float] = None
+):
+    """
+    Create a chat completion on the shared async client, with retries
+    For streams, waiting for the first token is part of each attempt, and
+    (stream, contents, first_token) is returned.
+    """
+    client = get_async_groq_client()
+    limiter = get_rate_limiter()
+    estimated_tokens = _estimate_tokens(prompt, system_prompt, max_tokens, model)
+    start_time = time.time()
+    last_error = None
+    
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            await limiter.acquire_async(estimated_tokens)
+            completion = await asyncio.wait_for(
+                _send_completion_async(
+                    client,
+                    model=model,
+                    messages=_build_messages(prompt, system_prompt),
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    top_p=1,
+                    stream=stream,
+                    stop=None
+                ),
+                timeout
+            )
+            if not stream:
+                return completion
+            
+            contents = _stream_contents_async(completion)
+            first = await first_chunk_async(contents, first_token_timeout, partial(_close_stream_async, completion))
+            if first is None:
+                raise RuntimeError("Groq returned an empty stream")
+            return completion, contents, first
+        except Exception as error:
+            if isinstance(error, asyncio.TimeoutError) and not isinstance(error, FirstTokenTimeout):
+                error = TimeoutError(f"Request timeout after {timeout}s")
+            last_error = error
+            duration_ms = int((time.time() - start_time) * 1000)
+            
+            print(f"❌ Groq generation failed (attempt {attempt}/{MAX_RETRIES}) after {duration_ms}ms: {error}")
+            
+            delay = _retry_delay(error, attempt, model, start_time)
+            if attempt < MAX_RETRIES:
+                await asyncio.sleep(delay)
+    
+    raise RuntimeError(
+        f"Failed to generate response after {MAX_RETRIES} attempts: {last_error}"
+    )
+
+
+async def generate_response_async(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 0.7,
+    max_tokens: int = 1024,
+    timeout: Optional[float] = DEFAULT_TIMEOUT_S,
+    use_cache: bool = True
+) -> str:
+    """
+    Generate AI response without blocking the event loop
+    Same retry, error handling, response caching and request coalescing as
+    generate_response, on a shared keep-alive connection pool.
+    
+    Args:
+        prompt: User prompt/question
+        system_prompt: System instructions for the AI (optional)
+        model: Groq model to use
+        temperature: Sampling temperature (0.0-2.0)
+        max_tokens: Maximum tokens in response
+        timeout: Per-attempt timeout in seconds (None for no limit)
+        use_cache: Set False to bypass the response cache for this call
+        
+    Returns:
+        str: Generated response text
+        
+    Raises:
+        ValueError: If prompt is invalid
+        RuntimeError: If generation fails after retries
+        
+    Example:
+        >>> answers = await asyncio.gather(*(generate_response_async(q) for q in questions))
+    """
+    prompt = _prepare_prompt(prompt, model)
+    cache, cache_key, cached = _cached_response(use_cache, prompt, system_prompt, model, temperature, max_tokens)
+    if cached is not None:
+        return "".join(cached)
+    
+    flight_key = cache_key or make_key(prompt, system_prompt, model, temperature, max_tokens)
+    return await _async_flight.do(
+        flight_key,
+        lambda: _generate_async(prompt, system_prompt, model, temperature, max_tokens, timeout, cache, cache_key)
+    )
+
+
+async def _generate_async(
+    prompt: str,
+    system_prompt: Optional[str],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: Optional[float],
+    cache: Optional[ResponseCache],
+    cache_key: Optional[str]
+) -> str:
+    start_time = time.time()
+    completion = await _create_completion_async(
+        prompt, system_prompt, model, temperature, max_tokens, stream=False, timeout=timeout
+    )
+    
+    response = completion.choices[0].message.content.strip() if completion.choices else None
+    if not response:
+        raise RuntimeError("Groq returned empty response")
+    
+    duration_ms = int((time.time() - start_time) * 1000)
+    print(f"✓ Response generated in {duration_ms}ms ({len(response)} chars{_usage_note(completion)})")
+    if cache is not None:
+        cache.set(cache_key, [response])
+    return response
+
+
+async def generate_response_streaming_async(
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    model: str = DEFAULT_MODEL,
+    temperature: float = 1.0,
+    max_tokens: int = 1024,
+    timeout: Optional[float] = DEFAULT_TIMEOUT_S,
+    use_cache: bool = True,
+    first_token_timeout: Optional[float] = None,
+    on_metrics: Optional[Callable[[StreamMetrics], None]] = None
+) -> AsyncIterator[str]:
+    """
+    Stream an AI response without blocking the event loop
+    Cached responses are replayed chunk by chunk; concurrent identical
+    requests subscribe to one upstream stream. Stalls and failures before
+    the first token are retried transparently.
+    
+    Args:
+        prompt: User prompt/question
+        system_prompt: System instructions for the AI (optional)
+        model: Groq model to use
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens in response
+        timeout: Timeout in seconds for opening the stream (per attempt)
+        use_cache: Set False to bypass the response cache for this call
+        first_token_timeout: Seconds to wait for the first token before retrying
+            (defaults to Settings.STREAM_FIRST_TOKEN_TIMEOUT_S)
+        on_metrics: Called with the stream's StreamMetrics when it ends
+        
+    Yields:
+        str: Chunks of the generated response
+        
+    Example:
+        >>> async for chunk in generate_response_streaming_async("Tell me about Python"):
+        ...     print(chunk, end="", flush=True)
+    """
+    request_start = time.perf_counter()
+    prompt = _prepare_prompt(prompt, model)
+    if first_token_timeout is None:
+        first_token_timeout = Settings.STREAM_FIRST_TOKEN_TIMEOUT_S
+    
+    cache, cache_key, cached = _cached_response(use_cache, prompt, system_prompt, model, temperature, max_tokens)
+    if cached is not None:
+        source = _replay_async(cached)
+    else:
+        flight_key = cache_key or make_key(prompt, system_prompt, model, temperature, max_tokens)
+        source = _async_flight.stream(
+            flight_key,
+            lambda: _stream_async(
+                prompt, system_prompt, model, temperature, max_tokens, timeout, cache, cache_key, first_token_timeout
+            )
+        )
+    
+    async for chunk in measure_stream_async(source, request_start, on_metrics):
+        yield chunk
+
+
+async def _replay_async(chunks: List[str]) -> AsyncIterator[str]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _stream_async(
+    prompt: str,
+    system_prompt: Optional[str],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    timeout: Optional[float],
+    cache: Optional[ResponseCache],
+    cache_key: Optional[str],
+    first_token_timeout: Optional[float]
+) -> AsyncIterator[str]:
+    stream, contents, first = await _create_completion_async(
+        prompt, system_prompt, model, temperature, max_tokens,
+        stream=True, timeout=timeout, first_token_timeout=first_token_timeout
+    )
+    
+    chunks = [first]
+    try:
+        yield first
+        async for content in contents:
+            chunks.append(content)
+            yield content
+    except Exception as error:
+        # Tokens were already emitted, so retrying would repeat them
+        print(f"❌ Streaming error after {len(chunks)} chunks: {error}")
+        raise RuntimeError(f"Groq stream failed after {len(chunks)} chunks: {error}") from error
+    finally:
+        await _close_stream_async(stream)
+    
+    # Only reached when the stream completed
+    if cache is not None:
+        cache.set(cache_key, chunks)
+
+
+def validate_groq_connection(max_age_s: Optional[float] = None) -> bool:
     """
     Validate Groq API connection
+    Lists the available models instead of running a completion, and reuses
+    a result newer than max_age_s (see health.check_dependencies).
+    
+    Args:
+        max_age_s: Oldest cached result to accept (defaults to Settings.HEALTH_CACHE_TTL_S)
     
     Returns:
         bool: True if connection is valid
     """
-    try:
-        print("🔍 Validating Groq API connection...")
-        generate_response("Test", "Respond with 'OK'", DEFAULT_MODEL)
-        print("✓ Groq API connection validated")
+    from health import check_dependencies  # health imports this module
+    
+    print("🔍 Validating Groq API connection...")
+    result = check_dependencies(["groq"], max_age_s)["checks"]["groq"]
+    if result["ok"]:
+        print(f"✓ Groq API connection validated ({result['latency_ms']:.0f}ms)")
         return True
-    except Exception as error:
-        print(f"❌ Groq API connection validation failed: {error}")
-        return False
+    print(f"❌ Groq API connection validation failed: {result['error']}")
+    return False
 
 
 if __name__ == "__main__":
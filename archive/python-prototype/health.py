@@ -0,0 +1,151 @@
+"""
+Dependency Health Checks
+Cheap readiness probes for the services the digital twin depends on
+Each probe is a metadata call (Groq's model list, the vector index info),
+so no completion tokens are spent. Probes run in parallel, so a check takes
+as long as the slowest probe rather than the sum, and results are cached
+for HEALTH_CACHE_TTL_S: health endpoints serve the cached status instead of
+calling upstream on every poll, and concurrent refreshes share one probe.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from groq_client import get_groq_client
+from settings import Settings
+from single_flight import SingleFlight
+from vector_clients import get_vector_client
+
+
+def probe_groq(timeout: float) -> Dict[str, Any]:
+    """List the available Groq models (no tokens are generated)"""
+    models = get_groq_client().models.list(timeout=timeout)
+    return {"models": len(getattr(models, "data", None) or [])}
+
+
+def probe_vector(timeout: float) -> Dict[str, Any]:
+    """Read the vector index info (also warms the shared read-only client)"""
+    info = get_vector_client(read_only=True).info()
+    return {"vectors": info.get("vectorCount", 0)}
+
+
+# Probes by dependency name; each takes a timeout and returns extra status fields
+PROBES: Dict[str, Callable[[float], Dict[str, Any]]] = {
+    "groq": probe_groq,
+    "vector": probe_vector,
+}
+
+_lock = threading.Lock()
+_results: Dict[str, Dict[str, Any]] = {}
+_flight = SingleFlight()
+
+
+def _run_probe(name: str, timeout: float) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        result = {"ok": True, **PROBES[name](timeout)}
+    except Exception as error:
+        result = {"ok": False, "error": str(error)}
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    result["checked_at"] = time.time()
+    return result
+
+
+def _probe_all(names: tuple, timeout: float) -> Dict[str, Dict[str, Any]]:
+    """Run probes in parallel; a probe still running at the deadline is reported as failed"""
+    executor = ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="health")
+    try:
+        futures = {name: executor.submit(_run_probe, name, timeout) for name in names}
+        wait(futures.values(), timeout=timeout)
+        results = {}
+        for name, future in futures.items():
+            if future.done():
+                results[name] = future.result()
+            else:
+                results[name] = {
+                    "ok": False,
+                    "error": f"No response within {timeout}s",
+                    "latency_ms": round(timeout * 1000, 1),
+                    "checked_at": time.time()
+                }
+    finally:
+        # Never wait for a hung probe; its thread finishes in the background
+        executor.shutdown(wait=False)
+
+    with _lock:
+        _results.update(results)
+    return results
+
+
+def _summary(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "status": "ok" if all(result["ok"] for result in results.values()) else "degraded",
+        "checks": results
+    }
+
+
+def check_dependencies(
+    names: Optional[Iterable[str]] = None,
+    max_age_s: Optional[float] = None,
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Probe dependencies, reusing results newer than max_age_s
+
+    Args:
+        names: Dependencies to check (default: all of PROBES)
+        max_age_s: Oldest cached result to reuse (defaults to Settings.HEALTH_CACHE_TTL_S;
+            0 forces fresh probes)
+        timeout: Per-probe deadline in seconds (defaults to Settings.HEALTH_PROBE_TIMEOUT_S)
+
+    Returns:
+        {"status": "ok" | "degraded", "checks": {name: {"ok", "latency_ms",
+        "checked_at", "error" or probe fields}}}
+    """
+    names = tuple(names or PROBES)
+    max_age_s = Settings.HEALTH_CACHE_TTL_S if max_age_s is None else max_age_s
+    timeout = timeout or Settings.HEALTH_PROBE_TIMEOUT_S
+
+    now = time.time()
+    with _lock:
+        fresh = {
+            name: _results[name] for name in names
+            if name in _results and now - _results[name]["checked_at"] <= max_age_s
+        }
+    stale = tuple(name for name in names if name not in fresh)
+    if stale:
+        fresh.update(_flight.do(stale, lambda: _probe_all(stale, timeout)))
+    return _summary({name: fresh[name] for name in names})
+
+
+def cached_status() -> Dict[str, Any]:
+    """
+    The latest probe results without calling any upstream
+
+    Returns:
+        Same shape as check_dependencies; status is "unknown" before the first check
+    """
+    with _lock:
+        results = dict(_results)
+    if not results:
+        return {"status": "unknown", "checks": {}}
+    return _summary(results)
+
+
+def is_stale(max_age_s: Optional[float] = None) -> bool:
+    """Whether any dependency is unchecked or its result older than max_age_s"""
+    max_age_s = Settings.HEALTH_CACHE_TTL_S if max_age_s is None else max_age_s
+    now = time.time()
+    with _lock:
+        return any(name not in _results or now - _results[name]["checked_at"] > max_age_s for name in PROBES)
+
+
+def print_health(status: Dict[str, Any]) -> None:
+    """Print one line per dependency"""
+    for name, result in status["checks"].items():
+        if result["ok"]:
+            print(f"✓ {name}: reachable ({result['latency_ms']:.0f}ms)")
+        else:
+            print(f"❌ {name}: {result['error']}")
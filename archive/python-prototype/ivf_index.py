@@ -0,0 +1,184 @@
+"""
+IVF Approximate Nearest-Neighbour Index
+Inverted-file index over the rows of LocalVectorClient's embedding matrix.
+Vectors are clustered with spherical k-means; a query only scores the rows
+in its nprobe closest clusters instead of the whole corpus.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+DEFAULT_NLIST = 256
+DEFAULT_NPROBE = 16
+MIN_TRAIN_POINTS_PER_LIST = 39  # Below this, k-means centroids are unreliable
+MAX_TRAIN_POINTS_PER_LIST = 64
+TRAIN_ITERATIONS = 10
+ASSIGN_BATCH_SIZE = 16384
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF) index keyed by matrix row
+    Each row is assigned to its nearest centroid. Inserts, deletes and row
+    moves only update a row -> list assignment array; the per-list row
+    ranges are rebuilt with one vectorized argsort on the next query.
+    Recall/latency is tuned with nprobe (lists scanned per query).
+    """
+
+    def __init__(
+        self,
+        nlist: int = DEFAULT_NLIST,
+        nprobe: int = DEFAULT_NPROBE,
+        seed: int = 0
+    ):
+        """
+        Initialize an untrained IVF index
+
+        Args:
+            nlist: Number of clusters (inverted lists)
+            nprobe: Default number of lists scanned per query
+            seed: Random seed for k-means initialization
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._assignment = np.full(0, -1, dtype=np.int32)
+        self._order: Optional[np.ndarray] = None
+        self._bounds: Optional[np.ndarray] = None
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    @staticmethod
+    def min_train_size(nlist: int) -> int:
+        return nlist * MIN_TRAIN_POINTS_PER_LIST
+
+    def train(self, vectors: np.ndarray) -> None:
+        """
+        Learn centroids with spherical k-means on a sample of vectors
+
+        Args:
+            vectors: (n, dimension) array of L2-normalized vectors
+
+        Raises:
+            ValueError: If there are fewer vectors than lists
+        """
+        if vectors.shape[0] < self.nlist:
+            raise ValueError(f"Need at least {self.nlist} vectors to train {self.nlist} lists")
+
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(vectors.shape[0], self.nlist * MAX_TRAIN_POINTS_PER_LIST)
+        sample = np.asarray(vectors[np.sort(rng.choice(vectors.shape[0], sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, self.nlist, replace=False)].copy()
+
+        for _ in range(TRAIN_ITERATIONS):
+            labels = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=self.nlist)
+
+            # Reseed empty lists from random sample points
+            empty = np.flatnonzero(counts == 0)
+            if empty.size:
+                sums[empty] = sample[rng.choice(sample_size, empty.size, replace=False)]
+
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        self.centroids = centroids
+        self._assignment[:] = -1
+        self._order = None
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        labels = np.empty(vectors.shape[0], dtype=np.int32)
+        for start in range(0, vectors.shape[0], ASSIGN_BATCH_SIZE):
+            batch = vectors[start:start + ASSIGN_BATCH_SIZE]
+            labels[start:start + batch.shape[0]] = np.argmax(batch @ centroids.T, axis=1)
+        return labels
+
+    def _ensure_capacity(self, required: int) -> None:
+        capacity = self._assignment.shape[0]
+        if required <= capacity:
+            return
+        grown = np.full(max(required, capacity * 2, 64), -1, dtype=np.int32)
+        grown[:capacity] = self._assignment
+        self._assignment = grown
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """
+        Assign (or reassign) rows to their nearest list
+
+        Args:
+            rows: Matrix row of each vector
+            vectors: (len(rows), dimension) L2-normalized vectors
+        """
+        if not self.trained or len(rows) == 0:
+            return
+        rows = np.asarray(rows, dtype=np.int64)
+        self._ensure_capacity(int(rows.max()) + 1)
+        self._assignment[rows] = self._nearest(vectors, self.centroids)
+        self._order = None
+
+    def move(self, source: int, target: int) -> None:
+        """Carry a row's assignment over when the matrix moves it to a new row"""
+        if not self.trained:
+            return
+        self._ensure_capacity(max(source, target) + 1)
+        self._assignment[target] = self._assignment[source]
+        self._assignment[source] = -1
+        self._order = None
+
+    def remove(self, row: int) -> None:
+        """Drop a row from its list"""
+        if row < self._assignment.shape[0]:
+            self._assignment[row] = -1
+            self._order = None
+
+    def reset(self) -> None:
+        """Forget centroids and assignments"""
+        self.centroids = None
+        self._assignment = np.full(0, -1, dtype=np.int32)
+        self._order = None
+
+    def load_state(self, centroids: np.ndarray, assignment: np.ndarray) -> None:
+        """Restore a trained index from saved arrays"""
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self._assignment = np.array(assignment, dtype=np.int32)
+        self._order = None
+
+    def assignment(self, count: int) -> np.ndarray:
+        """Row -> list assignments for the first count rows"""
+        self._ensure_capacity(count)
+        return self._assignment[:count]
+
+    def _rebuild_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        order = np.argsort(self._assignment, kind="stable")
+        bounds = np.searchsorted(self._assignment[order], np.arange(self.nlist + 1))
+        # Returned as well as stored: a write may reset _order before the caller reads it
+        self._order, self._bounds = order, bounds
+        return order, bounds
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """
+        Rows in the lists closest to the query
+
+        Args:
+            query: L2-normalized query vector
+            nprobe: Lists to scan (defaults to self.nprobe)
+
+        Returns:
+            Array of candidate matrix rows
+        """
+        order, bounds = self._order, self._bounds
+        if order is None:
+            order, bounds = self._rebuild_lists()
+
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        centroid_scores = self.centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        return np.concatenate([order[bounds[probe_list]:bounds[probe_list + 1]] for probe_list in probe])
@@ -0,0 +1,832 @@
+"""
+Local Vector Client
+In-process NumPy vector index with the same interface as UpstashVectorClient
+Keeps embeddings in a contiguous float32 matrix and answers queries with a
+single vectorized cosine top-k, so retrieval needs no network round trip.
+Indexes can be saved to a directory and reopened with mmap, so restarted or
+forked workers serve queries immediately from shared, zero-copy pages.
+For large corpora an IVF approximate index (index_type="ivf") can replace
+the exact scan, and float16/int8 storage cuts memory 2-4x.
+"""
+
+import json
+import mmap
+import os
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ivf_index import DEFAULT_NLIST, DEFAULT_NPROBE, IVFIndex
+
+DEFAULT_DIMENSION = 1024  # Matches mixedbread-ai/mxbai-embed-large-v1
+INITIAL_CAPACITY = 64
+
+# On-disk layout of a saved index directory
+MANIFEST_FILE = "index.json"
+VECTORS_FILE = "vectors.npy"
+OFFSETS_FILE = "offsets.npy"
+RECORDS_FILE = "records.jsonl"
+CODES_FILE = "codes.npy"
+SCALES_FILE = "scales.npy"
+IVF_CENTROIDS_FILE = "ivf_centroids.npy"
+IVF_ASSIGNMENT_FILE = "ivf_assignment.npy"
+# Array files whose presence depends on storage mode and index type; save()
+# lists the ones it wrote in the manifest and removes the rest
+ARRAY_FILES = (VECTORS_FILE, CODES_FILE, SCALES_FILE, IVF_CENTROIDS_FILE, IVF_ASSIGNMENT_FILE)
+
+# Quantized storage
+STORAGE_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+INT8_MAX = 127
+RESCORE_FACTOR = 4  # Candidates kept for exact rescoring, as a multiple of top_k
+SCORE_BATCH_ROWS = 65536  # Rows dequantized at a time while scanning
+FORMAT_VERSION = 1
+
+EmbedFn = Callable[[Sequence[str]], np.ndarray]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """
+    Deterministic feature-hashing embedder for offline use
+    Maps words and character trigrams into a fixed number of signed buckets.
+    It is lexical rather than semantic, but needs no model or network access,
+    which makes it suitable for CI and local development.
+    """
+
+    def __init__(self, dimension: int = DEFAULT_DIMENSION):
+        self.dimension = dimension
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        sign = 1.0 if digest & 1 else -1.0
+        return (digest >> 1) % self.dimension, sign
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = _TOKEN_PATTERN.findall(text.lower())
+            features = list(words)
+            for word in words:
+                padded = f"#{word}#"
+                features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+            for feature in features:
+                bucket, sign = self._bucket(feature)
+                matrix[row, bucket] += sign
+        return matrix
+
+
+@dataclass
+class LocalQueryResult:
+    """
+    Query result mirroring upstash_vector's QueryResult
+    Supports both attribute access (result.score) and dict-style access
+    (result.get('score')), since callers in this repo use both.
+    """
+
+    id: str
+    score: float
+    metadata: Optional[Dict[str, Any]] = None
+    vector: Optional[List[float]] = None
+    data: Optional[str] = None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+
+def _matches_filters(metadata: Optional[Dict[str, Any]], filters: Dict[str, Any]) -> bool:
+    """Equality match on metadata fields; list-valued fields match on membership"""
+    metadata = metadata or {}
+    for key, expected in filters.items():
+        value = metadata.get(key)
+        if isinstance(value, list) and not isinstance(expected, list):
+            if expected not in value:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+class _MappedRecords:
+    """
+    Read-only view over a saved records.jsonl file
+    The file is mapped with mmap and a record is only parsed when its row is
+    accessed, so opening an index never deserializes the whole corpus.
+    """
+
+    def __init__(self, records_path: str, offsets: np.ndarray):
+        self._file = open(records_path, "rb")
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = offsets
+
+    def __getitem__(self, row: int) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        record = json.loads(self._buffer[start:end])
+        return record["id"], record.get("metadata"), record.get("data")
+
+    def close(self) -> None:
+        self._buffer.close()
+        self._file.close()
+
+
+class LocalVectorClient:
+    """
+    In-process vector index with the UpstashVectorClient interface
+    Vectors are L2-normalized on insert so cosine similarity is a single
+    matrix-vector product. Scores use Upstash's COSINE normalization,
+    (1 + cos) / 2, so existing score thresholds keep their meaning.
+    With index_type="ivf", queries scan only the nprobe nearest IVF lists
+    once enough vectors are present to train it; until then they are exact.
+    With storage="float16" or "int8", the scan runs over quantized codes;
+    rescore=True keeps float32 originals and re-ranks the best candidates
+    exactly. The originals are memory-mapped when the index is loaded from
+    disk, so only the rescored rows are paged in.
+    """
+
+    def __init__(
+        self,
+        read_only: bool = False,
+        dimension: int = DEFAULT_DIMENSION,
+        embed_fn: Optional[EmbedFn] = None,
+        path: Optional[str] = None,
+        index_type: str = "flat",
+        nlist: int = DEFAULT_NLIST,
+        nprobe: int = DEFAULT_NPROBE,
+        storage: str = "float32",
+        rescore: bool = False
+    ):
+        """
+        Initialize a local vector index
+
+        Args:
+            read_only: If True, write operations raise like the Upstash read-only client
+            dimension: Embedding dimension (taken from the saved index when loading)
+            embed_fn: Callable mapping a list of texts to an (n, dimension) array.
+                Defaults to HashingEmbedder, which works fully offline.
+            path: Optional index directory. If it contains a saved index, the
+                index is opened with mmap; save() writes back to it.
+            index_type: "flat" for exact search or "ivf" for approximate search
+            nlist: Number of IVF lists (index_type="ivf" only)
+            nprobe: Default IVF lists scanned per query; higher is slower but
+                more accurate (index_type="ivf" only)
+            storage: "float32", "float16" or "int8" (per-vector scalar quantization)
+            rescore: Re-rank quantized candidates with exact float32 scores
+
+        Raises:
+            ValueError: If index_type or storage is unknown, or the saved files'
+                row counts do not match the manifest
+        """
+        if index_type not in ("flat", "ivf"):
+            raise ValueError(f"Unknown index_type '{index_type}'. Use 'flat' or 'ivf'")
+        if storage not in STORAGE_DTYPES:
+            raise ValueError(f"Unknown storage '{storage}'. Use one of: {', '.join(STORAGE_DTYPES)}")
+
+        self.read_only = read_only
+        self.path = path
+        self.index_type = index_type
+        self.storage = storage
+        self.rescore = rescore and storage != "float32"
+        self._mapped: Optional[_MappedRecords] = None
+        self._ivf = IVFIndex(nlist=nlist, nprobe=nprobe) if index_type == "ivf" else None
+        # Guards the matrix, records and IVF lists: the shared client is
+        # written by ingestion while chat threads query it
+        self._lock = threading.RLock()
+
+        manifest_path = os.path.join(path, MANIFEST_FILE) if path else None
+        if manifest_path and os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            dimension = manifest["dimension"]
+            self.storage = manifest.get("storage", "float32")
+            saved_files = manifest.get("files")
+            has_vectors = (VECTORS_FILE in saved_files if saved_files is not None
+                           else os.path.exists(os.path.join(path, VECTORS_FILE)))
+            self.rescore = rescore and self.storage != "float32" and has_vectors
+            self._open_mapped(path, manifest["count"], dimension)
+            if self._ivf is not None and manifest.get("ivf"):
+                assignment = np.load(os.path.join(path, IVF_ASSIGNMENT_FILE))
+                if len(assignment) != manifest["count"]:
+                    raise ValueError(f"{IVF_ASSIGNMENT_FILE} in {path} has {len(assignment)} rows, "
+                                     f"expected {manifest['count']}")
+                self._ivf.nlist = manifest["ivf"]["nlist"]
+                self._ivf.load_state(np.load(os.path.join(path, IVF_CENTROIDS_FILE)), assignment)
+        else:
+            self._reset_storage(dimension)
+
+        self.dimension = dimension
+        self.embed_fn = embed_fn or HashingEmbedder(dimension)
+
+        source = f"mmap from {path}" if self._mapped else "in-memory"
+        print(f"✓ Local vector client initialized ({'read-only' if read_only else 'read-write'} mode, dim={dimension}, {self.storage}, {source})")
+
+    @property
+    def _keeps_float32(self) -> bool:
+        return self.storage == "float32" or self.rescore
+
+    def _allocate(self, capacity: int, dimension: int) -> None:
+        """Allocate zeroed vector storage for the configured storage type"""
+        self._vectors = np.zeros((capacity, dimension), dtype=np.float32) if self._keeps_float32 else None
+        self._codes = None
+        self._scales = None
+        if self.storage != "float32":
+            self._codes = np.zeros((capacity, dimension), dtype=STORAGE_DTYPES[self.storage])
+        if self.storage == "int8":
+            self._scales = np.zeros(capacity, dtype=np.float32)
+
+    def _storage_arrays(self) -> List[np.ndarray]:
+        return [array for array in (self._vectors, self._codes, self._scales) if array is not None]
+
+    def _reset_storage(self, dimension: int) -> None:
+        self._allocate(INITIAL_CAPACITY, dimension)
+        self._count = 0
+        self._ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._data: List[Optional[str]] = []
+
+    def _open_mapped(self, path: str, count: int, dimension: int) -> None:
+        """Map a saved index without copying vectors or parsing records"""
+        if count == 0:
+            self._reset_storage(dimension)
+            return
+        self._vectors = None
+        self._codes = None
+        self._scales = None
+        if self._keeps_float32:
+            self._vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+        if self.storage != "float32":
+            self._codes = np.load(os.path.join(path, CODES_FILE), mmap_mode="r")
+        if self.storage == "int8":
+            self._scales = np.load(os.path.join(path, SCALES_FILE), mmap_mode="r")
+        offsets = np.load(os.path.join(path, OFFSETS_FILE), mmap_mode="r")
+
+        # A mismatch means files from different saves; querying would index out of bounds
+        records_path = os.path.join(path, RECORDS_FILE)
+        if len(offsets) != count + 1 or os.path.getsize(records_path) != int(offsets[-1]):
+            raise ValueError(f"{RECORDS_FILE} in {path} does not hold the {count} records listed in {MANIFEST_FILE}")
+        for name, array in ((VECTORS_FILE, self._vectors), (CODES_FILE, self._codes), (SCALES_FILE, self._scales)):
+            if array is not None and (array.shape[0] != count or (array.ndim == 2 and array.shape[1] != dimension)):
+                raise ValueError(f"{name} in {path} has shape {array.shape}, expected {count} rows of dimension {dimension}")
+
+        self._mapped = _MappedRecords(records_path, offsets)
+        self._count = count
+        self._ids = self._metadata = self._data = None
+        self._row_of = None
+
+    def _materialize(self) -> None:
+        """Copy a mapped index into private memory before the first write"""
+        if self._mapped is None:
+            return
+        records = [self._mapped[row] for row in range(self._count)]
+        mapped_arrays = self._storage_arrays()
+        self._allocate(max(INITIAL_CAPACITY, self._count), self.dimension)
+        for target, source in zip(self._storage_arrays(), mapped_arrays):
+            target[:self._count] = source[:self._count]
+
+        self._mapped.close()
+        self._mapped = None
+        self._ids = [record[0] for record in records]
+        self._metadata = [record[1] for record in records]
+        self._data = [record[2] for record in records]
+        self._row_of = {vector_id: row for row, vector_id in enumerate(self._ids)}
+
+    def _record(self, row: int) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        if self._mapped is not None:
+            return self._mapped[row]
+        return self._ids[row], self._metadata[row], self._data[row]
+
+    def _embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.asarray(self.embed_fn(list(texts)), dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Embedding function returned shape {vectors.shape}, expected (n, {self.dimension})"
+            )
+        return vectors
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _ensure_capacity(self, required: int) -> None:
+        capacity = self._storage_arrays()[0].shape[0]
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        current = self._storage_arrays()
+        self._allocate(capacity, self.dimension)
+        for grown, old in zip(self._storage_arrays(), current):
+            grown[:self._count] = old[:self._count]
+
+    def _write_rows(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Store normalized vectors (and their quantized codes) at the given rows"""
+        if self._vectors is not None:
+            self._vectors[rows] = vectors
+        if self.storage == "float16":
+            self._codes[rows] = vectors.astype(np.float16)
+        elif self.storage == "int8":
+            scales = np.abs(vectors).max(axis=1) / INT8_MAX
+            scales[scales == 0] = 1.0
+            self._codes[rows] = np.rint(vectors / scales[:, None]).astype(np.int8)
+            self._scales[rows] = scales
+
+    def _move_row(self, source: int, target: int) -> None:
+        for array in self._storage_arrays():
+            array[target] = array[source]
+
+    def _dequantize(self, rows: Union[slice, np.ndarray]) -> np.ndarray:
+        """Approximate float32 vectors reconstructed from codes"""
+        vectors = self._codes[rows].astype(np.float32)
+        if self._scales is not None:
+            vectors *= self._scales[rows][:, None]
+        return vectors
+
+    def _float32_rows(self, rows: Union[slice, np.ndarray]) -> np.ndarray:
+        """Exact vectors when stored, otherwise the dequantized approximation"""
+        if self._vectors is not None:
+            return np.asarray(self._vectors[rows])
+        return self._dequantize(rows)
+
+    def _scan_scores(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Cosine scores from the scan representation (codes when quantized)"""
+        if self.storage == "float32":
+            return self._vectors[:self._count] @ query if rows is None else self._vectors[rows] @ query
+
+        total = self._count if rows is None else rows.shape[0]
+        scores = np.empty(total, dtype=np.float32)
+        for start in range(0, total, SCORE_BATCH_ROWS):
+            end = min(start + SCORE_BATCH_ROWS, total)
+            batch = slice(start, end) if rows is None else rows[start:end]
+            scores[start:end] = self._dequantize(batch) @ query
+        return scores
+
+    def _check_writable(self, operation: str) -> None:
+        if self.read_only:
+            raise RuntimeError(f"Cannot {operation} in read-only mode. Initialize with read_only=False")
+        with self._lock:
+            self._materialize()
+
+    def upsert_texts(
+        self,
+        items: Iterable[Tuple[str, Union[str, Sequence[float]], Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+        max_concurrency: int = 1,
+        max_retries: int = 1,
+        on_batch: Optional[Callable[[List[Tuple], Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Upsert items, embedding raw text locally
+
+        Args:
+            items: Iterable of (id, text_or_vector, metadata) tuples. Text is
+                embedded with embed_fn; precomputed vectors are stored as-is.
+            batch_size: If set, consume items lazily and embed/store them in
+                batches of this size, bounding peak memory
+            max_concurrency: Accepted for UpstashVectorClient compatibility
+            max_retries: Accepted for UpstashVectorClient compatibility
+            on_batch: Called with each batch's items and timing once it is stored
+
+        Returns:
+            Summary dict in the same shape as UpstashVectorClient.upsert_texts
+
+        Raises:
+            RuntimeError: If client is in read-only mode
+            ValueError: If a vector has the wrong dimension
+        """
+        self._check_writable("upsert")
+
+        start_time = time.perf_counter()
+        iterator = iter(items)
+        timings = []
+        while True:
+            batch = list(islice(iterator, batch_size)) if batch_size else list(iterator)
+            if not batch and (timings or batch_size):
+                break
+            batch_start = time.perf_counter()
+            self._upsert_batch(batch)
+            timing = {
+                "batch": len(timings),
+                "size": len(batch),
+                "seconds": time.perf_counter() - batch_start,
+                "attempts": 1
+            }
+            timings.append(timing)
+            if on_batch:
+                on_batch(batch, timing)
+            if not batch_size:
+                break
+
+        seconds = time.perf_counter() - start_time
+        total = sum(timing["size"] for timing in timings)
+        return {
+            "items": total,
+            "batches": len(timings),
+            "failed_batches": [],
+            "seconds": seconds,
+            "items_per_second": total / seconds if seconds > 0 else 0.0,
+            "batch_timings": timings
+        }
+
+    def _upsert_batch(self, items_list: List[Tuple]) -> None:
+        print(f"📤 Upserting {len(items_list)} items to local vector index...")
+
+        texts = [(i, item[1]) for i, item in enumerate(items_list) if isinstance(item[1], str)]
+        vectors = np.empty((len(items_list), self.dimension), dtype=np.float32)
+        if texts:
+            vectors[[i for i, _ in texts]] = self._embed([text for _, text in texts])
+        for i, item in enumerate(items_list):
+            if not isinstance(item[1], str):
+                vectors[i] = np.asarray(item[1], dtype=np.float32)
+        vectors = self._normalize(vectors)
+
+        with self._lock:
+            self._ensure_capacity(self._count + len(items_list))
+            rows = np.empty(len(items_list), dtype=np.int64)
+            for i, item in enumerate(items_list):
+                vector_id, payload = item[0], item[1]
+                metadata = item[2] if len(item) > 2 else None
+                data = payload if isinstance(payload, str) else None
+
+                row = self._row_of.get(vector_id)
+                if row is None:
+                    row = self._count
+                    self._count += 1
+                    self._row_of[vector_id] = row
+                    self._ids.append(vector_id)
+                    self._metadata.append(metadata)
+                    self._data.append(data)
+                else:
+                    self._metadata[row] = metadata
+                    self._data[row] = data
+                rows[i] = row
+
+            self._write_rows(rows, vectors)
+            if self._ivf is not None:
+                self._ivf.add(rows, vectors)
+
+        print(f"✓ Successfully upserted {len(items_list)} items")
+
+    def _filter_mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        if not filters:
+            return None
+        if not isinstance(filters, dict):
+            raise ValueError("Local vector index only supports dict equality filters")
+        return np.fromiter(
+            (_matches_filters(self._record(row)[1], filters) for row in range(self._count)),
+            dtype=bool,
+            count=self._count
+        )
+
+    def _top_k(self, scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the top_k scores, highest first"""
+        if top_k >= scores.shape[0]:
+            return np.argsort(-scores, kind="stable")
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def _build_results(
+        self,
+        rows: np.ndarray,
+        cosines: np.ndarray,
+        include_metadata: bool,
+        include_vectors: bool
+    ) -> List[LocalQueryResult]:
+        results = []
+        for row, cosine in zip(rows.tolist(), cosines.tolist()):
+            vector_id, metadata, data = self._record(row)
+            results.append(LocalQueryResult(
+                id=vector_id,
+                score=float((1.0 + cosine) / 2.0),
+                metadata=metadata if include_metadata else None,
+                vector=self._float32_rows(np.array([row]))[0].tolist() if include_vectors else None,
+                data=data
+            ))
+        return results
+
+    def build_ann_index(self) -> None:
+        """
+        Train the IVF index on the current vectors and assign every row
+        Called automatically by the first query once enough vectors exist;
+        call it again after large ingestions to refresh the centroids.
+
+        Raises:
+            ValueError: If the client was not created with index_type="ivf"
+        """
+        if self._ivf is None:
+            raise ValueError("ANN index requires index_type='ivf'")
+
+        with self._lock:
+            print(f"🧭 Training IVF index ({self._ivf.nlist} lists) on {self._count} vectors...")
+            vectors = self._float32_rows(slice(0, self._count))
+            ivf = IVFIndex(nlist=self._ivf.nlist, nprobe=self._ivf.nprobe, seed=self._ivf.seed)
+            ivf.train(vectors)
+            ivf.add(np.arange(self._count), vectors)
+            # Swapped in whole, so concurrent queries never see centroids without their lists
+            self._ivf = ivf
+
+    def _candidate_rows(self, query_vector: np.ndarray, nprobe: Optional[int]) -> Optional[np.ndarray]:
+        """Rows to score for a query, or None to scan the whole matrix"""
+        if self._ivf is None:
+            return None
+        if not self._ivf.trained:
+            if self._count < IVFIndex.min_train_size(self._ivf.nlist):
+                return None
+            self.build_ann_index()
+        return self._ivf.candidates(query_vector, nprobe)
+
+    def query_vector(
+        self,
+        vector: Sequence[float],
+        top_k: int = 5,
+        include_metadata: bool = True,
+        include_vectors: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None
+    ) -> List[LocalQueryResult]:
+        """
+        Query the local index with a precomputed embedding
+
+        Args:
+            vector: Query embedding (normalized internally)
+            top_k: Number of results to return
+            include_metadata: Whether to include metadata in results
+            include_vectors: Whether to include vector embeddings in results
+            filters: Optional dict of metadata equality filters
+            nprobe: IVF lists to scan for this query (index_type="ivf" only)
+
+        Returns:
+            List of matching results with scores and metadata, best first
+        """
+        query = self._normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        with self._lock:
+            if self._count == 0 or top_k <= 0:
+                return []
+
+            rows = self._candidate_rows(query, nprobe)
+
+            mask = self._filter_mask(filters)
+            if mask is not None:
+                rows = np.flatnonzero(mask) if rows is None else rows[mask[rows]]
+
+            scores = self._scan_scores(query, rows)
+            if scores.shape[0] == 0:
+                return []
+
+            if self.rescore:
+                # Re-rank an oversampled candidate set with exact float32 scores
+                shortlist = self._top_k(scores, min(top_k * RESCORE_FACTOR, scores.shape[0]))
+                rows = np.sort(shortlist if rows is None else rows[shortlist])
+                scores = self._vectors[rows] @ query
+
+            top = self._top_k(scores, min(top_k, scores.shape[0]))
+            matched = top if rows is None else rows[top]
+            return self._build_results(matched, scores[top], include_metadata, include_vectors)
+
+    def query_text(
+        self,
+        query: str,
+        top_k: int = 5,
+        include_metadata: bool = True,
+        include_vectors: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None
+    ) -> List[LocalQueryResult]:
+        """
+        Query the local index with raw text
+
+        Args:
+            query: Raw text query (embedded with embed_fn)
+            top_k: Number of results to return
+            include_metadata: Whether to include metadata in results
+            include_vectors: Whether to include vector embeddings in results
+            filters: Optional dict of metadata equality filters
+            nprobe: IVF lists to scan for this query (index_type="ivf" only)
+
+        Returns:
+            List of matching results with scores and metadata, best first
+        """
+        print(f"🔍 Querying local vector index: '{query[:50]}...' (top_k={top_k})")
+
+        results = []
+        if self._count > 0 and top_k > 0:
+            results = self.query_vector(
+                self._embed([query])[0],
+                top_k=top_k,
+                include_metadata=include_metadata,
+                include_vectors=include_vectors,
+                filters=filters,
+                nprobe=nprobe
+            )
+
+        print(f"✓ Found {len(results)} results")
+        return results
+
+    def query_many(
+        self,
+        queries: Sequence[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        include_vectors: bool = False,
+        max_concurrency: int = 1
+    ) -> List[List[LocalQueryResult]]:
+        """
+        Run many text queries at once
+        Queries are embedded in one embed_fn call. For an unfiltered exact
+        float32 index all scores come from a single matrix-matrix product.
+
+        Args:
+            queries: Raw text queries
+            top_k: Number of results per query
+            filters: Optional dict of metadata equality filters for every query
+            include_metadata: Whether to include metadata in results
+            include_vectors: Whether to include vector embeddings in results
+            max_concurrency: Accepted for UpstashVectorClient compatibility
+
+        Returns:
+            One result list per query, in input order
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+
+        print(f"🔍 Querying local vector index with {len(queries)} queries (top_k={top_k})")
+        if self._count == 0 or top_k <= 0:
+            return [[] for _ in queries]
+
+        query_vectors = self._normalize(self._embed(queries))
+        with self._lock:
+            if self._ivf is not None or self.storage != "float32" or filters:
+                return [
+                    self.query_vector(vector, top_k, include_metadata, include_vectors, filters)
+                    for vector in query_vectors
+                ]
+
+            scores = self._vectors[:self._count] @ query_vectors.T
+            k = min(top_k, self._count)
+            if k < self._count:
+                top = np.argpartition(-scores, k - 1, axis=0)[:k]
+            else:
+                top = np.broadcast_to(np.arange(self._count)[:, None], scores.shape)
+            results = []
+            for column in range(len(queries)):
+                rows = top[:, column]
+                rows = rows[np.argsort(-scores[rows, column], kind="stable")]
+                results.append(self._build_results(rows, scores[rows, column], include_metadata, include_vectors))
+            return results
+
+    def info(self) -> Dict[str, Any]:
+        """
+        Get information about the local index
+
+        Returns:
+            Dictionary with index information (dimension, count, etc.)
+        """
+        with self._lock:
+            return {
+                'dimension': self.dimension,
+                'vectorCount': self._count,
+                'similarityFunction': 'COSINE',
+                'indexType': self.index_type,
+                'storage': self.storage,
+                'vectorBytes': sum(array[:self._count].nbytes for array in self._storage_arrays())
+            }
+
+    def list_ids(self) -> List[str]:
+        """
+        IDs of every vector in the index
+
+        Returns:
+            List of vector IDs
+        """
+        with self._lock:
+            return [self._record(row)[0] for row in range(self._count)]
+
+    def delete(self, ids: List[str]) -> None:
+        """
+        Delete vectors by ID
+        The last row is moved into each freed slot so the matrix stays contiguous.
+
+        Args:
+            ids: List of vector IDs to delete
+
+        Raises:
+            RuntimeError: If client is in read-only mode
+        """
+        self._check_writable("delete")
+
+        deleted = 0
+        with self._lock:
+            for vector_id in ids:
+                row = self._row_of.pop(vector_id, None)
+                if row is None:
+                    continue
+                last = self._count - 1
+                if row != last:
+                    moved_id = self._ids[last]
+                    self._move_row(last, row)
+                    self._ids[row] = moved_id
+                    self._metadata[row] = self._metadata[last]
+                    self._data[row] = self._data[last]
+                    self._row_of[moved_id] = row
+                    if self._ivf is not None:
+                        self._ivf.move(last, row)
+                elif self._ivf is not None:
+                    self._ivf.remove(row)
+                self._ids.pop()
+                self._metadata.pop()
+                self._data.pop()
+                self._count -= 1
+                deleted += 1
+
+        print(f"✓ Deleted {deleted} vectors")
+
+    def reset(self) -> None:
+        """
+        Delete all vectors from the index
+
+        Raises:
+            RuntimeError: If client is in read-only mode
+        """
+        self._check_writable("reset")
+
+        with self._lock:
+            self._reset_storage(self.dimension)
+            if self._ivf is not None:
+                self._ivf.reset()
+        print("✓ Index reset (all vectors deleted)")
+
+    def save(self, path: Optional[str] = None) -> None:
+        """
+        Persist the index so it can be reopened with mmap
+        Files are written to temporary names and swapped in with os.replace,
+        so workers that still map the previous version are not disturbed.
+        Array files an earlier save wrote but this one does not (e.g. after a
+        storage change) are removed.
+
+        Args:
+            path: Index directory (defaults to the path given at construction)
+
+        Raises:
+            ValueError: If no path is available
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path given for saving the local vector index")
+        os.makedirs(path, exist_ok=True)
+
+        with self._lock:
+            self._write_files(path)
+        self.path = path
+        print(f"✓ Saved {self._count} vectors to {path}")
+
+    def _write_files(self, path: str) -> None:
+        offsets = np.zeros(self._count + 1, dtype=np.int64)
+        with open(os.path.join(path, RECORDS_FILE + ".tmp"), "wb") as f:
+            for row in range(self._count):
+                vector_id, metadata, data = self._record(row)
+                line = json.dumps({"id": vector_id, "metadata": metadata, "data": data}).encode("utf-8") + b"\n"
+                f.write(line)
+                offsets[row + 1] = offsets[row] + len(line)
+        with open(os.path.join(path, OFFSETS_FILE + ".tmp"), "wb") as f:
+            np.save(f, offsets)
+        files = [RECORDS_FILE, OFFSETS_FILE]
+        for name, array in ((VECTORS_FILE, self._vectors), (CODES_FILE, self._codes), (SCALES_FILE, self._scales)):
+            if array is not None:
+                with open(os.path.join(path, name + ".tmp"), "wb") as f:
+                    np.save(f, np.ascontiguousarray(array[:self._count]))
+                files.append(name)
+        manifest = {
+            "version": FORMAT_VERSION,
+            "dimension": self.dimension,
+            "count": self._count,
+            "storage": self.storage
+        }
+        if self._ivf is not None and self._ivf.trained:
+            with open(os.path.join(path, IVF_CENTROIDS_FILE + ".tmp"), "wb") as f:
+                np.save(f, self._ivf.centroids)
+            with open(os.path.join(path, IVF_ASSIGNMENT_FILE + ".tmp"), "wb") as f:
+                np.save(f, self._ivf.assignment(self._count))
+            manifest["ivf"] = {"nlist": self._ivf.nlist}
+            files += [IVF_CENTROIDS_FILE, IVF_ASSIGNMENT_FILE]
+        manifest["files"] = files
+        with open(os.path.join(path, MANIFEST_FILE + ".tmp"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        for name in files + [MANIFEST_FILE]:
+            os.replace(os.path.join(path, name + ".tmp"), os.path.join(path, name))
+        for name in ARRAY_FILES:
+            if name not in files and os.path.exists(os.path.join(path, name)):
+                os.remove(os.path.join(path, name))
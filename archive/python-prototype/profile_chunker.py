@@ -0,0 +1,333 @@
+"""
+Profile Chunker
+Turns digitaltwin.json into retrieval chunks of roughly uniform size
+What to index is declared in PROFILE_SCHEMA, one Section per part of the
+profile. Lists of short items (skills, questions, courses) are packed
+together up to CHUNK_TARGET_TOKENS, and long texts (experience write-ups,
+STAR stories) are split at sentence boundaries into windows of that size,
+each repeating up to CHUNK_OVERLAP_TOKENS from the end of the previous one.
+Retrieved contexts are therefore compact and predictable, which keeps RAG
+prompts small.
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from context_packer import count_tokens
+from settings import Settings
+
+# Joins the items packed into one chunk
+ITEM_SEPARATOR = "\n"
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _label(key: str) -> str:
+    return key.replace("_", " ").strip().capitalize()
+
+
+def _sentences(parts: Sequence[str]) -> str:
+    """Join parts as sentences without doubling punctuation they already end with"""
+    return " ".join(part if part.endswith((".", "!", "?")) else f"{part}." for part in parts if part)
+
+
+def render_value(value: Any) -> str:
+    """Plain-text rendering of a JSON value: lists comma-joined, dicts as "Key: value" sentences"""
+    if isinstance(value, dict):
+        return _sentences([f"{_label(key)}: {render_value(item)}" for key, item in value.items()
+                           if item not in (None, "", [], {})])
+    if isinstance(value, list):
+        return ", ".join(render_value(item) for item in value)
+    return str(value)
+
+
+@dataclass(frozen=True)
+class Section:
+    """
+    One part of the profile to index
+
+    Attributes:
+        path: Dotted path of the value in the profile (e.g. "skills.soft_skills")
+        title: Chunk title, or a function of the list item when each is set
+        chunk_type: Stored as metadata "type"
+        category: Stored as metadata "category"
+        tags: Stored as metadata "tags"
+        render: Turns the value (or one list item) into text
+        each: Chunk every list item on its own instead of packing the list
+    """
+    path: str
+    title: Union[str, Callable[[Any], str]]
+    chunk_type: str
+    category: str = ""
+    tags: Tuple[str, ...] = ()
+    render: Callable[[Any], str] = render_value
+    each: bool = False
+
+
+# Renderers for sections whose layout the plain rendering would not capture
+
+def _personal_details(personal: Dict) -> str:
+    fields = [("marital_status", "Marital Status"), ("relationship_status", "Relationship Status"),
+              ("nationality", "Nationality"), ("Age", "Age"), ("gender", "Gender"), ("location", "Location")]
+    return _sentences([f"{label}: {personal[key]}" for key, label in fields if personal.get(key)])
+
+
+def _experience_title(experience: Dict) -> str:
+    name = experience.get("project_name", experience.get("company", "Unknown"))
+    return f"{experience.get('type', 'Experience')}: {name}"
+
+
+def _experience(experience: Dict) -> str:
+    details = [f"{label}: {experience[key]}" for key, label in
+               (("role", "Role"), ("title", "Title"), ("duration", "Duration"), ("context", "Context"))
+               if experience.get(key)]
+    for number, star in enumerate(experience.get("achievements_star", []), 1):
+        details.append(
+            f"Achievement {number}. Situation: {star.get('situation', '')}. Task: {star.get('task', '')}. "
+            f"Action: {star.get('action', '')}. Result: {star.get('result', '')}"
+        )
+    return _sentences(details)
+
+
+def _technical_skills(technical: Dict) -> str:
+    languages = [f"{language['language']} ({language.get('proficiency', '')}): {', '.join(language.get('concepts', []))}"
+                 for language in technical.get("programming_languages", [])]
+    lists = [f"{_label(key)}: {render_value(items)}" for key, items in technical.items()
+             if key != "programming_languages" and items]
+    return _sentences(languages + lists)
+
+
+def _education(education: Dict) -> str:
+    return (f"Studying {education.get('degree', '')} at {education.get('university', '')}. "
+            f"Major: {education.get('major', '')}. Currently in {education.get('current_year', '')}. "
+            f"Expected graduation: {education.get('expected_graduation', '')}")
+
+
+def _qualification(qualification: Dict) -> str:
+    return (f"{qualification.get('qualification', '')} from {qualification.get('institution', '')}. "
+            f"Certified by {qualification.get('certification_body', '')}. "
+            f"Skills: {', '.join(qualification.get('skills_gained', []))}. {qualification.get('relevance', '')}")
+
+
+def _accomplishment_title(item: Dict) -> str:
+    name = item.get("name", item.get("qualification", "Unknown"))
+    prefix = {"Technical Project": "Technical Project", "Academic Achievement": "Achievement"}
+    return f"{prefix.get(item.get('type'), 'Certification')}: {name}"
+
+
+def _accomplishment(item: Dict) -> str:
+    name = item.get("name", item.get("qualification", "Unknown"))
+    if item.get("type") == "Technical Project":
+        return (f"{name} ({item.get('date_completed', '')}). Technologies: {', '.join(item.get('technologies', []))}. "
+                f"Achievements: {'. '.join(item.get('achievements', []))}. "
+                f"Business impact: {item.get('business_impact', '')}. Key metrics: {render_value(item.get('key_metrics', {}))}")
+    if item.get("type") == "Academic Achievement":
+        return f"{name} at {item.get('institution', '')} ({item.get('date_awarded', '')}). {item.get('criteria', '')}"
+    return f"{name} from {item.get('issuer', '')} ({item.get('date_completed', '')}). Skills: {', '.join(item.get('skills', []))}"
+
+
+def _weakness(item: Dict) -> str:
+    return f"Weakness: {item.get('weakness', '')}. How I address it: {item.get('mitigation', '')}"
+
+
+PROFILE_SCHEMA: List[Section] = [
+    # Personal
+    Section("personal.summary", "Personal Summary", "personal", "overview", ("about", "introduction")),
+    Section("personal.elevator_pitch", "Elevator Pitch", "personal", "overview", ("pitch", "introduction")),
+    Section("personal", "Personal Details", "personal", "details", ("personal", "demographics"), _personal_details),
+
+    # Experience: summary and STAR stories, windowed by size
+    Section("experience", _experience_title, "experience", "work_history", ("experience", "star"), _experience, each=True),
+    Section("projects_portfolio", lambda project: f"Portfolio Project: {project.get('name', 'Unknown')}",
+            "project", "projects", ("project", "portfolio"), each=True),
+
+    # Skills
+    Section("skills.technical", "Technical Skills", "skill", "technical", ("programming", "technical"), _technical_skills),
+    Section("skills.soft_skills", "Soft Skills", "skill", "soft_skills", ("soft skills",)),
+    Section("skills.devops_and_infrastructure", "DevOps and Infrastructure", "skill", "devops", ("devops", "infrastructure")),
+    Section("skills.certifications_summary", "Certifications", "certification", "education", ("certification",)),
+
+    # Education
+    Section("education", "Education Background", "education", "academic", ("education", "university"), _education),
+    Section("education.relevant_coursework", "Academic Coursework", "education", "academic", ("coursework", "education")),
+    Section("education.additional_qualifications", lambda item: f"Qualification: {item.get('qualification', '')}",
+            "qualification", "education", ("qualification", "certification"), _qualification, each=True),
+    Section("education.certifications_and_accomplishments", _accomplishment_title, "accomplishment", "education",
+            ("accomplishment",), _accomplishment, each=True),
+
+    # Goals and preferences
+    Section("career_goals", "Career Goals", "goals", "career", ("goals", "career")),
+    Section("salary_location", "Salary and Location Preferences", "preferences", "compensation", ("salary", "location")),
+
+    # Interview preparation
+    Section("interview_prep.common_questions.behavioral", "Behavioral Interview Questions", "interview", "questions",
+            ("interview", "behavioral")),
+    Section("interview_prep.common_questions.technical", "Technical Interview Questions", "interview", "questions",
+            ("interview", "technical")),
+    Section("interview_prep.common_questions.coding_challenges", "Coding Challenges", "interview", "questions",
+            ("interview", "coding")),
+    Section("interview_prep.common_questions.situational", "Situational Interview Questions", "interview", "questions",
+            ("interview", "situational")),
+    Section("interview_prep.common_questions.company_research", "Company Research", "interview", "research",
+            ("interview", "research")),
+    Section("interview_prep.weakness_mitigation", "Weaknesses and Mitigation", "interview", "self_assessment",
+            ("interview", "weakness"), _weakness),
+    Section("interview_prep.strengths_to_highlight", "Strengths to Highlight", "interview", "self_assessment",
+            ("interview", "strengths")),
+
+    # Professional development
+    Section("professional_development.recent_learning", "Recent Learning", "development", "learning", ("learning",)),
+    Section("professional_development.online_courses", "Online Courses", "development", "learning", ("courses",)),
+    Section("professional_development.extracurricular", "Extracurricular Activities", "development", "community",
+            ("extracurricular",)),
+    Section("professional_development.practice_platforms", "Practice Platforms", "development", "learning", ("practice",)),
+    Section("professional_development.reading_resources", "Reading Resources", "development", "learning", ("reading",)),
+]
+
+
+def make_chunk_id(chunk_type: str, text: str) -> str:
+    """
+    Deterministic chunk ID derived from the chunk's content
+    Unlike sequential IDs, editing or inserting one entry leaves the IDs of
+    every other chunk unchanged.
+    """
+    digest = hashlib.sha1(f"{chunk_type}\x00{text}".encode("utf-8")).hexdigest()
+    return f"chunk-{digest[:16]}"
+
+
+def _lookup(profile: Dict, path: str) -> Any:
+    value: Any = profile
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def _windows(units: Sequence[str], target_tokens: int, overlap_tokens: int, separator: str) -> List[str]:
+    """Pack units greedily into windows of at most target_tokens, carrying up to overlap_tokens forward"""
+    separator_tokens = count_tokens(separator) if separator.strip() else 1
+    windows: List[str] = []
+    current: List[str] = []
+    size = 0
+    for unit in units:
+        tokens = count_tokens(unit)
+        if current and size + separator_tokens + tokens > target_tokens:
+            windows.append(separator.join(current))
+            carried: List[str] = []
+            size = 0
+            for previous in reversed(current):
+                previous_tokens = count_tokens(previous) + (separator_tokens if carried else 0)
+                if size + previous_tokens > overlap_tokens:
+                    break
+                carried.insert(0, previous)
+                size += previous_tokens
+            # Drop overlap the next unit would not fit beside, so no window exceeds the target
+            while carried and size + separator_tokens + tokens > target_tokens:
+                size -= count_tokens(carried.pop(0)) + (separator_tokens if carried else 0)
+            current = carried
+        size += tokens + (separator_tokens if current else 0)
+        current.append(unit)
+    if current:
+        windows.append(separator.join(current))
+    return windows
+
+
+def split_text(text: str, target_tokens: int, overlap_tokens: int = 0) -> List[str]:
+    """
+    Split text into windows of about target_tokens at sentence boundaries
+
+    Args:
+        text: Text to split
+        target_tokens: Window size; text within it is returned whole
+        overlap_tokens: Trailing sentences (up to this many tokens) repeated
+            at the start of the next window
+
+    Returns:
+        List of windows (one sentence longer than target_tokens is split at words)
+    """
+    if count_tokens(text) <= target_tokens:
+        return [text]
+
+    units: List[str] = []
+    for sentence in _SENTENCE_END.split(text):
+        if count_tokens(sentence) <= target_tokens:
+            units.append(sentence)
+        else:
+            units.extend(_windows(sentence.split(), target_tokens, 0, " "))
+    return _windows(units, target_tokens, overlap_tokens, " ")
+
+
+def chunk_profile(
+    profile: Dict,
+    schema: Optional[Sequence[Section]] = None,
+    target_tokens: Optional[int] = None,
+    overlap_tokens: Optional[int] = None
+) -> List[Tuple[str, str, Dict]]:
+    """
+    Chunk a profile according to a schema
+
+    Args:
+        profile: Parsed digitaltwin.json
+        schema: Sections to index (defaults to PROFILE_SCHEMA)
+        target_tokens: Chunk content size (defaults to Settings.CHUNK_TARGET_TOKENS)
+        overlap_tokens: Overlap between windows of one long text
+            (defaults to Settings.CHUNK_OVERLAP_TOKENS)
+
+    Returns:
+        List of (id, text, metadata) tuples; text is "title: content" and the
+        metadata holds title, type, content, category, tags and section
+    """
+    schema = PROFILE_SCHEMA if schema is None else schema
+    target_tokens = target_tokens or Settings.CHUNK_TARGET_TOKENS
+    overlap_tokens = Settings.CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+
+    chunks: List[Tuple[str, str, Dict]] = []
+    seen_ids = set()
+
+    def emit(section: Section, title: str, windows: List[str]) -> None:
+        windows = [window for window in windows if window.strip()]
+        for part, content in enumerate(windows, 1):
+            part_title = f"{title} (part {part})" if len(windows) > 1 else title
+            text = f"{part_title}: {content}"
+
+            # Hashed without the part label, so a window keeps its ID when the
+            # section gains or loses windows. Identical chunks get a numbered
+            # suffix so IDs stay unique.
+            base_id = make_chunk_id(section.chunk_type, f"{title}: {content}")
+            chunk_id = base_id
+            duplicate = 1
+            while chunk_id in seen_ids:
+                duplicate += 1
+                chunk_id = f"{base_id}-{duplicate}"
+            seen_ids.add(chunk_id)
+
+            chunks.append((chunk_id, text, {
+                "title": part_title,
+                "type": section.chunk_type,
+                "content": content,
+                "category": section.category,
+                "tags": list(section.tags),
+                "section": section.path
+            }))
+
+    for section in schema:
+        value = _lookup(profile, section.path)
+        if value in (None, "", [], {}):
+            continue
+
+        if section.each:
+            for item in value:
+                title = section.title(item) if callable(section.title) else section.title
+                emit(section, title, split_text(section.render(item), target_tokens, overlap_tokens))
+        elif isinstance(value, list):
+            # Short items share a chunk; an item too long for one is split on its own
+            units = [unit for item in value
+                     for unit in split_text(section.render(item), target_tokens, overlap_tokens)]
+            emit(section, section.title, _windows(units, target_tokens, 0, ITEM_SEPARATOR))
+        else:
+            emit(section, section.title, split_text(section.render(value), target_tokens, overlap_tokens))
+
+    return chunks
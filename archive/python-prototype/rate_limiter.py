@@ -0,0 +1,196 @@
+"""
+Rate Limiter
+Shared token-bucket scheduler for Groq calls
+Every caller reserves one request and its estimated tokens before calling
+Groq; when a bucket is empty, callers are given successive slots instead of
+all retrying at once. Buckets are corrected from Groq's x-ratelimit-*
+response headers, and a Retry-After pauses every caller, not just the one
+that was rejected.
+
+The headers cover different windows: the *-tokens headers describe the
+per-minute token limit (TPM), while the *-requests headers describe the
+per-day request limit (RPD). The token bucket is sized from its headers;
+the per-minute request bucket only comes from GROQ_REQUESTS_PER_MINUTE,
+and the daily request headers only pause callers once the day is used up.
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Mapping, Optional
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Groq reset duration ("7.66s", "2m59.56s", "450ms") or plain seconds
+
+    Returns:
+        Seconds, or None if value is missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def backoff_delay(attempt: int, base_s: float, max_s: float) -> float:
+    """
+    Exponential backoff with equal jitter
+
+    Args:
+        attempt: 1-based attempt number that just failed
+        base_s: Delay after the first failure
+        max_s: Cap on the delay
+
+    Returns:
+        Seconds to wait: half of the capped exponential delay, plus a random
+        share of the other half, so concurrent callers spread out
+    """
+    delay = min(max_s, base_s * (2 ** (attempt - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class _Bucket:
+    """Token bucket; a capacity of 0 means no known limit"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        if self.capacity:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take amount (possibly going negative) and return the wait until it is covered"""
+        self._refill(now)
+        if not self.capacity or self.rate <= 0:
+            return 0.0
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def observe(self, limit: Optional[float], remaining: Optional[float], reset_s: Optional[float], now: float) -> None:
+        """Align the bucket with the server's view of a per-minute limit"""
+        self._refill(now)
+        if limit:
+            if not self.capacity:
+                # First sight of the limit: start full, then trim to remaining below
+                self.level = limit
+            self.capacity = limit
+            if not self.rate:
+                self.rate = limit / 60.0
+        if remaining is not None and self.capacity:
+            # Keep reservations already handed out, but never assume more room than the server reports
+            self.level = min(self.level, remaining)
+            if reset_s and remaining < self.capacity:
+                self.rate = (self.capacity - remaining) / reset_s
+
+
+class RateLimiter:
+    """
+    Request and token buckets shared by every Groq caller in the process
+    Thread-safe; acquire() blocks and acquire_async() awaits.
+    """
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        """
+        Initialize the limiter
+
+        Args:
+            requests_per_minute: Known request limit (0 = none; Groq's request
+                headers report a daily limit, so this is never learned)
+            tokens_per_minute: Known token limit (0 = learn from headers)
+        """
+        self._lock = threading.Lock()
+        self._requests = _Bucket(requests_per_minute)
+        self._tokens = _Bucket(tokens_per_minute)
+        self._paused_until = 0.0
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self._paused_until - now,
+                self._requests.reserve(1, now),
+                self._tokens.reserve(tokens, now)
+            )
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait for a request slot with room for tokens
+
+        Args:
+            tokens: Estimated tokens the request will use (prompt + max_tokens)
+
+        Returns:
+            Seconds waited
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            print(f"⏳ Rate limiter: waiting {wait:.2f}s for Groq capacity")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Same as acquire, without blocking the event loop"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            print(f"⏳ Rate limiter: waiting {wait:.2f}s for Groq capacity")
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller for seconds (e.g. after a 429 with Retry-After)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Optional[Mapping[str, str]]) -> None:
+        """
+        Correct the buckets from Groq's rate-limit response headers
+
+        Args:
+            headers: Response headers (x-ratelimit-* and retry-after); the
+                *-tokens headers cover one minute, the *-requests headers one day
+        """
+        if not headers:
+            return
+
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        with self._lock:
+            # Tokens per minute: limit, remaining and reset all describe the minute window
+            self._tokens.observe(
+                number("x-ratelimit-limit-tokens"),
+                number("x-ratelimit-remaining-tokens"),
+                parse_duration(headers.get("x-ratelimit-reset-tokens")),
+                time.monotonic()
+            )
+
+        # Requests per day: too coarse to size the per-minute request bucket, but once
+        # the day's requests are used up nothing succeeds until the window resets
+        remaining_requests = number("x-ratelimit-remaining-requests")
+        if remaining_requests is not None and remaining_requests <= 0:
+            self.pause(parse_duration(headers.get("x-ratelimit-reset-requests")) or 0.0)
+
+        retry_after = parse_duration(headers.get("retry-after"))
+        if retry_after:
+            self.pause(retry_after)
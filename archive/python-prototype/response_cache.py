@@ -0,0 +1,163 @@
+"""
+LLM Response Cache
+Content-addressed cache of Groq responses, keyed on everything that
+determines the output (prompt, system prompt, model, temperature, max_tokens).
+Hot entries live in an in-memory LRU; an optional sqlite file keeps them
+across restarts and processes.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from cache import TTLCache
+
+DEFAULT_MEMORY_ENTRIES = 512
+DEFAULT_DISK_ENTRIES = 10000
+DEFAULT_TTL_S = 86400.0
+
+
+def make_key(
+    prompt: str,
+    system_prompt: Optional[str],
+    model: str,
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """SHA-256 of the request parameters that determine the response"""
+    payload = json.dumps(
+        [prompt, system_prompt, model, float(temperature), int(max_tokens)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier response cache: memory LRU in front of an optional sqlite file
+    Responses are stored as the list of chunks they were produced in, so a
+    cached streaming answer can be replayed chunk by chunk and a cached
+    non-streaming answer is a single chunk.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MEMORY_ENTRIES,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_S,
+        path: Optional[str] = None,
+        max_disk_entries: int = DEFAULT_DISK_ENTRIES
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Entries kept in memory (least recently used evicted)
+            ttl_seconds: Entry lifetime in seconds (None = never expires)
+            path: sqlite file for the on-disk tier (None = memory only)
+            max_disk_entries: Rows kept on disk (least recently used evicted)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self._memory = TTLCache(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.disk_hits = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, chunks TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            The cached chunks, or None on a miss
+        """
+        chunks = self._memory.get(key)
+        if chunks is not None or self._db is None:
+            return chunks
+
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT chunks, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.disk_hits += 1
+
+        chunks = json.loads(row[0])
+        # Promote to memory for the rest of the disk row's lifetime, not a fresh TTL
+        self._memory.set(key, chunks, expires_in=None if row[1] is None else row[1] - now)
+        return chunks
+
+    def set(self, key: str, chunks: List[str]) -> None:
+        """
+        Store a response
+
+        Args:
+            key: Key from make_key()
+            chunks: Response text as produced (one chunk for non-streaming)
+        """
+        chunks = list(chunks)
+        self._memory.set(key, chunks)
+        if self._db is None:
+            return
+
+        now = time.time()
+        expires_at = None if self.ttl_seconds is None else now + self.ttl_seconds
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, chunks, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(chunks, ensure_ascii=False), expires_at, now)
+            )
+            self._db.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            )
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        self._memory.clear()
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the sqlite connection (the memory tier stays usable)"""
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        """
+        Cache counters
+
+        Returns:
+            Memory-tier counters plus disk_hits and disk_size
+        """
+        stats = self._memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        if self._db is not None:
+            with self._lock:
+                stats["disk_size"] = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return stats
@@ -0,0 +1,256 @@
+"""
+Semantic Answer Cache
+Serves stored RAG answers for questions that are close paraphrases of ones
+already answered, skipping both retrieval and generation.
+Questions are embedded into an in-process LocalVectorClient; a lookup is a
+hit when the best stored question scores at or above the threshold and was
+answered against the same profile (digitaltwin.json fingerprint) and model.
+Paraphrases only match with a sentence embedding model (SEMANTIC_CACHE_MODEL);
+the offline hashing embedder is lexical, so without a model the threshold is
+raised until only repeats of the same words hit.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from client_registry import credentials_fingerprint, registry
+from settings import Settings
+
+if TYPE_CHECKING:  # NumPy and the local index are imported when a cache is created, keeping cold starts fast
+    from local_vector_client import EmbedFn
+
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL_S = 86400.0
+DEFAULT_DIMENSION = 512
+
+# Minimum threshold with the lexical HashingEmbedder. Questions that differ in
+# one key word ("Python" vs "Java") still score 0.96-0.98 with it, so only
+# changes of case, punctuation or spacing are safe to treat as the same question.
+LEXICAL_THRESHOLD = 0.999
+
+# (path, mtime_ns, size) -> digest, so the profile is only re-hashed when it changes
+_profile_fingerprints: Dict[Tuple[str, int, int], str] = {}
+
+
+def profile_fingerprint(path: str) -> str:
+    """
+    SHA-256 of a profile file, cached on its modification time and size
+
+    Args:
+        path: Path to digitaltwin.json
+
+    Returns:
+        Hex digest, or "" if the file does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return ""
+
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _profile_fingerprints.get(key)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        _profile_fingerprints[key] = digest
+    return digest
+
+
+class SemanticCache:
+    """
+    Nearest-question answer cache
+    Bounded to max_entries (oldest evicted first) with a per-entry TTL.
+    Each miss records how long the full answer took, so a later hit can
+    report the latency it saved.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_S,
+        embed_fn: Optional["EmbedFn"] = None,
+        dimension: int = DEFAULT_DIMENSION
+    ):
+        """
+        Initialize an empty cache
+
+        Args:
+            threshold: Minimum similarity score (0-1, Upstash COSINE scale) for a hit
+            max_entries: Questions kept before the oldest is evicted
+            ttl_seconds: Entry lifetime in seconds (None = never expires)
+            embed_fn: Question embedder, e.g. from sentence_embedder(). Defaults
+                to the offline HashingEmbedder, which cannot tell "Python" from
+                "Java" in an otherwise identical question, so threshold is then
+                raised to at least LEXICAL_THRESHOLD.
+            dimension: Embedding dimension of embed_fn's vectors
+        """
+        from local_vector_client import LocalVectorClient  # Loads NumPy, so only once a cache is built
+
+        self.threshold = threshold if embed_fn else max(threshold, LEXICAL_THRESHOLD)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._index = LocalVectorClient(read_only=False, dimension=dimension, embed_fn=embed_fn)
+        self._expiry: "OrderedDict[str, Optional[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._profile = None
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+    def _sync_profile(self, profile: str) -> None:
+        # A re-ingested profile makes every stored answer stale
+        if profile != self._profile:
+            self.clear()
+            self._profile = profile
+
+    def lookup(self, question: str, model: str, profile: str = "") -> Optional[str]:
+        """
+        Find a stored answer to a similar question
+
+        Args:
+            question: Incoming question
+            model: Model the answer must have been generated with
+            profile: Fingerprint of the profile the answer must be based on
+
+        Returns:
+            The stored answer, or None on a miss
+        """
+        start_time = time.perf_counter()
+        with self._lock:
+            self._sync_profile(profile)
+            vector = self._index.embed_fn([question])[0]
+            results = self._index.query_vector(vector, top_k=1, filters={"model": model})
+
+            if results and results[0].score >= self.threshold:
+                entry_id, metadata = results[0].id, results[0].metadata
+                expires_at = self._expiry.get(entry_id)
+                if expires_at is None or time.time() < expires_at:
+                    self.hits += 1
+                    self.seconds_saved += max(metadata["seconds"] - (time.perf_counter() - start_time), 0.0)
+                    print(f"⚡ Semantic cache hit (similarity {results[0].score:.3f}): '{metadata['question'][:50]}'")
+                    return metadata["answer"]
+                self._remove(entry_id)
+
+            self.misses += 1
+            return None
+
+    def store(self, question: str, answer: str, model: str, seconds: float, profile: str = "") -> None:
+        """
+        Remember an answer
+
+        Args:
+            question: Question that was answered
+            answer: Generated answer
+            model: Model that generated it
+            seconds: Time the uncached answer took (used for latency-saved stats)
+            profile: Fingerprint of the profile the answer is based on
+        """
+        with self._lock:
+            self._sync_profile(profile)
+            entry_id = uuid.uuid4().hex
+            vector = self._index.embed_fn([question])[0]
+            self._index.upsert_texts([(entry_id, vector, {
+                "question": question, "answer": answer, "model": model, "seconds": seconds
+            })])
+            self._expiry[entry_id] = None if self.ttl_seconds is None else time.time() + self.ttl_seconds
+            while len(self._expiry) > self.max_entries:
+                self._remove(next(iter(self._expiry)))
+
+    def _remove(self, entry_id: str) -> None:
+        self._index.delete([entry_id])
+        self._expiry.pop(entry_id, None)
+
+    def clear(self) -> None:
+        """Drop every stored answer (counters are kept)"""
+        if self._expiry:
+            self._index.reset()
+            self._expiry.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters
+
+        Returns:
+            Dictionary with size, hits, misses, hit_rate and seconds_saved
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._expiry),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "seconds_saved": self.seconds_saved
+        }
+
+
+def sentence_embedder(model_name: str) -> Optional[Tuple["EmbedFn", int]]:
+    """
+    Load a sentence-transformers model as a question embedder
+
+    Args:
+        model_name: Model name or path (e.g. "all-MiniLM-L6-v2")
+
+    Returns:
+        (embed_fn, dimension), or None if sentence-transformers is not installed
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:  # Optional: the cache then only matches near-exact repeats
+        return None
+
+    import numpy as np
+
+    model = SentenceTransformer(model_name)
+
+    def embed(texts):
+        return np.asarray(model.encode(list(texts), normalize_embeddings=True), dtype=np.float32)
+
+    return embed, model.get_sentence_embedding_dimension()
+
+
+def _create_semantic_cache() -> SemanticCache:
+    model_name = Settings.SEMANTIC_CACHE_MODEL
+    embedder = sentence_embedder(model_name) if model_name else None
+    if embedder is None:
+        reason = "sentence-transformers is not installed" if model_name else "SEMANTIC_CACHE_MODEL is not set"
+        print(f"⚠️  Semantic cache has no sentence embedding model ({reason}); "
+              f"only near-exact repeats will hit (threshold {LEXICAL_THRESHOLD})")
+        embed_fn, dimension = None, DEFAULT_DIMENSION
+    else:
+        embed_fn, dimension = embedder
+        print(f"✓ Semantic cache embedding questions with {model_name}")
+
+    return SemanticCache(
+        threshold=Settings.SEMANTIC_CACHE_THRESHOLD,
+        max_entries=Settings.SEMANTIC_CACHE_SIZE,
+        ttl_seconds=Settings.SEMANTIC_CACHE_TTL_S,
+        embed_fn=embed_fn,
+        dimension=dimension
+    )
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    Return the process-wide semantic cache, or None if it is disabled
+    Enabled with SEMANTIC_CACHE_ENABLED=true; questions are embedded with
+    SEMANTIC_CACHE_MODEL, and the cache is tuned with SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_SIZE and SEMANTIC_CACHE_TTL_S.
+    """
+    if not Settings.SEMANTIC_CACHE_ENABLED:
+        return None
+
+    return registry.get(
+        "semantic-cache",
+        _create_semantic_cache,
+        credentials_fingerprint(
+            Settings.SEMANTIC_CACHE_MODEL, str(Settings.SEMANTIC_CACHE_THRESHOLD),
+            str(Settings.SEMANTIC_CACHE_SIZE), str(Settings.SEMANTIC_CACHE_TTL_S)
+        )
+    )
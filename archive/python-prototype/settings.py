@@ -1,26 +1,136 @@
 """
 Settings Module
 Loads and validates environment variables for the Digital Twin Workshop
+Importing this module has no side effects: the .env file is read and each
+setting parsed the first time a setting is accessed, and nothing is
+validated or printed until an entry point asks for it.
 """
 
 import os
-from typing import Optional
-from dotenv import load_dotenv
+import threading
+from typing import Any, Callable, Optional
 
-# Load environment variables from .env file
-load_dotenv()
+_dotenv_lock = threading.Lock()
+_dotenv_loaded = False
+
+
+def _load_dotenv() -> None:
+    """Load the .env file once, on first use of any setting"""
+    global _dotenv_loaded
+    
+    if _dotenv_loaded:
+        return
+    with _dotenv_lock:
+        if not _dotenv_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _dotenv_loaded = True
+
+
+def _flag(value: str) -> bool:
+    return value.lower() == "true"
+
+
+class _Env:
+    """
+    A setting read from the environment on first access
+    The parsed value then replaces this descriptor on the class, so later
+    reads are plain attribute lookups and assignments (e.g. in tests) work
+    as before.
+    """
+    
+    def __init__(self, default: str, parse: Callable[[str], Any] = str):
+        self.default = default
+        self.parse = parse
+        self.name = ""
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+    
+    def __get__(self, instance: Any, owner: type) -> Any:
+        _load_dotenv()
+        value = self.parse(os.environ.get(self.name, self.default))
+        setattr(owner, self.name, value)
+        return value
 
 
 class Settings:
-    """Application settings loaded from environment variables"""
+    """Application settings loaded lazily from environment variables"""
     
     # Upstash Vector Database
-    UPSTASH_VECTOR_REST_URL: str = os.environ.get("UPSTASH_VECTOR_REST_URL", "")
-    UPSTASH_VECTOR_REST_TOKEN: str = os.environ.get("UPSTASH_VECTOR_REST_TOKEN", "")
-    UPSTASH_VECTOR_REST_READONLY_TOKEN: str = os.environ.get("UPSTASH_VECTOR_REST_READONLY_TOKEN", "")
+    UPSTASH_VECTOR_REST_URL: str = _Env("")
+    UPSTASH_VECTOR_REST_TOKEN: str = _Env("")
+    UPSTASH_VECTOR_REST_READONLY_TOKEN: str = _Env("")
     
     # Groq API
-    GROQ_API_KEY: str = os.environ.get("GROQ_API_KEY", "")
+    GROQ_API_KEY: str = _Env("")
+    
+    # Vector backend: "upstash" (default) or "local" (in-process NumPy index)
+    VECTOR_BACKEND: str = _Env("upstash", str.lower)
+    
+    # Directory of the saved local index (opened with mmap when present)
+    LOCAL_VECTOR_PATH: str = _Env("")
+    
+    # Local index type: "flat" (exact) or "ivf" (approximate, for large corpora)
+    LOCAL_VECTOR_INDEX: str = _Env("flat", str.lower)
+    
+    # Local vector storage: "float32", "float16" or "int8", with optional exact rescoring
+    LOCAL_VECTOR_STORAGE: str = _Env("float32", str.lower)
+    LOCAL_VECTOR_RESCORE: bool = _Env("false", _flag)
+    
+    # Retrieval cache for query_text (0 entries = disabled)
+    QUERY_CACHE_SIZE: int = _Env("0", int)
+    QUERY_CACHE_TTL_S: float = _Env("300", float)
+    
+    # Exact-match LLM response cache (0 entries = disabled; path adds a sqlite tier)
+    RESPONSE_CACHE_SIZE: int = _Env("0", int)
+    RESPONSE_CACHE_TTL_S: float = _Env("86400", float)
+    RESPONSE_CACHE_PATH: str = _Env("")
+    
+    # Known Groq rate limits (0 = learn them from response headers)
+    GROQ_REQUESTS_PER_MINUTE: int = _Env("0", int)
+    GROQ_TOKENS_PER_MINUTE: int = _Env("0", int)
+    
+    # Streams that produce no token within this many seconds are retried (0 = no limit)
+    STREAM_FIRST_TOKEN_TIMEOUT_S: float = _Env("10", float)
+    
+    # Streamed text is written in batches of this many characters, or after this delay
+    STREAM_FLUSH_CHARS: int = _Env("64", int)
+    STREAM_FLUSH_INTERVAL_MS: int = _Env("50", int)
+    
+    # Chat service (chat_server.py): listen address, worker processes, concurrent requests, drain time
+    SERVICE_HOST: str = _Env("0.0.0.0")
+    PORT: int = _Env("8000", int)
+    WEB_CONCURRENCY: int = _Env("1", int)
+    SERVICE_MAX_CONCURRENCY: int = _Env("32", int)
+    SERVICE_MAX_QUEUE: int = _Env("64", int)
+    SERVICE_QUEUE_TIMEOUT_S: float = _Env("5", float)
+    SHUTDOWN_GRACE_S: float = _Env("30", float)
+    
+    # Dependency health probes: results reused for this long, per-probe deadline
+    HEALTH_CACHE_TTL_S: float = _Env("30", float)
+    HEALTH_PROBE_TIMEOUT_S: float = _Env("5", float)
+    
+    # embed_digitaltwin.py: manifest of uploaded chunk hashes (its journal sits alongside) and batch size
+    INGEST_MANIFEST_PATH: str = _Env(".ingest_manifest.json")
+    INGEST_BATCH_SIZE: int = _Env("50", int)
+    
+    # Profile chunk size and overlap between windows of one long text (profile_chunker.py)
+    CHUNK_TARGET_TOKENS: int = _Env("160", int)
+    CHUNK_OVERLAP_TOKENS: int = _Env("32", int)
+    
+    # Input-token budget for packed RAG prompts (system prompt + context + question)
+    CONTEXT_TOKEN_BUDGET: int = _Env("2048", int)
+    
+    # Semantic answer cache for near-duplicate questions in rag_query
+    SEMANTIC_CACHE_ENABLED: bool = _Env("false", _flag)
+    SEMANTIC_CACHE_THRESHOLD: float = _Env("0.95", float)
+    SEMANTIC_CACHE_SIZE: int = _Env("1000", int)
+    SEMANTIC_CACHE_TTL_S: float = _Env("86400", float)
+    
+    # sentence-transformers model the semantic cache embeds questions with (e.g. all-MiniLM-L6-v2);
+    # without one only near-exact repeats of a question hit
+    SEMANTIC_CACHE_MODEL: str = _Env("")
     
     @classmethod
     def validate(cls) -> list[str]:
@@ -32,11 +142,13 @@ class Settings:
         """
         missing = []
         
-        if not cls.UPSTASH_VECTOR_REST_URL:
-            missing.append("UPSTASH_VECTOR_REST_URL")
-        
-        if not cls.UPSTASH_VECTOR_REST_TOKEN:
-            missing.append("UPSTASH_VECTOR_REST_TOKEN")
+        # Upstash credentials are not needed when using the local index
+        if cls.VECTOR_BACKEND != "local":
+            if not cls.UPSTASH_VECTOR_REST_URL:
+                missing.append("UPSTASH_VECTOR_REST_URL")
+            
+            if not cls.UPSTASH_VECTOR_REST_TOKEN:
+                missing.append("UPSTASH_VECTOR_REST_TOKEN")
         
         if not cls.GROQ_API_KEY:
             missing.append("GROQ_API_KEY")
@@ -66,11 +178,19 @@ class Settings:
         print(f"  UPSTASH_VECTOR_REST_TOKEN: {'✓ Set' if cls.UPSTASH_VECTOR_REST_TOKEN else '✗ Missing'}")
         print(f"  UPSTASH_VECTOR_REST_READONLY_TOKEN: {'✓ Set' if cls.UPSTASH_VECTOR_REST_READONLY_TOKEN else '✗ Missing'}")
         print(f"  GROQ_API_KEY: {'✓ Set' if cls.GROQ_API_KEY else '✗ Missing'}")
+        print(f"  VECTOR_BACKEND: {cls.VECTOR_BACKEND}")
         print()
-
-
-# Validate on import (will warn but not fail)
-missing = Settings.validate()
-if missing:
-    print(f"⚠️ Warning: Missing environment variables: {', '.join(missing)}")
-    print("   Add them to your .env file for full functionality")
+    
+    @classmethod
+    def warn_if_missing(cls) -> list[str]:
+        """
+        Print a warning (without failing) if required variables are missing
+        
+        Returns:
+            List of missing variable names
+        """
+        missing = cls.validate()
+        if missing:
+            print(f"⚠️ Warning: Missing environment variables: {', '.join(missing)}")
+            print("   Add them to your .env file for full functionality")
+        return missing
@@ -0,0 +1,295 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same key share one upstream call.
+do() returns the shared result to every caller; stream() runs one upstream
+stream and fans its chunks out to every subscriber, replaying what was
+already produced to late joiners. Blocking (thread) and asyncio variants
+are provided.
+"""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+
+
+class _Call:
+    """One in-flight blocking call"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _SharedStream:
+    """Chunks produced once and replayed to every subscriber"""
+
+    def __init__(self, condition):
+        self.chunks: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.subscribed = False
+        self.abandoned = False
+        self.condition = condition
+        # Async pump task, referenced here so the event loop cannot garbage-collect it mid-stream
+        self.task: Optional[asyncio.Task] = None
+
+
+class SingleFlight:
+    """
+    Thread-based request coalescing
+    The first caller for a key runs the work; callers arriving while it is
+    in flight wait for and share its result (or its exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._streams: Dict[Hashable, _SharedStream] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the request
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            fn's result (shared by every caller that joined)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stream(self, key: Hashable, factory: Callable[[], Iterable[Any]]) -> Iterator[Any]:
+        """
+        Subscribe to the shared stream for key, starting it if needed
+        The first caller opens the upstream with factory() on its own thread
+        (so opening errors reach it directly); a background thread then pumps
+        chunks to every subscriber. The upstream is closed early if every
+        subscriber goes away. A subscriber counts from its first next(); one
+        that first iterates after that early close raises RuntimeError.
+
+        Args:
+            key: Identity of the request
+            factory: Zero-argument callable returning the upstream iterable
+
+        Returns:
+            Iterator over the full stream of chunks
+        """
+        with self._lock:
+            shared = self._streams.get(key)
+            leader = shared is None
+            if leader:
+                shared = _SharedStream(threading.Condition())
+                self._streams[key] = shared
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                source = iter(factory())
+            except BaseException as error:
+                self._finish(key, shared, error)
+                raise
+            threading.Thread(target=self._pump, args=(key, shared, source), daemon=True).start()
+
+        return self._subscribe(shared)
+
+    def _subscribe(self, shared: _SharedStream) -> Iterator[Any]:
+        # Registered on first next(), so a subscriber that is never iterated
+        # cannot keep the upstream open
+        with self._lock:
+            if shared.abandoned:
+                raise RuntimeError("Shared stream was closed after its other subscribers left")
+            shared.subscribers += 1
+            shared.subscribed = True
+        index = 0
+        try:
+            while True:
+                with shared.condition:
+                    shared.condition.wait_for(lambda: index < len(shared.chunks) or shared.done)
+                    pending = shared.chunks[index:]
+                    done = shared.done
+                index += len(pending)
+                yield from pending
+                if done:
+                    if shared.error is not None:
+                        raise shared.error
+                    return
+        finally:
+            with self._lock:
+                shared.subscribers -= 1
+
+    def _pump(self, key: Hashable, shared: _SharedStream, source: Iterator[Any]) -> None:
+        error = None
+        try:
+            for chunk in source:
+                with shared.condition:
+                    shared.chunks.append(chunk)
+                    shared.condition.notify_all()
+                if self._abandoned(key, shared):
+                    break
+        except Exception as exc:
+            error = exc
+        finally:
+            close = getattr(source, "close", None)
+            if close:
+                close()
+            self._finish(key, shared, error)
+
+    def _abandoned(self, key: Hashable, shared: _SharedStream) -> bool:
+        """True (and the key is released) once every subscriber has left"""
+        if shared.subscribers or not shared.subscribed:
+            return False
+        with self._lock:
+            if shared.subscribers or self._streams.get(key) is not shared:
+                return False
+            del self._streams[key]
+            shared.abandoned = True
+            return True
+
+    def _finish(self, key: Hashable, shared: _SharedStream, error: Optional[BaseException]) -> None:
+        with self._lock:
+            if self._streams.get(key) is shared:
+                del self._streams[key]
+        with shared.condition:
+            shared.error = error
+            shared.done = True
+            shared.condition.notify_all()
+
+
+class AsyncSingleFlight:
+    """
+    asyncio request coalescing
+    The shared work runs as its own task, so a cancelled caller does not
+    cancel it for the callers still waiting. A shared stream's task is
+    cancelled once its last subscriber leaves, even before the first chunk.
+    Keys are scoped to the running event loop.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._streams: Dict[Hashable, _SharedStream] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await factory() once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the request
+            factory: Zero-argument callable returning an awaitable
+
+        Returns:
+            The awaitable's result (shared by every caller that joined)
+        """
+        key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved even if every caller was cancelled
+
+    async def stream(self, key: Hashable, factory: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Subscribe to the shared async stream for key, starting it if needed
+
+        Args:
+            key: Identity of the request
+            factory: Zero-argument callable returning the upstream async iterator
+
+        Yields:
+            Every chunk of the stream, from the beginning
+        """
+        key = (asyncio.get_running_loop(), key)
+        shared = self._streams.get(key)
+        if shared is None:
+            shared = _SharedStream(asyncio.Condition())
+            self._streams[key] = shared
+            shared.task = asyncio.ensure_future(self._pump(key, shared, factory))
+        else:
+            self.coalesced += 1
+        shared.subscribers += 1
+
+        index = 0
+        try:
+            while True:
+                async with shared.condition:
+                    await shared.condition.wait_for(lambda: index < len(shared.chunks) or shared.done)
+                    pending = shared.chunks[index:]
+                    done = shared.done
+                index += len(pending)
+                for chunk in pending:
+                    yield chunk
+                if done:
+                    if shared.error is not None:
+                        raise shared.error
+                    return
+        finally:
+            shared.subscribers -= 1
+            if not shared.subscribers and not shared.done:
+                # Nobody is left to read the stream: release the key so later callers
+                # start afresh, and stop the upstream even if it has not produced a chunk yet
+                if self._streams.get(key) is shared:
+                    del self._streams[key]
+                shared.task.cancel()
+
+    async def _pump(self, key: Hashable, shared: _SharedStream, factory: Callable[[], AsyncIterator[Any]]) -> None:
+        error = None
+        source = None
+        try:
+            source = factory()
+            async for chunk in source:
+                async with shared.condition:
+                    shared.chunks.append(chunk)
+                    shared.condition.notify_all()
+                if not shared.subscribers:
+                    break
+        except Exception as exc:
+            error = exc
+        finally:
+            # Release the key first so callers arriving during cleanup start afresh
+            if self._streams.get(key) is shared:
+                del self._streams[key]
+            aclose = getattr(source, "aclose", None)
+            if aclose:
+                await aclose()
+            async with shared.condition:
+                shared.error = error
+                shared.done = True
+                shared.condition.notify_all()
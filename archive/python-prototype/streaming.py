@@ -0,0 +1,349 @@
+"""
+Streaming Utilities
+Time-to-first-token deadlines, per-stream metrics and write coalescing for
+token streams
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+
+from context_packer import count_tokens
+from settings import Settings
+
+RECENT_STREAMS = 100
+
+_recent: Deque["StreamMetrics"] = deque(maxlen=RECENT_STREAMS)
+_recent_lock = threading.Lock()
+
+
+class FirstTokenTimeout(TimeoutError):
+    """Raised when a stream produces no token within its time-to-first-token deadline"""
+
+
+@dataclass
+class StreamMetrics:
+    """Timing of one consumed stream, measured from the caller's request"""
+    ttft_s: Optional[float]
+    duration_s: float
+    chunks: int
+    tokens: int
+    completed: bool
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Generation rate after the first token"""
+        generating_s = self.duration_s - (self.ttft_s or 0.0)
+        return self.tokens / generating_s if generating_s > 0 else 0.0
+
+
+def recent_stream_metrics() -> List[StreamMetrics]:
+    """Metrics of the last RECENT_STREAMS streams, oldest first"""
+    with _recent_lock:
+        return list(_recent)
+
+
+def stream_summary() -> Dict[str, Any]:
+    """
+    Aggregate of the recent streams
+
+    Returns:
+        Dictionary with streams, mean_ttft_ms, max_ttft_ms and mean_tokens_per_second
+    """
+    streams = [metrics for metrics in recent_stream_metrics() if metrics.ttft_s is not None]
+    if not streams:
+        return {"streams": 0, "mean_ttft_ms": 0.0, "max_ttft_ms": 0.0, "mean_tokens_per_second": 0.0}
+    ttfts = [metrics.ttft_s * 1000 for metrics in streams]
+    return {
+        "streams": len(streams),
+        "mean_ttft_ms": sum(ttfts) / len(ttfts),
+        "max_ttft_ms": max(ttfts),
+        "mean_tokens_per_second": sum(metrics.tokens_per_second for metrics in streams) / len(streams)
+    }
+
+
+def _record(
+    start: float,
+    first_at: Optional[float],
+    parts: List[str],
+    completed: bool,
+    on_metrics: Optional[Callable[[StreamMetrics], None]]
+) -> None:
+    metrics = StreamMetrics(
+        ttft_s=None if first_at is None else first_at - start,
+        duration_s=time.perf_counter() - start,
+        chunks=len(parts),
+        tokens=count_tokens("".join(parts)),
+        completed=completed
+    )
+    with _recent_lock:
+        _recent.append(metrics)
+    if metrics.ttft_s is not None:
+        print(
+            f"📈 Stream: TTFT {metrics.ttft_s * 1000:.0f}ms, "
+            f"{metrics.tokens_per_second:.0f} tokens/s ({metrics.tokens} tokens)"
+        )
+    if on_metrics:
+        on_metrics(metrics)
+
+
+def measure_stream(
+    chunks: Iterator[str],
+    start: float,
+    on_metrics: Optional[Callable[[StreamMetrics], None]] = None
+) -> Iterator[str]:
+    """
+    Pass chunks through, recording TTFT and tokens/sec when the stream ends
+
+    Args:
+        chunks: Stream of text chunks
+        start: time.perf_counter() when the caller made the request
+        on_metrics: Optional callback receiving the StreamMetrics
+
+    Yields:
+        The chunks, unchanged
+    """
+    parts: List[str] = []
+    first_at = None
+    completed = False
+    try:
+        for chunk in chunks:
+            if first_at is None:
+                first_at = time.perf_counter()
+            parts.append(chunk)
+            yield chunk
+        completed = True
+    finally:
+        # Closing early (e.g. a disconnected client) closes the upstream too
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+        _record(start, first_at, parts, completed, on_metrics)
+
+
+async def measure_stream_async(
+    chunks: AsyncIterator[str],
+    start: float,
+    on_metrics: Optional[Callable[[StreamMetrics], None]] = None
+) -> AsyncIterator[str]:
+    """Async variant of measure_stream"""
+    parts: List[str] = []
+    first_at = None
+    completed = False
+    try:
+        async for chunk in chunks:
+            if first_at is None:
+                first_at = time.perf_counter()
+            parts.append(chunk)
+            yield chunk
+        completed = True
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose:
+            await aclose()
+        _record(start, first_at, parts, completed, on_metrics)
+
+
+def first_chunk(chunks: Iterator[Any], timeout: Optional[float], close: Callable[[], None]) -> Optional[Any]:
+    """
+    Wait up to timeout for the first chunk of a blocking stream
+    The read happens on a helper thread; on timeout or error the stream is
+    closed (which also unblocks that thread).
+
+    Args:
+        chunks: Stream iterator; only read again by the caller on success
+        timeout: Seconds to wait (None or 0 waits indefinitely)
+        close: Closes the underlying stream
+
+    Returns:
+        The first chunk, or None if the stream ended without one
+
+    Raises:
+        FirstTokenTimeout: If nothing arrived within timeout
+    """
+    if not timeout:
+        try:
+            return next(chunks, None)
+        except Exception:
+            close()
+            raise
+
+    result: "queue.Queue[tuple]" = queue.Queue(maxsize=1)
+
+    def read():
+        try:
+            result.put((next(chunks, None), None))
+        except Exception as error:
+            result.put((None, error))
+
+    threading.Thread(target=read, daemon=True).start()
+    try:
+        chunk, error = result.get(timeout=timeout)
+    except queue.Empty:
+        close()
+        raise FirstTokenTimeout(f"No token received within {timeout}s (time to first token)")
+    if error is not None:
+        close()
+        raise error
+    return chunk
+
+
+async def first_chunk_async(chunks: AsyncIterator[Any], timeout: Optional[float], close: Callable) -> Optional[Any]:
+    """
+    Async variant of first_chunk; close is an async callable
+
+    Raises:
+        FirstTokenTimeout: If nothing arrived within timeout
+    """
+    try:
+        return await asyncio.wait_for(chunks.__anext__(), timeout or None)
+    except StopAsyncIteration:
+        return None
+    except asyncio.TimeoutError:
+        await close()
+        raise FirstTokenTimeout(f"No token received within {timeout}s (time to first token)")
+    except Exception:
+        await close()
+        raise
+
+
+def _flush_limits(min_chars: Optional[int], max_delay_s: Optional[float]):
+    if min_chars is None:
+        min_chars = Settings.STREAM_FLUSH_CHARS
+    if max_delay_s is None:
+        max_delay_s = Settings.STREAM_FLUSH_INTERVAL_MS / 1000
+    return min_chars, max_delay_s
+
+
+def coalesce_chunks(
+    chunks: Iterator[str],
+    min_chars: Optional[int] = None,
+    max_delay_s: Optional[float] = None
+) -> Iterator[str]:
+    """
+    Batch small stream deltas into fewer, larger writes
+    The first chunk passes through at once to keep time to first token low.
+    Later chunks are buffered until min_chars have accumulated or max_delay_s
+    has passed since the previous write, so slow streams still pass through
+    chunk by chunk. The delay is checked as chunks arrive; use
+    coalesce_chunks_async for a timer that also fires during a stall.
+
+    Args:
+        chunks: Stream of text chunks
+        min_chars: Flush once this many characters are buffered
+            (defaults to Settings.STREAM_FLUSH_CHARS)
+        max_delay_s: Flush once this long has passed since the previous write
+            (defaults to Settings.STREAM_FLUSH_INTERVAL_MS)
+
+    Yields:
+        The same text, in fewer chunks
+    """
+    min_chars, max_delay_s = _flush_limits(min_chars, max_delay_s)
+    buffer: List[str] = []
+    size = 0
+    first = True
+    try:
+        for chunk in chunks:
+            if first:
+                first = False
+                yield chunk
+                deadline = time.perf_counter() + max_delay_s
+                continue
+
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= min_chars or time.perf_counter() >= deadline:
+                text = "".join(buffer)
+                buffer.clear()
+                size = 0
+                yield text
+                deadline = time.perf_counter() + max_delay_s
+    except Exception:
+        # Deliver what was received before the failure
+        if buffer:
+            yield "".join(buffer)
+        raise
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+
+    if buffer:
+        yield "".join(buffer)
+
+
+async def coalesce_chunks_async(
+    chunks: AsyncIterator[str],
+    min_chars: Optional[int] = None,
+    max_delay_s: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Async variant of coalesce_chunks
+    A buffer is flushed after max_delay_s even if the upstream stalls.
+    """
+    min_chars, max_delay_s = _flush_limits(min_chars, max_delay_s)
+    loop = asyncio.get_running_loop()
+    iterator = chunks.__aiter__()
+    buffer: List[str] = []
+    size = 0
+    deadline = 0.0
+    first = True
+    pending: Optional["asyncio.Future[str]"] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            if buffer:
+                # Wait for the next chunk without cancelling it when the flush timer fires
+                await asyncio.wait({pending}, timeout=max(0.0, deadline - loop.time()))
+                if not pending.done():
+                    text = "".join(buffer)
+                    buffer.clear()
+                    size = 0
+                    yield text
+                    deadline = loop.time() + max_delay_s
+                    continue
+
+            try:
+                chunk = await pending
+            except StopAsyncIteration:
+                break
+            finally:
+                if pending.done():
+                    pending = None
+
+            if first:
+                first = False
+                yield chunk
+                deadline = loop.time() + max_delay_s
+                continue
+
+            buffer.append(chunk)
+            size += len(chunk)
+            if size >= min_chars or loop.time() >= deadline:
+                text = "".join(buffer)
+                buffer.clear()
+                size = 0
+                yield text
+                deadline = loop.time() + max_delay_s
+    except Exception:
+        if buffer:
+            yield "".join(buffer)
+        raise
+    finally:
+        if pending is not None:
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, Exception):
+                pass
+        aclose = getattr(chunks, "aclose", None)
+        if aclose:
+            await aclose()
+
+    if buffer:
+        yield "".join(buffer)
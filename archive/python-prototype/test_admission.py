@@ -0,0 +1,127 @@
+"""
+Offline Tests for Admission Control
+"""
+
+import asyncio
+import sys
+import threading
+import time
+
+from admission import AdmissionControl, AsyncAdmissionControl, Overloaded
+
+
+def test_async_queue_is_bounded_and_deadlined():
+    """Excess requests are shed at once; queued ones are shed at their deadline"""
+    control = AsyncAdmissionControl(max_concurrency=1, max_queue=1, queue_timeout_s=0.05)
+
+    async def hold(seconds):
+        async with control.admit():
+            await asyncio.sleep(seconds)
+        return "ok"
+
+    async def attempt(seconds):
+        try:
+            return await hold(seconds)
+        except Overloaded as error:
+            return error
+
+    async def scenario():
+        running = asyncio.ensure_future(hold(0.2))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(attempt(0))
+        await asyncio.sleep(0)
+
+        start = time.perf_counter()
+        rejected = await attempt(0)
+        assert isinstance(rejected, Overloaded) and rejected.reason == "queue full"
+        assert time.perf_counter() - start < 0.01 and rejected.retry_after >= 1
+
+        timed_out = await queued
+        assert isinstance(timed_out, Overloaded) and timed_out.reason == "queue timeout"
+        assert await running == "ok"
+
+    asyncio.run(scenario())
+    stats = control.stats()
+    assert stats["admitted"] == 1 and stats["shed_queue_full"] == 1 and stats["shed_timeout"] == 1
+    assert stats["active"] == 0 and stats["queue_depth"] == 0
+
+
+def test_async_waiters_are_admitted_in_order():
+    """Queued requests get released slots first-come, first-served, within the limit"""
+    control = AsyncAdmissionControl(max_concurrency=2, max_queue=10, queue_timeout_s=5)
+    order = []
+    peak = 0
+
+    async def work(i):
+        nonlocal peak
+        async with control.admit():
+            peak = max(peak, control.active)
+            order.append(i)
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(*(work(i) for i in range(6)))
+
+    asyncio.run(scenario())
+    assert order == list(range(6)) and peak == 2
+    assert control.stats()["max_wait_ms"] > 0
+
+
+def test_thread_admission_sheds_and_recovers():
+    """The thread variant sheds beyond the queue and admits again once slots free up"""
+    control = AdmissionControl(max_concurrency=1, max_queue=1, queue_timeout_s=1.0)
+    release = threading.Event()
+    results = []
+
+    def hold():
+        with control.admit():
+            release.wait()
+        results.append("held")
+
+    def queued():
+        with control.admit():
+            results.append("queued")
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    time.sleep(0.02)
+    waiter = threading.Thread(target=queued)
+    waiter.start()
+    time.sleep(0.02)
+
+    try:
+        with control.admit():
+            raise AssertionError("expected Overloaded")
+    except Overloaded as error:
+        assert error.reason == "queue full"
+
+    release.set()
+    holder.join()
+    waiter.join()
+    assert sorted(results) == ["held", "queued"]
+    assert control.stats()["admitted"] == 2 and control.stats()["shed_queue_full"] == 1
+
+
+def main():
+    """Run all admission control tests"""
+    tests = [
+        ("Bounded Queue and Deadline", test_async_queue_is_bounded_and_deadlined),
+        ("FIFO Admission", test_async_waiters_are_admitted_in_order),
+        ("Thread Admission", test_thread_admission_sheds_and_recovers),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
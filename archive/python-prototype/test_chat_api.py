@@ -0,0 +1,161 @@
+"""
+Offline Tests for the Chat API
+Serves api/chat.py on a local port with an in-process vector index and a
+stand-in Groq client, so no API key or network access is needed
+"""
+
+import http.client
+import json
+import os
+import socket
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "api"))
+
+import chat
+import chat_service
+import groq_client
+from fakes import make_chunk, make_local_client
+
+PROFILE = [
+    ("skills", "Technical skills: Python, SQL and cloud deployment",
+     {"title": "Technical Skills", "content": "Python, SQL and cloud deployment"}),
+]
+
+
+class EndlessStream:
+    """Groq stream that keeps producing chunks until it is closed"""
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed.wait(0.01):
+            raise StopIteration
+        return make_chunk("token ")
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeGroq:
+    def __init__(self, stream_factory):
+        self.stream_factory = stream_factory
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=lambda **params: self.stream_factory()))
+
+
+def serve():
+    """Start the handler on a free port; returns the server"""
+    vector_client = make_local_client(PROFILE)
+    chat_service.get_vector_client = lambda read_only=True: vector_client
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), chat.handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_sse_streams_sources_tokens_and_timing():
+    """stream=true returns sources, one event per token, then a timing event"""
+    original_get_client = groq_client.get_groq_client
+    groq_client.get_groq_client = lambda: FakeGroq(lambda: iter([make_chunk("I know "), make_chunk("Python.")]))
+    server = serve()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+        connection.request("POST", "/api/chat", json.dumps({"question": "What are your skills?", "stream": True}))
+        response = connection.getresponse()
+        assert response.getheader("Content-Type") == "text/event-stream"
+        events = parse_events(response.read().decode("utf-8"))
+    finally:
+        server.shutdown()
+        groq_client.get_groq_client = original_get_client
+
+    assert [name for name, _ in events] == ["sources", "token", "token", "done"]
+    assert events[0][1]["sources"][0]["title"] == "Technical Skills"
+    assert events[1][1]["text"] + events[2][1]["text"] == "I know Python."
+    assert events[-1][1]["ttft_ms"] is not None and events[-1][1]["total_ms"] >= events[-1][1]["retrieval_ms"]
+
+
+def test_failure_after_headers_sends_error_event():
+    """An unexpected error mid-stream ends the SSE stream with an error event"""
+    def failing_events(question):
+        yield "sources", {"sources": []}
+        raise RuntimeError("index went away")
+
+    original_stream_events = chat.stream_events
+    chat.stream_events = failing_events
+    server = serve()
+    try:
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_port)
+        connection.request("POST", "/api/chat", json.dumps({"question": "What are your skills?", "stream": True}))
+        response = connection.getresponse()
+        assert response.status == 200
+        events = parse_events(response.read().decode("utf-8"))
+    finally:
+        server.shutdown()
+        chat.stream_events = original_stream_events
+
+    assert events == [("sources", {"sources": []}), ("error", {"message": "index went away"})]
+
+
+def test_client_disconnect_closes_groq_stream():
+    """Dropping the connection mid-answer closes the upstream Groq stream"""
+    upstream = EndlessStream()
+    original_get_client = groq_client.get_groq_client
+    groq_client.get_groq_client = lambda: FakeGroq(lambda: upstream)
+    server = serve()
+    try:
+        body = json.dumps({"question": "What are your skills?"}).encode("utf-8")
+        client = socket.create_connection(("127.0.0.1", server.server_port))
+        client.sendall(
+            b"POST /api/chat HTTP/1.1\r\nHost: test\r\nAccept: text/event-stream\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+        )
+        received = b""
+        while b"event: token" not in received:
+            received += client.recv(4096)
+        client.close()
+
+        assert upstream.closed.wait(5.0), "Groq stream was not closed after the client left"
+    finally:
+        upstream.close()
+        server.shutdown()
+        groq_client.get_groq_client = original_get_client
+
+
+def main():
+    """Run all chat API tests"""
+    tests = [
+        ("SSE Events", test_sse_streams_sources_tokens_and_timing),
+        ("Mid-Stream Error Event", test_failure_after_headers_sends_error_event),
+        ("Client Disconnect", test_client_disconnect_closes_groq_stream),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Offline Tests for the Chat Server
+Drives the ASGI app directly (no uvicorn or network) with an in-process
+vector index and a stand-in async Groq client
+"""
+
+import asyncio
+import json
+import sys
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import chat_service
+import groq_client
+import health
+from chat_server import ChatServer
+from fakes import FakeAsyncGroq, FakeAsyncStream, make_local_client
+
+PROFILE = [
+    ("skills", "Technical skills: Python, SQL and cloud deployment",
+     {"title": "Technical Skills", "content": "Python, SQL and cloud deployment"}),
+]
+
+vector_client = make_local_client(PROFILE)
+
+
+@contextmanager
+def offline_dependencies(groq):
+    """
+    Serve from the local index, stand-in health probes and the given fake Groq
+    client, restoring the real factories on exit
+
+    Yields:
+        Namespace whose groq attribute can be swapped for later requests
+    """
+    originals = (chat_service.get_vector_client, groq_client.get_async_groq_client,
+                 groq_client.RETRY_DELAY_MS, health.PROBES)
+    fakes = SimpleNamespace(groq=groq)
+    chat_service.get_vector_client = lambda read_only=True: vector_client
+    groq_client.get_async_groq_client = lambda: fakes.groq
+    groq_client.RETRY_DELAY_MS = 0  # No backoff sleeps in tests
+    health.PROBES = {"groq": lambda timeout: {"models": 1}, "vector": lambda timeout: {"vectors": 1}}
+    health._results.clear()
+    try:
+        yield fakes
+    finally:
+        (chat_service.get_vector_client, groq_client.get_async_groq_client,
+         groq_client.RETRY_DELAY_MS, health.PROBES) = originals
+        health._results.clear()
+
+
+async def request(app, method, path, body=None, headers=(), disconnect=None):
+    """
+    Send one request through the app
+
+    Args:
+        disconnect: Optional awaitable; the client disconnects when it completes
+
+    Returns:
+        (status, headers dict, body bytes)
+    """
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        if disconnect is not None:
+            await disconnect
+        else:
+            await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+    await app(scope, receive, send)
+    start = sent[0]
+    return start["status"], dict(start["headers"]), b"".join(message.get("body", b"") for message in sent[1:])
+
+
+def test_json_chat_and_health():
+    """POST /api/chat answers in JSON; GET /health reports status"""
+    app = ChatServer(max_concurrency=4)
+
+    async def scenario():
+        status, headers, body = await request(app, "POST", "/api/chat", {"question": "What are your skills?"})
+        assert status == 200 and headers[b"content-type"] == b"application/json"
+        answer = json.loads(body)
+        assert answer["answer"] == "Hello" and answer["sources"] == 1 and answer["prompt_tokens"] > 0
+
+        status, _, body = await request(app, "POST", "/api/chat", {})
+        assert status == 400
+
+        status, _, body = await request(app, "GET", "/health")
+        assert status == 200 and json.loads(body)["served"] == 1
+
+        # The first poll starts a background probe; later polls serve its cached result
+        await asyncio.sleep(0.05)
+        status, _, body = await request(app, "GET", "/health")
+        dependencies = json.loads(body)["dependencies"]
+        assert dependencies["status"] == "ok" and set(dependencies["checks"]) == {"groq", "vector"}
+
+    with offline_dependencies(FakeAsyncGroq()):
+        asyncio.run(scenario())
+
+
+def test_sse_stream_and_disconnect():
+    """Streams sources, tokens and timing; a client disconnect closes the Groq stream"""
+    app = ChatServer()
+
+    async def scenario(fakes):
+        status, headers, body = await request(
+            app, "POST", "/api/chat", {"question": "What are your skills?"}, headers=[(b"accept", b"text/event-stream")]
+        )
+        assert status == 200 and headers[b"content-type"] == b"text/event-stream"
+        events = [block.split("\n")[0][len("event: "):] for block in body.decode().strip().split("\n\n")]
+        assert events[0] == "sources" and events[-1] == "done" and "token" in events
+
+        upstream = FakeAsyncStream()
+        fakes.groq = FakeAsyncGroq(stream=upstream)
+        status, _, body = await request(
+            app, "POST", "/api/chat", {"question": "What are your skills?", "stream": True},
+            disconnect=asyncio.sleep(0.2)
+        )
+        assert b"event: token" in body and b"event: done" not in body
+        await asyncio.sleep(0.05)
+        assert upstream.closed and app.in_flight == 0
+
+    with offline_dependencies(FakeAsyncGroq()) as fakes:
+        asyncio.run(scenario(fakes))
+
+
+def test_bounded_concurrency_and_graceful_shutdown():
+    """No more than max_concurrency answers run at once; shutdown waits for them"""
+    fake = FakeAsyncGroq(delay=0.1)
+    app = ChatServer(max_concurrency=2, shutdown_grace_s=5)
+
+    async def scenario():
+        requests = [
+            asyncio.ensure_future(request(app, "POST", "/api/chat", {"question": f"What are your skills? ({i})"}))
+            for i in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        await app.shutdown()
+        responses = await asyncio.gather(*requests)
+
+        assert [status for status, _, _ in responses] == [200] * 5
+        assert fake.peak == 2 and app.in_flight == 0
+
+        status, _, _ = await request(app, "POST", "/api/chat", {"question": "Too late?"})
+        assert status == 503
+
+    with offline_dependencies(fake):
+        asyncio.run(scenario())
+
+
+def test_overload_is_shed_with_retry_after():
+    """Beyond the queue, requests get a fast 503 with Retry-After, counted in /metrics"""
+    app = ChatServer(max_concurrency=1, max_queue=0)
+
+    async def scenario():
+        running = asyncio.ensure_future(request(app, "POST", "/api/chat", {"question": "What are your skills?"}))
+        await asyncio.sleep(0.05)
+        status, headers, body = await request(app, "POST", "/api/chat", {"question": "Me too?"})
+        assert status == 503 and int(headers[b"retry-after"]) >= 1
+        assert (await running)[0] == 200
+
+        status, headers, body = await request(app, "GET", "/metrics")
+        assert status == 200 and b'digital_twin_requests_shed_total{reason="queue_full"} 1' in body
+
+    with offline_dependencies(FakeAsyncGroq(delay=0.2)):
+        asyncio.run(scenario())
+
+
+def main():
+    """Run all chat server tests"""
+    tests = [
+        ("JSON Chat and Health", test_json_chat_and_health),
+        ("SSE Stream and Disconnect", test_sse_stream_and_disconnect),
+        ("Bounded Concurrency and Shutdown", test_bounded_concurrency_and_graceful_shutdown),
+        ("Load Shedding", test_overload_is_shed_with_retry_after),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
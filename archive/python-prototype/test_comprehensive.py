@@ -13,7 +13,8 @@ from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 
 from settings import Settings
 from upstash_client import UpstashVectorClient
-from groq_client import generate_response, validate_groq_connection
+from groq_client import generate_response
+from health import check_dependencies
 from digital_twin_mcp_server import rag_query, setup_vector_database
 
 console = Console()
@@ -165,16 +166,16 @@ def test_query_functionality() -> bool:
             }
         ]
         
-        for i, test_case in enumerate(test_cases, 1):
+        # Run all test queries in one batched request
+        start = time.time()
+        batch_results = client.query_many([test_case['query'] for test_case in test_cases], top_k=3)
+        latency = (time.time() - start) * 1000
+        results.add_metric("Batched Queries", latency)
+        console.print(f"\n  Batched {len(test_cases)} queries in {latency:.2f}ms")
+        
+        for i, (test_case, search_results) in enumerate(zip(test_cases, batch_results), 1):
             console.print(f"\n  Test Case {i}: {test_case['query']}")
-            
-            start = time.time()
-            search_results = client.query_text(test_case['query'], top_k=3)
-            latency = (time.time() - start) * 1000
-            results.add_metric(f"Query {i}", latency)
-            
             console.print(f"    • Results found: {len(search_results)}")
-            console.print(f"    • Search latency: {latency:.2f}ms")
             
             # Check top results
             for j, result in enumerate(search_results[:3], 1):
@@ -417,6 +418,16 @@ def main():
         console.print(f"  ❌ {e}", style="red")
         return 1
     
+    # Groq and Upstash are probed in parallel with metadata calls (no completion)
+    dependencies = check_dependencies()
+    for name, check in dependencies["checks"].items():
+        if check["ok"]:
+            console.print(f"  ✓ {name} reachable ({check['latency_ms']:.0f}ms)", style="green")
+        else:
+            console.print(f"  ❌ {name}: {check['error']}", style="red")
+    if dependencies["status"] != "ok":
+        return 1
+    
     # Run tests
     tests = [
         ("Database Connectivity", test_database_connectivity),
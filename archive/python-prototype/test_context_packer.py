@@ -0,0 +1,69 @@
+"""
+Offline Tests for Token-Aware Context Packing
+"""
+
+import sys
+
+import groq_client
+from context_packer import count_tokens, pack_context, truncate_tokens
+
+SYSTEM_PROMPT = "You are an AI digital twin."
+QUESTION = "What are your technical skills?"
+
+
+def test_best_chunks_fill_the_budget():
+    """Chunks are added best score first and the packed prompt stays within budget"""
+    chunks = [
+        (0.70, "Hobbies: hiking and photography. " * 20),
+        (0.95, "Skills: Python, SQL and data analysis."),
+        (0.85, "Projects: built a RAG chatbot with Groq and Upstash."),
+    ]
+    packed = pack_context(QUESTION, chunks, system_prompt=SYSTEM_PROMPT, budget=150)
+
+    assert packed.total_tokens <= 150
+    assert packed.chunks_used == 2 and packed.chunks_dropped == 1
+    assert packed.prompt.index("Skills:") < packed.prompt.index("Projects:")
+    assert "Hobbies" not in packed.prompt
+
+    roomy = pack_context(QUESTION, chunks, system_prompt=SYSTEM_PROMPT, budget=4000)
+    assert roomy.chunks_used == 3 and roomy.prompt_tokens == count_tokens(roomy.prompt)
+
+
+def test_question_survives_tiny_budget_and_long_prompts():
+    """The question is never cut: no context fits a tiny budget, and raw prompts lose their middle"""
+    packed = pack_context(QUESTION, [(0.9, "Skills: Python.")], system_prompt=SYSTEM_PROMPT, budget=10)
+    assert packed.chunks_used == 0
+    assert QUESTION in packed.prompt
+
+    long_prompt = "Context line. " * 5000 + f"Question: {QUESTION}"
+    shortened = truncate_tokens(long_prompt, 1000)
+    assert shortened.endswith(QUESTION)
+    assert count_tokens(shortened) <= 1010
+
+    prepared = groq_client._prepare_prompt("Context line. " * 20000 + QUESTION)
+    assert prepared.endswith(QUESTION)
+    assert count_tokens(prepared) <= groq_client.MAX_PROMPT_TOKENS + 10
+
+
+def main():
+    """Run all context packer tests"""
+    tests = [
+        ("Budgeted Packing", test_best_chunks_fill_the_budget),
+        ("Question Preserved", test_question_survives_tiny_budget_and_long_prompts),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Offline Tests for Incremental Profile Ingestion
+Ingests digitaltwin.json into an in-process vector index with a temporary
+manifest, so no credentials or network access are needed
+"""
+
+import copy
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import embed_digitaltwin
+from embed_digitaltwin import IngestionError, flatten_profile_to_chunks, ingest_to_upstash
+from local_vector_client import LocalVectorClient
+from settings import Settings
+
+with open(embed_digitaltwin.JSON_FILE, "r", encoding="utf-8") as f:
+    PROFILE = json.load(f)
+
+
+class FlakyIndex(LocalVectorClient):
+    """Fails every batch after the first fail_after"""
+
+    def __init__(self, fail_after, path=None):
+        super().__init__(read_only=False, dimension=64, path=path)
+        self.fail_after = fail_after
+        self.batches = 0
+
+    def _upsert_batch(self, items_list):
+        self.batches += 1
+        if self.batches > self.fail_after:
+            raise ConnectionError("connection reset")
+        super()._upsert_batch(items_list)
+
+
+@contextmanager
+def local_index(make_client=None, persistent=True):
+    """
+    Point ingestion at a local index, restoring the settings and factory on exit
+
+    Args:
+        make_client: Builds the index from its path (default: a LocalVectorClient)
+        persistent: Give the index a directory (LOCAL_VECTOR_PATH) rather than keep it in memory
+
+    Yields:
+        (client, manifest path in a fresh directory)
+    """
+    directory = tempfile.mkdtemp()
+    originals = (Settings.VECTOR_BACKEND, Settings.LOCAL_VECTOR_PATH, embed_digitaltwin.create_vector_client)
+    Settings.VECTOR_BACKEND = "local"
+    Settings.LOCAL_VECTOR_PATH = os.path.join(directory, "index") if persistent else ""
+    make_client = make_client or (lambda path: LocalVectorClient(read_only=False, dimension=64, path=path))
+    client = make_client(Settings.LOCAL_VECTOR_PATH or None)
+    embed_digitaltwin.create_vector_client = lambda read_only=True: client
+    try:
+        yield client, os.path.join(directory, "manifest.json")
+    finally:
+        Settings.VECTOR_BACKEND, Settings.LOCAL_VECTOR_PATH, embed_digitaltwin.create_vector_client = originals
+
+
+def test_chunk_ids_are_content_derived():
+    """Removing one entry leaves the chunks of every other section unchanged"""
+    before = flatten_profile_to_chunks(PROFILE)
+    edited = copy.deepcopy(PROFILE)
+    edited["interview_prep"]["strengths_to_highlight"].pop(0)
+    after = flatten_profile_to_chunks(edited)
+
+    def ids(chunks, changed_section=None):
+        return {chunk_id for chunk_id, _, metadata in chunks if metadata["section"] != changed_section}
+
+    assert len(ids(before)) == len(before)
+    assert flatten_profile_to_chunks(PROFILE) == before
+    assert ids(after, "interview_prep.strengths_to_highlight") == ids(before, "interview_prep.strengths_to_highlight")
+    assert ids(after) != ids(before)
+
+
+def test_edit_reembeds_one_chunk():
+    """A one-field edit upserts one chunk and deletes its old version; a rerun does nothing"""
+    with local_index() as (client, manifest):
+        chunks = flatten_profile_to_chunks(PROFILE)
+
+        first = ingest_to_upstash(chunks, manifest)
+        assert (first["upserted"], first["deleted"], first["unchanged"]) == (len(chunks), 0, 0)
+
+        edited = copy.deepcopy(PROFILE)
+        edited["personal"]["location"] = "Melbourne, Australia"
+        second = ingest_to_upstash(flatten_profile_to_chunks(edited), manifest)
+        assert (second["upserted"], second["deleted"], second["unchanged"]) == (1, 1, len(chunks) - 1)
+        assert client.info()["vectorCount"] == len(chunks)
+
+        assert ingest_to_upstash(flatten_profile_to_chunks(edited), manifest)["upserted"] == 0
+
+
+def test_metadata_change_keeps_id():
+    """Changing only metadata re-upserts the chunk under the same ID"""
+    chunks = flatten_profile_to_chunks(PROFILE)
+    chunk_id, text, metadata = chunks[0]
+    retagged = [(chunk_id, text, {**metadata, "tags": ["updated"]})] + chunks[1:]
+
+    previous = {cid: embed_digitaltwin.chunk_hash(t, m) for cid, t, m in chunks}
+    changed, removed, _ = embed_digitaltwin.diff_chunks(retagged, previous)
+    assert [chunk[0] for chunk in changed] == [chunk_id] and removed == []
+
+
+def test_failed_run_resumes_from_journal():
+    """A rerun after a failure uploads only the batches the failed run did not finish"""
+    with local_index(lambda path: FlakyIndex(fail_after=2, path=path)) as (client, manifest):
+        chunks = flatten_profile_to_chunks(PROFILE)
+
+        try:
+            ingest_to_upstash(chunks, manifest, batch_size=10)
+            raise AssertionError("expected IngestionError")
+        except IngestionError:
+            pass
+        assert os.path.exists(manifest + ".journal") and not os.path.exists(manifest)
+
+        client.fail_after = len(chunks)
+        stats = ingest_to_upstash(chunks, manifest, batch_size=10)
+        assert stats["upserted"] == len(chunks) - 20 and stats["resumed"] == 20
+        assert stats["batches"] == -(-(len(chunks) - 20) // 10) and stats["chunks_per_second"] > 0
+        assert client.info()["vectorCount"] == len(chunks)
+        assert not os.path.exists(manifest + ".journal")
+
+
+def test_headless_run_never_prompts():
+    """With reset=False an index the manifest does not know is not wiped, and no input() is asked"""
+    with local_index() as (client, manifest):
+        chunks = flatten_profile_to_chunks(PROFILE)
+        client.upsert_texts([("chunk-0", "Old chunk", {"title": "Old"}), chunks[0]])
+
+        def no_input(prompt=""):
+            raise AssertionError("prompted for input")
+
+        embed_digitaltwin.input = no_input
+        try:
+            stats = ingest_to_upstash(chunks, manifest, reset=False)
+        finally:
+            del embed_digitaltwin.input
+        # Sequential IDs from before content-derived IDs are deleted, not left beside the new ones
+        assert (stats["upserted"], stats["deleted"]) == (len(chunks), 1)
+        assert sorted(client.list_ids()) == sorted(chunk_id for chunk_id, _, _ in chunks)
+
+
+def test_full_run_deletes_ids_not_in_profile():
+    """--full re-uploads every chunk and deletes IDs the manifest no longer lists"""
+    with local_index() as (client, manifest):
+        chunks = flatten_profile_to_chunks(PROFILE)
+        ingest_to_upstash(chunks, manifest)
+
+        shorter = chunks[:-3]
+        stats = ingest_to_upstash(shorter, manifest, full=True)
+        assert (stats["upserted"], stats["deleted"]) == (len(shorter), 3)
+        assert client.info()["vectorCount"] == len(shorter)
+
+
+def test_in_memory_index_keeps_no_manifest():
+    """An index discarded at exit is never recorded as ingested"""
+    with local_index(persistent=False) as (_, manifest):
+        chunks = flatten_profile_to_chunks(PROFILE)
+        assert ingest_to_upstash(chunks, manifest)["upserted"] == len(chunks)
+        assert not os.path.exists(manifest) and not os.path.exists(manifest + ".journal")
+
+
+def main():
+    """Run all ingestion tests"""
+    tests = [
+        ("Content-Derived IDs", test_chunk_ids_are_content_derived),
+        ("Incremental Re-ingestion", test_edit_reembeds_one_chunk),
+        ("Metadata-Only Change", test_metadata_change_keeps_id),
+        ("Resume From Journal", test_failed_run_resumes_from_journal),
+        ("Headless Run", test_headless_run_never_prompts),
+        ("Full Run Deletes Stale IDs", test_full_run_deletes_ids_not_in_profile),
+        ("In-Memory Index", test_in_memory_index_keeps_no_manifest),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""
+Offline Tests for the Groq Client
+Replaces the Groq SDK client with an in-memory stand-in, so no API key or
+network access is needed
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import httpx
+from groq import Groq
+
+import groq_client
+from fakes import FakeAsyncGroq, FakeAsyncStream, make_chunk, make_completion
+from response_cache import ResponseCache, make_key
+from settings import Settings
+
+
+class FakeStream:
+    """Blocking stream that can stall before its first chunk or fail part-way"""
+
+    def __init__(self, pieces, stall=0.0, fail_after=None):
+        self.pieces = list(pieces)
+        self.stall = stall
+        self.fail_after = fail_after
+        self.sent = 0
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.stall and not self.sent and self.closed.wait(self.stall):
+            raise StopIteration
+        if self.sent == self.fail_after:
+            raise ConnectionError("connection reset")
+        if not self.pieces:
+            raise StopIteration
+        self.sent += 1
+        return make_chunk(self.pieces.pop(0))
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeStreamingGroq:
+    """Serves the given streams in turn, one per call"""
+
+    def __init__(self, *streams):
+        self.streams = list(streams)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **params):
+        self.calls += 1
+        return self.streams.pop(0)
+
+    async def _create_async(self, **params):
+        return self._create(**params)
+
+
+@contextmanager
+def fake_groq(client=None, async_client=None):
+    """
+    Serve the given stand-in Groq clients with no retry backoff, restoring
+    the real factories on exit
+    """
+    originals = (groq_client.get_groq_client, groq_client.get_async_groq_client, groq_client.RETRY_DELAY_MS)
+    if client is not None:
+        groq_client.get_groq_client = lambda: client
+    if async_client is not None:
+        groq_client.get_async_groq_client = lambda: async_client
+    groq_client.RETRY_DELAY_MS = 0  # No backoff sleeps in tests
+    try:
+        yield
+    finally:
+        groq_client.get_groq_client, groq_client.get_async_groq_client, groq_client.RETRY_DELAY_MS = originals
+
+
+def test_async_generation_retries_transient_errors():
+    """Transient failures are retried without blocking the event loop"""
+    fake = FakeAsyncGroq(failures=1)
+    with fake_groq(async_client=fake):
+        assert asyncio.run(groq_client.generate_response_async("Hi")) == "Hello"
+    assert fake.calls == 2
+
+
+def test_async_generation_timeout():
+    """A per-call timeout surfaces as a timeout error after retries"""
+    with fake_groq(async_client=FakeAsyncGroq(delay=1.0)):
+        try:
+            asyncio.run(groq_client.generate_response_async("Hi", timeout=0.01))
+        except RuntimeError as error:
+            assert "timed out" in str(error)
+            return
+    raise AssertionError("expected RuntimeError")
+
+
+def test_async_streaming():
+    """Async streaming yields chunks in order"""
+    async def collect():
+        return [chunk async for chunk in groq_client.generate_response_streaming_async("Hi")]
+
+    with fake_groq(async_client=FakeAsyncGroq()):
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+
+
+def test_stalled_stream_is_retried_before_first_token():
+    """A stream with no token inside the TTFT deadline is closed and retried transparently"""
+    stalled = FakeStream(["late"], stall=5.0)
+    fake = FakeStreamingGroq(stalled, FakeStream(["Hel", "lo"]))
+    metrics = []
+    with fake_groq(client=fake):
+        chunks = groq_client.generate_response_streaming(
+            "Stall?", use_cache=False, first_token_timeout=0.05, on_metrics=metrics.append
+        )
+        assert list(chunks) == ["Hel", "lo"]
+    assert fake.calls == 2 and stalled.closed.is_set()
+    assert metrics[0].completed and metrics[0].chunks == 2 and metrics[0].ttft_s < 1.0
+
+    stalled = FakeAsyncStream(["late"], stall=5.0)
+    fake = FakeStreamingGroq(stalled, FakeAsyncStream(["Hel", "lo"]))
+    fake.chat.completions.create = fake._create_async
+
+    async def collect():
+        return [
+            chunk async for chunk in
+            groq_client.generate_response_streaming_async("Stall?", use_cache=False, first_token_timeout=0.05)
+        ]
+
+    with fake_groq(async_client=fake):
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+    assert fake.calls == 2 and stalled.closed
+
+
+def test_mid_stream_failure_raises():
+    """A failure after tokens were emitted raises instead of becoming response text"""
+    fake = FakeStreamingGroq(FakeStream(["Hel", "lo"], fail_after=1))
+    received = []
+    with fake_groq(client=fake):
+        try:
+            for chunk in groq_client.generate_response_streaming("Fail?", use_cache=False):
+                received.append(chunk)
+        except RuntimeError as error:
+            assert received == ["Hel"] and "after 1 chunks" in str(error)
+        else:
+            raise AssertionError("expected RuntimeError")
+    assert fake.calls == 1
+
+    stream = FakeAsyncStream(["Hel", "lo"], fail_after=1)
+    fake = FakeStreamingGroq(stream)
+    fake.chat.completions.create = fake._create_async
+
+    async def collect():
+        async for chunk in groq_client.generate_response_streaming_async("Fail?", use_cache=False):
+            received.append(chunk)
+
+    received = []
+    with fake_groq(async_client=fake):
+        try:
+            asyncio.run(collect())
+        except RuntimeError:
+            assert received == ["Hel"] and stream.closed
+        else:
+            raise AssertionError("expected RuntimeError")
+
+
+def test_response_cache_serves_repeats_and_replays_streams():
+    """Identical requests are answered from memory or sqlite; bypass skips the cache"""
+    class FakeGroq:
+        def __init__(self):
+            self.calls = 0
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        def _create(self, **params):
+            self.calls += 1
+            if params["stream"]:
+                return iter([make_chunk("Hel"), make_chunk("lo")])
+            return make_completion(" Hello ")
+
+    fake = FakeGroq()
+    Settings.RESPONSE_CACHE_SIZE = 16
+    with tempfile.TemporaryDirectory() as path, fake_groq(client=fake, async_client=FakeAsyncGroq()):
+        Settings.RESPONSE_CACHE_PATH = os.path.join(path, "responses.db")
+        try:
+            assert groq_client.generate_response("Hi") == "Hello"
+            assert groq_client.generate_response("Hi") == "Hello"
+            assert fake.calls == 1
+            assert groq_client.generate_response("Hi", use_cache=False) == "Hello"
+            assert groq_client.generate_response("Hi", temperature=0.2) == "Hello"
+            assert fake.calls == 3
+
+            assert list(groq_client.generate_response_streaming("Tell me")) == ["Hel", "lo"]
+            assert list(groq_client.generate_response_streaming("Tell me")) == ["Hel", "lo"]
+            assert fake.calls == 4
+
+            assert asyncio.run(groq_client.generate_response_async("Hi")) == "Hello"
+
+            async def collect():
+                return [chunk async for chunk in groq_client.generate_response_streaming_async("Tell me", temperature=1.0)]
+
+            assert asyncio.run(collect()) == ["Hel", "lo"]
+            assert fake.calls == 4
+
+            # A fresh cache on the same file is served from the sqlite tier
+            key = make_key("Hi", None, groq_client.DEFAULT_MODEL, 0.7, 1024)
+            disk = ResponseCache(path=Settings.RESPONSE_CACHE_PATH)
+            assert disk.get(key) == ["Hello"] and disk.stats()["disk_hits"] == 1
+            disk.close()
+        finally:
+            groq_client.get_response_cache().close()
+            Settings.RESPONSE_CACHE_SIZE = 0
+            Settings.RESPONSE_CACHE_PATH = ""
+            groq_client.registry.invalidate("response-cache")
+
+
+def test_promoted_disk_hit_keeps_its_expiry():
+    """An entry promoted from sqlite to memory expires when the disk row does"""
+    with tempfile.TemporaryDirectory() as path:
+        db_path = os.path.join(path, "responses.db")
+        writer = ResponseCache(ttl_seconds=0.3, path=db_path)
+        writer.set("key", ["Hello"])
+        writer.close()
+
+        time.sleep(0.15)
+        reader = ResponseCache(ttl_seconds=0.3, path=db_path)
+        try:
+            assert reader.get("key") == ["Hello"] and reader.stats()["disk_hits"] == 1
+            time.sleep(0.2)
+            assert reader.get("key") is None
+        finally:
+            reader.close()
+
+
+def test_rate_limit_honours_retry_after_and_headers():
+    """A 429 waits for Retry-After; success headers update the shared limiter"""
+    request_times = []
+
+    def handler(request):
+        request_times.append(time.monotonic())
+        if len(request_times) == 1:
+            return httpx.Response(429, headers={"retry-after": "0.2"}, json={"error": {"message": "Rate limit reached"}})
+        return httpx.Response(
+            200,
+            headers={
+                "x-ratelimit-limit-tokens": "6000",
+                "x-ratelimit-remaining-tokens": "5000",
+                "x-ratelimit-reset-tokens": "10s",
+            },
+            json={
+                "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": groq_client.DEFAULT_MODEL,
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": " OK "}}],
+            }
+        )
+
+    client = Groq(api_key="test-key", max_retries=0, http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    groq_client.registry.invalidate("groq-rate-limiter")
+    try:
+        with fake_groq(client=client):
+            assert groq_client.generate_response("Rate limited?", use_cache=False) == "OK"
+        assert request_times[1] - request_times[0] >= 0.2
+
+        limiter = groq_client.get_rate_limiter()
+        assert limiter._tokens.capacity == 6000 and limiter._tokens.level <= 5000
+    finally:
+        groq_client.registry.invalidate("groq-rate-limiter")
+
+
+def test_sync_client_is_shared_until_key_changes():
+    """get_groq_client reuses one client and rebuilds it when the API key changes"""
+    original_key = Settings.GROQ_API_KEY
+    try:
+        Settings.GROQ_API_KEY = "test-key-1"
+        first = groq_client.get_groq_client()
+        assert groq_client.get_groq_client() is first
+
+        Settings.GROQ_API_KEY = "test-key-2"
+        second = groq_client.get_groq_client()
+        assert second is not first
+        assert groq_client.get_groq_client() is second
+    finally:
+        Settings.GROQ_API_KEY = original_key
+        groq_client.registry.invalidate("groq")
+
+
+def main():
+    """Run all Groq client tests"""
+    tests = [
+        ("Async Retries", test_async_generation_retries_transient_errors),
+        ("Async Timeout", test_async_generation_timeout),
+        ("Async Streaming", test_async_streaming),
+        ("First-Token Timeout Retry", test_stalled_stream_is_retried_before_first_token),
+        ("Mid-Stream Failure", test_mid_stream_failure_raises),
+        ("Response Cache", test_response_cache_serves_repeats_and_replays_streams),
+        ("Promoted Disk Hit Expiry", test_promoted_disk_hit_keeps_its_expiry),
+        ("Rate Limit Headers", test_rate_limit_honours_retry_after_and_headers),
+        ("Shared Sync Client", test_sync_client_is_shared_until_key_changes),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
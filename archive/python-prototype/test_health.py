@@ -0,0 +1,102 @@
+"""
+Offline Tests for Dependency Health Checks
+Replaces the Groq and vector probes with stand-ins, so no credentials or
+network access are needed
+"""
+
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import health
+
+
+def make_probe(delay=0.0, error=None, calls=None):
+    """A probe that takes delay seconds, then fails with error or succeeds"""
+    def probe(timeout):
+        if calls is not None:
+            calls.append(time.perf_counter())
+        time.sleep(delay)
+        if error:
+            raise RuntimeError(error)
+        return {"models": 3}
+    return probe
+
+
+@contextmanager
+def stand_in_probes(**probes):
+    """Check only the given probes, starting with no cached results; restores PROBES on exit"""
+    original = health.PROBES
+    health.PROBES = probes
+    health._results.clear()
+    try:
+        yield
+    finally:
+        health.PROBES = original
+        health._results.clear()
+
+
+def test_probes_run_in_parallel():
+    """A check takes as long as the slowest probe, not the sum"""
+    with stand_in_probes(groq=make_probe(0.2), vector=make_probe(0.2, error="index unavailable")):
+        start = time.perf_counter()
+        status = health.check_dependencies(max_age_s=0, timeout=1)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.35, f"took {elapsed:.2f}s"
+        assert status["status"] == "degraded"
+        assert status["checks"]["groq"]["ok"] and status["checks"]["groq"]["models"] == 3
+        assert status["checks"]["vector"]["error"] == "index unavailable"
+
+
+def test_results_are_cached():
+    """Fresh results are reused; concurrent refreshes share one probe"""
+    calls = []
+    with stand_in_probes(groq=make_probe(0.1, calls=calls)):
+        threads = [threading.Thread(target=health.check_dependencies, kwargs={"timeout": 1}) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1
+
+        assert health.check_dependencies()["status"] == "ok" and len(calls) == 1
+        assert health.cached_status()["checks"]["groq"]["ok"] and not health.is_stale()
+        health.check_dependencies(max_age_s=0)
+        assert len(calls) == 2
+
+
+def test_hung_probe_is_bounded_by_timeout():
+    """A probe that does not answer in time is reported failed at the deadline"""
+    with stand_in_probes(groq=make_probe(1.0), vector=make_probe()):
+        start = time.perf_counter()
+        status = health.check_dependencies(max_age_s=0, timeout=0.1)
+        assert time.perf_counter() - start < 0.5
+        assert not status["checks"]["groq"]["ok"] and "within" in status["checks"]["groq"]["error"]
+        assert status["checks"]["vector"]["ok"]
+
+
+def main():
+    """Run all health check tests"""
+    tests = [
+        ("Parallel Probes", test_probes_run_in_parallel),
+        ("Cached Results", test_results_are_cached),
+        ("Probe Timeout", test_hung_probe_is_bounded_by_timeout),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Offline Tests for the Local Vector Index
+Runs without network access or credentials (VECTOR_BACKEND=local)
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import ivf_index
+from client_registry import registry
+from fakes import make_local_client
+from local_vector_client import LocalVectorClient
+from settings import Settings
+from vector_clients import get_vector_client
+
+
+SAMPLE_ITEMS = [
+    ("skill-python", "Programming: Python data analysis with pandas", {"type": "skill", "tags": ["python"]}),
+    ("skill-java", "Programming: Java object oriented design", {"type": "skill", "tags": ["java"]}),
+    ("edu-degree", "Education: Bachelor of IT at Victoria University", {"type": "education", "tags": []}),
+    ("goals", "Career goals: become a data engineer", {"type": "goals", "tags": ["career"]}),
+]
+
+
+def test_query_ranks_matching_chunk_first():
+    """The best lexical match is returned first with an Upstash-style score"""
+    client = make_local_client(SAMPLE_ITEMS)
+    results = client.query_text("python programming", top_k=2)
+
+    assert len(results) == 2
+    assert results[0].id == "skill-python"
+    assert results[0].get('metadata')['type'] == "skill"
+    assert 0.0 <= results[1].score <= results[0].score <= 1.0
+
+
+def test_top_k_matches_exact_sort():
+    """argpartition top-k agrees with a full sort over the same scores"""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 256)).astype(np.float32)
+    client = LocalVectorClient(read_only=False, dimension=256, embed_fn=lambda texts: vectors[:len(texts)])
+    client.upsert_texts((f"v{i}", vectors[i].tolist(), {}) for i in range(500))
+
+    results = client.query_text("ignored", top_k=10)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ normalized[0]))[:10]
+    assert [r.id for r in results] == [f"v{i}" for i in expected]
+
+
+def test_filters_upsert_and_delete():
+    """Filters restrict candidates; upsert overwrites; delete keeps rows contiguous"""
+    client = make_local_client(SAMPLE_ITEMS)
+
+    filtered = client.query_text("python", top_k=5, filters={"type": "skill"})
+    assert {r.id for r in filtered} == {"skill-python", "skill-java"}
+
+    client.upsert_texts([("goals", "Career goals: lead a platform team", {"type": "goals"})])
+    assert client.info()['vectorCount'] == 4
+
+    client.delete(["skill-python", "missing-id"])
+    assert client.info()['vectorCount'] == 3
+    assert "skill-python" not in [r.id for r in client.query_text("python", top_k=5)]
+    assert client.query_text("Victoria University", top_k=1)[0].id == "edu-degree"
+
+    client.reset()
+    assert client.query_text("python") == []
+
+
+def test_read_only_rejects_writes():
+    """Read-only mode mirrors UpstashVectorClient"""
+    client = LocalVectorClient(read_only=True, dimension=64)
+    try:
+        client.upsert_texts(SAMPLE_ITEMS)
+    except RuntimeError:
+        return
+    raise AssertionError("upsert should fail in read-only mode")
+
+
+def test_save_and_mmap_reload():
+    """A saved index reopens with mmap and answers queries without re-embedding"""
+    client = make_local_client(SAMPLE_ITEMS)
+    with tempfile.TemporaryDirectory() as path:
+        client.save(path)
+
+        reloaded = LocalVectorClient(read_only=True, path=path)
+        assert isinstance(reloaded._vectors, np.memmap)
+        assert reloaded.info()['vectorCount'] == 4
+        before = client.query_text("Victoria University", top_k=2)
+        after = reloaded.query_text("Victoria University", top_k=2)
+        assert [r.id for r in after] == [r.id for r in before]
+        assert after[0].metadata == before[0].metadata
+        assert reloaded.query_text("python", filters={"type": "goals"})[0].id == "goals"
+
+        writable = LocalVectorClient(read_only=False, path=path)
+        writable.delete(["goals"])
+        writable.save()
+        assert LocalVectorClient(read_only=True, path=path).info()['vectorCount'] == 3
+        assert reloaded.info()['vectorCount'] == 4  # Old mapping is unaffected
+
+
+def test_save_over_other_storage_removes_stale_arrays():
+    """Saving over an index of another storage mode leaves no arrays from the earlier save"""
+    rng = np.random.default_rng(3)
+    with tempfile.TemporaryDirectory() as path:
+        small = LocalVectorClient(read_only=False, dimension=32)
+        small.upsert_texts([(f"a{i}", rng.standard_normal(32), None) for i in range(10)])
+        small.save(path)
+
+        large = LocalVectorClient(read_only=False, dimension=32, storage="int8")
+        vectors = rng.standard_normal((20, 32)).astype(np.float32)
+        large.upsert_texts([(f"b{i}", vectors[i], None) for i in range(20)])
+        large.save(path)
+        assert not os.path.exists(os.path.join(path, "vectors.npy"))
+
+        reloaded = LocalVectorClient(read_only=True, path=path, storage="int8", rescore=True)
+        assert not reloaded.rescore and reloaded.info()['vectorCount'] == 20
+        assert reloaded.query_vector(vectors[11], top_k=1)[0].id == "b11"
+
+        # Arrays from different saves are rejected instead of indexed out of bounds
+        np.save(os.path.join(path, "scales.npy"), np.ones(10, dtype=np.float32))
+        try:
+            LocalVectorClient(read_only=True, path=path)
+            assert False, "Expected ValueError for mismatched row counts"
+        except ValueError as error:
+            assert "scales.npy" in str(error)
+
+
+def test_ivf_index_recall_and_delete():
+    """IVF search matches exact search when probing every list, and tracks deletes"""
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((1000, 32)).astype(np.float32)
+    client = LocalVectorClient(read_only=False, dimension=32, index_type="ivf", nlist=8, nprobe=2)
+    client.upsert_texts((f"v{i}", vectors[i], {"even": i % 2 == 0}) for i in range(1000))
+
+    exact = LocalVectorClient(read_only=False, dimension=32)
+    exact.upsert_texts((f"v{i}", vectors[i], {"even": i % 2 == 0}) for i in range(1000))
+
+    query = vectors[7]
+    expected = [r.id for r in exact.query_vector(query, top_k=10)]
+    assert [r.id for r in client.query_vector(query, top_k=10, nprobe=8)] == expected
+    assert client.query_vector(query, top_k=1)[0].id == "v7"
+
+    client.delete(["v7", "v999"])
+    ids = [r.id for r in client.query_vector(query, top_k=10, nprobe=8)]
+    assert "v7" not in ids and len(ids) == 10
+    assert all(r.metadata["even"] for r in client.query_vector(query, top_k=5, filters={"even": True}))
+
+    with tempfile.TemporaryDirectory() as path:
+        client.save(path)
+        reloaded = LocalVectorClient(read_only=True, path=path, index_type="ivf")
+        assert reloaded._ivf.trained
+        assert [r.id for r in reloaded.query_vector(vectors[8], top_k=5)] == \
+            [r.id for r in client.query_vector(vectors[8], top_k=5)]
+
+
+def test_concurrent_first_queries_train_once():
+    """Threads that all trigger the lazy IVF training share one trained index"""
+    rng = np.random.default_rng(4)
+    vectors = rng.standard_normal((400, 16)).astype(np.float32)
+    client = LocalVectorClient(read_only=False, dimension=16, index_type="ivf", nlist=4, nprobe=4)
+    client.upsert_texts((f"v{i}", vectors[i], None) for i in range(400))
+
+    original_train = ivf_index.IVFIndex.train
+    trainings = []
+
+    def slow_train(self, train_vectors):
+        trainings.append(1)
+        time.sleep(0.05)  # Widen the window in which other queries arrive
+        original_train(self, train_vectors)
+
+    ivf_index.IVFIndex.train = slow_train
+    results = {}
+    try:
+        threads = [
+            threading.Thread(target=lambda i=i: results.setdefault(i, client.query_vector(vectors[i], top_k=1)[0].id))
+            for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        ivf_index.IVFIndex.train = original_train
+
+    assert len(trainings) == 1
+    assert results == {i: f"v{i}" for i in range(8)}
+
+
+def test_concurrent_upserts_and_queries():
+    """Queries stay consistent while another thread upserts and deletes rows"""
+    rng = np.random.default_rng(5)
+    vectors = rng.standard_normal((600, 16)).astype(np.float32)
+    client = LocalVectorClient(read_only=False, dimension=16, index_type="ivf", nlist=4, nprobe=4)
+    client.upsert_texts((f"v{i}", vectors[i], None) for i in range(200))
+    client.build_ann_index()
+
+    errors = []
+    done = threading.Event()
+
+    def write():
+        try:
+            for start in range(200, 600, 20):
+                client.upsert_texts((f"v{i}", vectors[i], None) for i in range(start, start + 20))
+                client.delete([f"v{i}" for i in range(start, start + 10)])
+        except Exception as e:
+            errors.append(e)
+        finally:
+            done.set()
+
+    def read(offset):
+        try:
+            while not done.is_set():
+                for i in range(offset, 200, 4):
+                    assert client.query_vector(vectors[i], top_k=1)[0].id == f"v{i}"
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert client.info()["vectorCount"] == 400
+
+
+def test_quantized_storage_with_rescoring():
+    """int8/float16 storage shrinks memory and rescoring restores exact ranking"""
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((2000, 64)).astype(np.float32)
+    items = [(f"v{i}", vectors[i], {"i": i}) for i in range(2000)]
+
+    exact = LocalVectorClient(read_only=False, dimension=64)
+    exact.upsert_texts(items)
+    queries = vectors[:20] + 0.3 * rng.standard_normal((20, 64)).astype(np.float32)
+    expected = [[r.id for r in exact.query_vector(q, top_k=5)] for q in queries]
+
+    for storage in ("float16", "int8"):
+        quantized = LocalVectorClient(read_only=False, dimension=64, storage=storage)
+        quantized.upsert_texts(items)
+        assert quantized.info()['vectorBytes'] < exact.info()['vectorBytes'] / 1.9
+        hits = sum(
+            len(set(e) & {r.id for r in quantized.query_vector(q, top_k=5)})
+            for q, e in zip(queries, expected)
+        )
+        assert hits / 100 >= 0.9, f"{storage} recall too low: {hits / 100}"
+
+    rescored = LocalVectorClient(read_only=False, dimension=64, storage="int8", rescore=True)
+    rescored.upsert_texts(items)
+    rescored.delete(["v1999"])
+    exact.delete(["v1999"])
+    for q in queries:
+        assert [r.id for r in rescored.query_vector(q, top_k=5)] == [r.id for r in exact.query_vector(q, top_k=5)]
+
+    with tempfile.TemporaryDirectory() as path:
+        rescored.save(path)
+        reloaded = LocalVectorClient(read_only=True, path=path, rescore=True)
+        assert reloaded.storage == "int8" and isinstance(reloaded._codes, np.memmap)
+        assert [r.id for r in reloaded.query_vector(queries[0], top_k=5)] == \
+            [r.id for r in exact.query_vector(queries[0], top_k=5)]
+
+
+def test_query_many_matches_single_queries():
+    """Batched queries return the same results as one-by-one queries, in order"""
+    client = make_local_client(SAMPLE_ITEMS)
+    questions = ["python programming", "Victoria University", "career goals", "java design"]
+
+    batched = client.query_many(questions, top_k=2)
+    assert len(batched) == len(questions)
+    for question, results in zip(questions, batched):
+        single = client.query_text(question, top_k=2)
+        assert [r.id for r in results] == [r.id for r in single]
+        assert [round(r.score, 5) for r in results] == [round(r.score, 5) for r in single]
+
+    filtered = client.query_many(questions, top_k=5, filters={"type": "skill"})
+    assert all({r.id for r in results} <= {"skill-python", "skill-java"} for results in filtered)
+
+
+def test_local_backend_shares_one_index():
+    """Readers and writers of the local backend get the same index, so upserts reach queries"""
+    originals = (Settings.VECTOR_BACKEND, Settings.LOCAL_VECTOR_PATH)
+    Settings.VECTOR_BACKEND, Settings.LOCAL_VECTOR_PATH = "local", ""
+    try:
+        writer = get_vector_client(read_only=False)
+        reader = get_vector_client(read_only=True)
+        assert reader is writer
+        writer.upsert_texts(SAMPLE_ITEMS)
+        assert reader.query_text("Victoria University", top_k=1)[0].id == "edu-degree"
+    finally:
+        Settings.VECTOR_BACKEND, Settings.LOCAL_VECTOR_PATH = originals
+        registry.invalidate("vector:local")
+
+
+def main():
+    """Run all local vector tests"""
+    tests = [
+        ("Query Ranking", test_query_ranks_matching_chunk_first),
+        ("Exact Top-K", test_top_k_matches_exact_sort),
+        ("Filters, Upsert and Delete", test_filters_upsert_and_delete),
+        ("Read-Only Mode", test_read_only_rejects_writes),
+        ("Save and mmap Reload", test_save_and_mmap_reload),
+        ("Save Over Other Storage", test_save_over_other_storage_removes_stale_arrays),
+        ("IVF Recall and Delete", test_ivf_index_recall_and_delete),
+        ("Concurrent IVF Training", test_concurrent_first_queries_train_once),
+        ("Concurrent Upserts and Queries", test_concurrent_upserts_and_queries),
+        ("Quantized Storage", test_quantized_storage_with_rescoring),
+        ("Batched Queries", test_query_many_matches_single_queries),
+        ("Shared Local Backend", test_local_backend_shares_one_index),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
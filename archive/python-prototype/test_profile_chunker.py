@@ -0,0 +1,102 @@
+"""
+Offline Tests for the Profile Chunker
+"""
+
+import json
+import sys
+
+from context_packer import count_tokens
+from profile_chunker import Section, chunk_profile, split_text
+
+with open("digitaltwin.json", "r", encoding="utf-8") as f:
+    PROFILE = json.load(f)
+
+
+def test_every_section_is_chunked_within_budget():
+    """All top-level profile sections are indexed, and no chunk exceeds the target size"""
+    chunks = chunk_profile(PROFILE, target_tokens=160, overlap_tokens=32)
+    sections = {metadata["section"].split(".")[0] for _, _, metadata in chunks}
+
+    assert set(PROFILE) - {"content_chunks"} <= sections
+    assert {"projects_portfolio", "interview_prep", "professional_development"} <= sections
+    assert max(count_tokens(metadata["content"]) for _, _, metadata in chunks) <= 160
+    assert len({chunk_id for chunk_id, _, _ in chunks}) == len(chunks)
+
+
+def test_long_text_is_windowed_with_overlap():
+    """Long texts split at sentence boundaries, and each window repeats the previous one's last sentence"""
+    sentences = [f"Sentence number {i} describes one more detail of the project." for i in range(40)]
+    windows = split_text(" ".join(sentences), target_tokens=60, overlap_tokens=20)
+
+    assert len(windows) > 1
+    assert all(count_tokens(window) <= 60 for window in windows)
+    for previous, current in zip(windows, windows[1:]):
+        last_sentence = previous.split(". ")[-1]
+        assert current.startswith(last_sentence.rstrip("."))
+    assert split_text("Short text.", target_tokens=60) == ["Short text."]
+
+
+def test_windows_never_exceed_target():
+    """Carried overlap is dropped when the next sentence would push a window past the target"""
+    assert split_text("Six token sentence here. This one is about eleven tokens long too.",
+                      target_tokens=12, overlap_tokens=6) == [
+        "Six token sentence here.", "This one is about eleven tokens long too."]
+
+    uniform = " ".join(f"Sentence number {i} describes one more detail of the project." for i in range(40))
+    mixed = " ".join("Short one." if i % 3 else f"Sentence {i} is much longer and lists several more details."
+                     for i in range(40))
+    for text in (uniform, mixed):
+        for target, overlap in ((40, 20), (60, 20), (25, 24), (12, 6)):
+            windows = split_text(text, target_tokens=target, overlap_tokens=overlap)
+            assert all(count_tokens(window) <= target for window in windows), (target, overlap)
+            assert windows[-1].endswith("details." if text is mixed else "of the project.")
+
+
+def test_short_items_are_packed():
+    """A list of short items becomes a few full chunks rather than one tiny chunk per item"""
+    profile = {"skills": {"soft_skills": [f"Skill {i}" for i in range(100)]}}
+    schema = [Section("skills.soft_skills", "Soft Skills", "skill")]
+    chunks = chunk_profile(profile, schema, target_tokens=50, overlap_tokens=10)
+
+    contents = [metadata["content"] for _, _, metadata in chunks]
+    assert 1 < len(chunks) < 20
+    assert "\n".join(contents).split("\n") == [f"Skill {i}" for i in range(100)]
+    assert chunks[0][2]["title"] == "Soft Skills (part 1)"
+
+
+def test_appending_an_item_keeps_earlier_chunk_ids():
+    """Growing a list only changes the IDs of the windows the new item lands in"""
+    schema = [Section("skills.soft_skills", "Soft Skills", "skill")]
+    skills = [f"Skill {i}" for i in range(101)]
+    before = chunk_profile({"skills": {"soft_skills": skills}}, schema, target_tokens=50, overlap_tokens=10)
+    after = chunk_profile({"skills": {"soft_skills": skills + ["Skill 101"]}}, schema, target_tokens=50, overlap_tokens=10)
+
+    assert len(after) == len(before) + 1  # The new item opens a window
+    assert [chunk_id for chunk_id, _, _ in after[:len(before) - 1]] == [chunk_id for chunk_id, _, _ in before[:-1]]
+
+
+def main():
+    """Run all profile chunker tests"""
+    tests = [
+        ("All Sections Within Budget", test_every_section_is_chunked_within_budget),
+        ("Windowing With Overlap", test_long_text_is_windowed_with_overlap),
+        ("Windows Within Target", test_windows_never_exceed_target),
+        ("Packing Short Items", test_short_items_are_packed),
+        ("Stable IDs On Append", test_appending_an_item_keeps_earlier_chunk_ids),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
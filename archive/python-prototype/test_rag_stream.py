@@ -0,0 +1,87 @@
+"""
+Offline Tests for Streaming RAG
+Uses an in-process LocalVectorClient and a stand-in for the Groq stream, so
+no API key or network access is needed
+"""
+
+import sys
+
+import digital_twin_mcp_server as server
+from local_vector_client import LocalVectorClient
+from streaming import StreamMetrics
+
+PROFILE = [
+    ("skills", "Technical skills: Python, SQL and cloud deployment",
+     {"title": "Technical Skills", "content": "Python, SQL and cloud deployment"}),
+    ("goals", "Career goals: lead a platform engineering team",
+     {"title": "Career Goals", "content": "Lead a platform engineering team"}),
+]
+
+
+def make_vector_client():
+    client = LocalVectorClient(read_only=False, dimension=256)
+    client.upsert_texts(PROFILE)
+    return client
+
+
+def fake_stream(pieces, fail=False):
+    def generate(prompt, model, use_cache, on_metrics):
+        assert "Question: What are your skills?" in prompt
+        for piece in pieces:
+            yield piece
+        if fail:
+            raise RuntimeError("Groq stream failed after 2 chunks")
+        on_metrics(StreamMetrics(ttft_s=0.05, duration_s=0.15, chunks=len(pieces), tokens=10, completed=True))
+    return generate
+
+
+def test_sources_lead_then_tokens_then_timing():
+    """Sources come first, then each token as it arrives, then a timing event"""
+    original = server.generate_response_streaming
+    server.generate_response_streaming = fake_stream(["I know ", "Python."])
+    try:
+        events = list(server.rag_query_stream(make_vector_client(), "What are your skills?", use_cache=False))
+    finally:
+        server.generate_response_streaming = original
+
+    assert [event["event"] for event in events] == ["sources", "token", "token", "done"]
+    assert events[0]["sources"][0]["title"] == "Technical Skills" and not events[0]["cached"]
+    assert "".join(event["text"] for event in events[1:3]) == "I know Python."
+    assert events[-1]["ttft_ms"] == 50.0 and round(events[-1]["tokens_per_second"]) == 100
+
+
+def test_generation_failure_ends_with_error_event():
+    """A failed stream ends with an error event after the tokens already sent"""
+    original = server.generate_response_streaming
+    server.generate_response_streaming = fake_stream(["I know ", "Py"], fail=True)
+    try:
+        events = list(server.rag_query_stream(make_vector_client(), "What are your skills?", use_cache=False))
+    finally:
+        server.generate_response_streaming = original
+
+    assert [event["event"] for event in events] == ["sources", "token", "token", "error"]
+    assert "Groq stream failed" in events[-1]["message"]
+
+
+def main():
+    """Run all streaming RAG tests"""
+    tests = [
+        ("Sources, Tokens, Timing", test_sources_lead_then_tokens_then_timing),
+        ("Generation Failure", test_generation_failure_ends_with_error_event),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Offline Tests for the Groq Rate Limiter
+"""
+
+import sys
+
+from rate_limiter import RateLimiter, backoff_delay, parse_duration
+
+
+def test_parse_durations_and_backoff():
+    """Groq reset durations parse to seconds; backoff grows, is capped and jittered"""
+    assert parse_duration("7.66s") == 7.66
+    assert abs(parse_duration("2m59.56s") - 179.56) < 1e-9
+    assert parse_duration("450ms") == 0.45
+    assert parse_duration("3") == 3.0
+    assert parse_duration("soon") is None and parse_duration(None) is None
+
+    for attempt in range(1, 8):
+        delay = backoff_delay(attempt, base_s=1.0, max_s=8.0)
+        expected = min(8.0, 2 ** (attempt - 1))
+        assert expected / 2 <= delay <= expected
+    assert len({backoff_delay(3, 1.0, 8.0) for _ in range(20)}) > 1
+
+
+def test_exhausted_bucket_spreads_callers_into_slots():
+    """When headers report no capacity left, concurrent callers get successive slots"""
+    limiter = RateLimiter()
+    assert limiter._reserve(500) == 0.0  # Unknown limits never block
+
+    limiter.update_from_headers({
+        "x-ratelimit-limit-tokens": "6000",
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-reset-tokens": "6s",
+    })
+    waits = [limiter._reserve(1000) for _ in range(3)]
+    assert waits[0] < waits[1] < waits[2]
+    assert abs(waits[0] - 1.0) < 0.05  # 1000 tokens at 1000 tokens/s
+
+    limiter.update_from_headers({"retry-after": "30"})
+    assert limiter._reserve(0) > 29
+
+
+def test_known_limits_allow_bursts_up_to_capacity():
+    """A fresh limiter admits a burst up to its per-minute capacity, then paces"""
+    limiter = RateLimiter(requests_per_minute=60)
+    assert all(limiter._reserve(0) == 0.0 for _ in range(60))
+    assert 0.9 < limiter._reserve(0) < 1.1
+
+
+def test_daily_request_headers_do_not_size_the_minute_bucket():
+    """Groq's request headers count per day: they never allow a burst, but an exhausted day pauses"""
+    limiter = RateLimiter()
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "14400",
+        "x-ratelimit-remaining-requests": "14399",
+        "x-ratelimit-reset-requests": "6s",
+    })
+    assert limiter._requests.capacity == 0 and limiter._reserve(0) == 0.0
+
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "14400",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-reset-requests": "2m59.56s",
+    })
+    assert 179 < limiter._reserve(0) < 180
+
+
+def main():
+    """Run all rate limiter tests"""
+    tests = [
+        ("Durations and Backoff", test_parse_durations_and_backoff),
+        ("Slots After Exhaustion", test_exhausted_bucket_spreads_callers_into_slots),
+        ("Burst Capacity", test_known_limits_allow_bursts_up_to_capacity),
+        ("Daily Request Headers", test_daily_request_headers_do_not_size_the_minute_bucket),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
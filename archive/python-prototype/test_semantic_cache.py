@@ -0,0 +1,109 @@
+"""
+Offline Tests for the Semantic Answer Cache
+Uses the default hashing embedder, so no model or network access is needed
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from semantic_cache import LEXICAL_THRESHOLD, SemanticCache, profile_fingerprint
+
+MODEL = "llama-3.1-8b-instant"
+
+
+def test_similar_question_hits_and_reports_savings():
+    """A reworded question returns the stored answer; an unrelated one misses"""
+    cache = SemanticCache(threshold=0.9)
+    cache.store("What programming languages do you code in?", "Python and Java.", MODEL, seconds=1.5)
+
+    assert cache.lookup("what programming languages do you code in", MODEL) == "Python and Java."
+    assert cache.lookup("Where did you study?", MODEL) is None
+    assert cache.lookup("What programming languages do you code in?", "another-model") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert 1.0 < stats["seconds_saved"] <= 1.5
+
+
+def test_key_entity_change_misses():
+    """A question differing only in a key entity is a miss with the default embedder"""
+    cache = SemanticCache(threshold=0.95)
+    assert cache.threshold == LEXICAL_THRESHOLD
+    cache.store("What is your experience with Python programming and data engineering projects?",
+                "Two years of Python.", MODEL, seconds=1.0)
+
+    assert cache.lookup("What is your experience with Java programming and data engineering projects?", MODEL) is None
+    assert cache.lookup("what is your experience with python programming and data engineering projects",
+                        MODEL) == "Two years of Python."
+
+    # A sentence embedder keeps the configured threshold
+    def embed(texts):
+        return np.ones((len(texts), 8), dtype=np.float32)
+
+    assert SemanticCache(threshold=0.9, embed_fn=embed, dimension=8).threshold == 0.9
+
+
+def test_profile_change_invalidates_answers():
+    """Answers are dropped when the digitaltwin.json fingerprint changes"""
+    with tempfile.TemporaryDirectory() as path:
+        profile_path = os.path.join(path, "digitaltwin.json")
+        with open(profile_path, "w", encoding="utf-8") as f:
+            f.write('{"skills": ["Python"]}')
+        before = profile_fingerprint(profile_path)
+
+        cache = SemanticCache(threshold=0.9)
+        cache.store("What are your skills?", "Python.", MODEL, seconds=1.0, profile=before)
+        assert cache.lookup("What are your skills?", MODEL, profile=before) == "Python."
+
+        with open(profile_path, "w", encoding="utf-8") as f:
+            f.write('{"skills": ["Python", "SQL"]}')
+        after = profile_fingerprint(profile_path)
+        assert after != before
+        assert cache.lookup("What are your skills?", MODEL, profile=after) is None
+        assert cache.stats()["size"] == 0
+
+
+def test_eviction_and_ttl():
+    """The oldest entry is evicted at capacity and expired entries miss"""
+    cache = SemanticCache(threshold=0.9, max_entries=2)
+    cache.store("Tell me about your education", "A degree.", MODEL, seconds=1.0)
+    cache.store("Tell me about your projects", "A chatbot.", MODEL, seconds=1.0)
+    cache.store("Tell me about your career goals", "Data engineering.", MODEL, seconds=1.0)
+
+    assert cache.stats()["size"] == 2
+    assert cache.lookup("Tell me about your education", MODEL) is None
+    assert cache.lookup("Tell me about your career goals", MODEL) == "Data engineering."
+
+    expiring = SemanticCache(threshold=0.9, ttl_seconds=0)
+    expiring.store("Tell me about your projects", "A chatbot.", MODEL, seconds=1.0)
+    assert expiring.lookup("Tell me about your projects", MODEL) is None
+    assert expiring.stats()["size"] == 0
+
+
+def main():
+    """Run all semantic cache tests"""
+    tests = [
+        ("Similar Question Hit", test_similar_question_hits_and_reports_savings),
+        ("Key Entity Change Misses", test_key_entity_change_misses),
+        ("Profile Invalidation", test_profile_change_invalidates_answers),
+        ("Eviction and TTL", test_eviction_and_ttl),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Offline Tests for Settings and Cold Start
+Each check runs in a fresh interpreter so import side effects are visible
+"""
+
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_python(code, **env):
+    """Run code in a fresh interpreter from this directory; returns stdout"""
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True,
+        env={**os.environ, **env}
+    )
+    assert result.returncode == 0, result.stderr[-1000:]
+    return result.stdout
+
+
+def test_import_has_no_side_effects():
+    """Importing settings prints nothing and does not read .env"""
+    output = run_python("import sys, settings; print('dotenv' in sys.modules)")
+    assert output == "False\n", output
+
+
+def test_settings_are_parsed_on_first_access():
+    """Values are read from the environment when first used; assignments still override"""
+    output = run_python(
+        "from settings import Settings\n"
+        "import os\n"
+        "os.environ['PORT'] = '9001'\n"
+        "print(Settings.PORT + 1, Settings.LOCAL_VECTOR_RESCORE, Settings.VECTOR_BACKEND)\n"
+        "Settings.PORT = 80\n"
+        "print(Settings.PORT)",
+        LOCAL_VECTOR_RESCORE="True", VECTOR_BACKEND="LOCAL"
+    )
+    assert output.split("\n")[:2] == ["9002 True local", "80"], output
+
+
+def test_entry_modules_defer_sdk_imports():
+    """The chat service and server import no SDK or NumPy until a client is built"""
+    output = run_python(
+        "import sys, chat_service, chat_server\n"
+        "print(sorted(m for m in ('groq', 'httpx', 'numpy', 'upstash_vector', 'tiktoken') if m in sys.modules))"
+    )
+    assert output == "[]\n", output
+
+
+def main():
+    """Run all settings tests"""
+    tests = [
+        ("No Import Side Effects", test_import_has_no_side_effects),
+        ("Lazy Settings", test_settings_are_parsed_on_first_access),
+        ("Deferred SDK Imports", test_entry_modules_defer_sdk_imports),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
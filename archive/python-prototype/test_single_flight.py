@@ -0,0 +1,177 @@
+"""
+Offline Tests for Single-Flight Request Coalescing
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    """Threads asking the same question at once trigger one call; errors are shared too"""
+    flight = SingleFlight()
+    calls = []
+
+    def answer():
+        calls.append(1)
+        time.sleep(0.1)
+        return "shared answer"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: flight.do("question", answer), range(8)))
+
+    assert results == ["shared answer"] * 8
+    assert len(calls) == 1 and flight.coalesced == 7
+    assert flight.do("question", lambda: "fresh") == "fresh"  # Key is released afterwards
+
+    def fail():
+        time.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    def call_failing(_):
+        try:
+            flight.do("failing", fail)
+        except RuntimeError as error:
+            return str(error)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert list(executor.map(call_failing, range(3))) == ["upstream down"] * 3
+
+
+def test_stream_fans_out_to_every_subscriber():
+    """Subscribers share one upstream stream, late joiners get a replay, abandoned streams close"""
+    flight = SingleFlight()
+    opened = []
+    release = threading.Event()
+
+    def upstream():
+        opened.append(1)
+        yield "Hel"
+        release.wait(1)
+        yield "lo"
+
+    first = flight.stream("prompt", upstream)
+    assert next(first) == "Hel"
+    second = flight.stream("prompt", upstream)
+    release.set()
+
+    assert ["Hel"] + list(first) == ["Hel", "lo"]
+    assert list(second) == ["Hel", "lo"]
+    assert len(opened) == 1
+
+    closed = threading.Event()
+
+    def endless():
+        try:
+            while True:
+                time.sleep(0.005)
+                yield "token"
+        finally:
+            closed.set()
+
+    stream = flight.stream("endless", endless)
+    never_iterated = flight.stream("endless", endless)
+    next(stream)
+    stream.close()
+    assert closed.wait(1)
+    try:
+        next(never_iterated)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError from a stream closed before it was read")
+
+
+def test_async_calls_and_streams_are_coalesced():
+    """Async callers share one task and one stream; a cancelled caller does not cancel the rest"""
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def answer():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "shared answer"
+
+    async def upstream():
+        calls.append(1)
+        for token in ("Hel", "lo"):
+            await asyncio.sleep(0.01)
+            yield token
+
+    async def collect():
+        return [token async for token in flight.stream("prompt", upstream)]
+
+    async def scenario():
+        cancelled = asyncio.ensure_future(flight.do("question", answer))
+        others = [asyncio.ensure_future(flight.do("question", answer)) for _ in range(4)]
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        results = await asyncio.gather(*others)
+        streams = await asyncio.gather(*(collect() for _ in range(3)))
+        return results, streams
+
+    results, streams = asyncio.run(scenario())
+    assert results == ["shared answer"] * 4
+    assert streams == [["Hel", "lo"]] * 3
+    assert len(calls) == 2
+
+
+def test_async_stream_stops_when_last_subscriber_leaves():
+    """A subscriber leaving before the first chunk stops the upstream and releases the key"""
+    flight = AsyncSingleFlight()
+    events = []
+
+    async def slow_upstream():
+        try:
+            await asyncio.sleep(10)
+            yield "late"
+        finally:
+            events.append("closed")
+
+    async def first_chunk():
+        async for chunk in flight.stream("prompt", slow_upstream):
+            return chunk
+
+    async def scenario():
+        waiting = asyncio.ensure_future(first_chunk())
+        await asyncio.sleep(0.05)
+        shared = next(iter(flight._streams.values()))
+        assert shared.task is not None and not shared.task.done()
+
+        waiting.cancel()
+        await asyncio.sleep(0.05)
+        assert shared.task.done() and shared.done
+        assert not flight._streams
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=2))
+    assert events == ["closed"]
+
+
+def main():
+    """Run all single-flight tests"""
+    tests = [
+        ("Coalesced Calls", test_concurrent_calls_share_one_upstream_call),
+        ("Stream Fan-Out", test_stream_fans_out_to_every_subscriber),
+        ("Async Coalescing", test_async_calls_and_streams_are_coalesced),
+        ("Async Stream Abandoned", test_async_stream_stops_when_last_subscriber_leaves),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Offline Tests for the Streaming Utilities
+Feeds synthetic token streams through the coalescing and metrics helpers
+"""
+
+import asyncio
+import sys
+import time
+
+from streaming import coalesce_chunks, coalesce_chunks_async, measure_stream
+
+
+def deltas(count, text="ab", delay=0.0):
+    for _ in range(count):
+        if delay:
+            time.sleep(delay)
+        yield text
+
+
+def test_first_chunk_immediate_then_batched_by_size():
+    """The first delta passes straight through; the rest are joined into min_chars batches"""
+    chunks = list(coalesce_chunks(deltas(21), min_chars=10, max_delay_s=60))
+
+    assert chunks[0] == "ab"
+    assert "".join(chunks) == "ab" * 21
+    assert len(chunks) == 5 and all(len(chunk) == 10 for chunk in chunks[1:])
+
+
+def test_delay_flushes_slow_streams_and_failures_keep_buffered_text():
+    """A slow stream flushes on the delay; text buffered before a failure is still delivered"""
+    chunks = list(coalesce_chunks(deltas(4, delay=0.02), min_chars=1000, max_delay_s=0.01))
+    assert chunks == ["ab"] * 4
+
+    def failing():
+        yield from deltas(3)
+        raise ConnectionError("connection reset")
+
+    received = []
+    try:
+        for chunk in coalesce_chunks(failing(), min_chars=1000, max_delay_s=60):
+            received.append(chunk)
+    except ConnectionError:
+        assert received == ["ab", "abab"]
+    else:
+        raise AssertionError("expected ConnectionError")
+
+
+def test_async_timer_flushes_during_a_stall():
+    """The async variant flushes buffered text when the upstream stalls"""
+    async def stalling():
+        yield "first"
+        yield "buffered"
+        await asyncio.sleep(0.3)
+        yield "late"
+
+    async def collect():
+        received = []
+        start = time.perf_counter()
+        async for chunk in coalesce_chunks_async(stalling(), min_chars=1000, max_delay_s=0.05):
+            received.append((chunk, time.perf_counter() - start))
+        return received
+
+    received = asyncio.run(collect())
+    assert [chunk for chunk, _ in received] == ["first", "buffered", "late"]
+    assert received[1][1] < 0.2
+
+
+def test_measure_stream_records_metrics():
+    """measure_stream reports TTFT, chunk count and completion"""
+    metrics = []
+    start = time.perf_counter()
+    assert list(measure_stream(deltas(3, delay=0.01), start, metrics.append)) == ["ab"] * 3
+
+    assert metrics[0].completed and metrics[0].chunks == 3
+    assert 0.005 < metrics[0].ttft_s < metrics[0].duration_s
+
+
+def main():
+    """Run all streaming utility tests"""
+    tests = [
+        ("Size Batching", test_first_chunk_immediate_then_batched_by_size),
+        ("Delay Flush and Failures", test_delay_flushes_slow_streams_and_failures_keep_buffered_text),
+        ("Async Stall Flush", test_async_timer_flushes_during_a_stall),
+        ("Stream Metrics", test_measure_stream_records_metrics),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Offline Tests for UpstashVectorClient
+Exercises client-side behaviour against an in-memory stand-in for the
+upstash_vector Index, so no credentials or network access are needed
+"""
+
+import asyncio
+import sys
+import threading
+
+import upstash_client
+from fakes import make_upstash_client
+from settings import Settings
+from upstash_client import AsyncUpstashVectorClient, UpsertError
+
+upstash_client.UPSERT_RETRY_DELAY_MS = 0  # No backoff sleeps in tests
+
+
+class FakeIndex:
+    """Records calls made by UpstashVectorClient; optionally fails some batches"""
+
+    def __init__(self, fail_times=None):
+        self.upserted = []
+        self.fail_times = dict(fail_times or {})
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def upsert(self, batch):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            first_id = batch[0][0]
+            if self.fail_times.get(first_id, 0) > 0:
+                self.fail_times[first_id] -= 1
+                raise ConnectionError(f"transient failure for {first_id}")
+            self.upserted.extend(batch)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class FakeQueryIndex:
+    """Answers queries by echoing the query text (no batched endpoint)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def query(self, **params):
+        self.calls.append("query")
+        return [{"id": params["data"], "score": 1.0}]
+
+
+class FakeBatchQueryIndex(FakeQueryIndex):
+    """Adds the SDK's batched query_many endpoint"""
+
+    def query_many(self, queries):
+        self.calls.append("query_many")
+        return [self.query(**params) for params in queries]
+
+
+def generate_items(count):
+    for i in range(count):
+        yield (f"id-{i}", f"text {i}", {"i": i})
+
+
+def test_batched_upsert_retries_failed_batch_only():
+    """A transient failure retries just that batch; the report covers every batch"""
+    index = FakeIndex(fail_times={"id-20": 1})
+    report = make_upstash_client(index).upsert_texts(generate_items(45), batch_size=10, max_concurrency=3)
+
+    assert report["items"] == 45
+    assert report["batches"] == 5
+    assert report["failed_batches"] == []
+    assert [t["size"] for t in report["batch_timings"]] == [10, 10, 10, 10, 5]
+    assert report["batch_timings"][2]["attempts"] == 2
+    assert sorted(item[0] for item in index.upserted) == sorted(f"id-{i}" for i in range(45))
+    assert index.max_in_flight <= 3
+
+
+def test_batched_upsert_reports_permanent_failures():
+    """Batches that exhaust retries are reported without losing the others"""
+    index = FakeIndex(fail_times={"id-10": 5})
+    stored = []
+    try:
+        make_upstash_client(index).upsert_texts(
+            generate_items(30), batch_size=10, max_retries=2,
+            on_batch=lambda batch, timing: stored.extend(item[0] for item in batch)
+        )
+    except UpsertError as error:
+        assert [b["batch"] for b in error.report["failed_batches"]] == [1]
+        assert error.report["items"] == 20
+        assert len(index.upserted) == 20
+        # Only stored batches are reported to on_batch (e.g. for checkpointing)
+        assert sorted(stored) == sorted(item[0] for item in index.upserted)
+        return
+    raise AssertionError("expected UpsertError")
+
+
+def test_upsert_rejects_invalid_batch_settings():
+    """Zero retries, concurrency or batch size fail fast instead of mid-upsert"""
+    index = FakeIndex()
+    for settings in ({"batch_size": 0}, {"batch_size": 10, "max_concurrency": 0}, {"batch_size": 10, "max_retries": 0}):
+        try:
+            make_upstash_client(index).upsert_texts(generate_items(5), **settings)
+        except ValueError:
+            continue
+        raise AssertionError(f"expected ValueError for {settings}")
+    assert index.upserted == []
+
+
+def test_query_many_batches_and_preserves_order():
+    """One batched request when supported, ordered fan-out otherwise"""
+    questions = [f"question {i}" for i in range(12)]
+
+    index = FakeBatchQueryIndex()
+    results = make_upstash_client(index).query_many(questions, top_k=3, filters="type = 'skill'")
+    assert [r[0]["id"] for r in results] == questions
+    assert index.calls[0] == "query_many"
+
+    index = FakeQueryIndex()
+    results = make_upstash_client(index).query_many(questions, top_k=3, max_concurrency=4)
+    assert [r[0]["id"] for r in results] == questions
+    assert index.calls == ["query"] * 12
+
+
+def test_query_cache_hits_evicts_and_invalidates():
+    """Repeat queries are served from the LRU; writes to the index clear it"""
+    class WritableQueryIndex(FakeQueryIndex):
+        def delete(self, ids):
+            self.calls.append("delete")
+
+    index = WritableQueryIndex()
+    reader = make_upstash_client(index, cache_size=2, url="https://cached-index")
+    writer = make_upstash_client(index, url="https://cached-index")
+
+    reader.query_text("What are your skills?")
+    reader.query_text("  what are   your SKILLS? ")
+    assert index.calls == ["query"]
+    reader.query_text("What are your skills?", top_k=3)
+    reader.query_text("What are your skills?", filters="type = 'skill'")
+    assert index.calls == ["query"] * 3
+    assert reader.cache_stats()["evictions"] == 1
+
+    writer.delete(["old-chunk"])
+    reader.query_text("What are your skills?", filters="type = 'skill'")
+    assert index.calls[-1] == "query"
+    stats = reader.cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 4 and stats["size"] == 1
+
+    reader._cache.ttl_seconds = 0
+    reader.query_text("Education?")
+    reader.query_text("Education?")
+    assert index.calls[-2:] == ["query", "query"]
+
+
+def test_query_racing_a_write_is_not_cached():
+    """Results fetched while another client writes the index are not cached"""
+    class RacingIndex(FakeQueryIndex):
+        raced = False
+
+        def query(self, **params):
+            if not self.raced:
+                # Another thread writes and then queries (resyncing the cache) mid-request
+                self.raced = True
+                writer.delete(["old-chunk"])
+                reader.query_text("Education?")
+            return super().query(**params)
+
+        def delete(self, ids):
+            pass
+
+    index = RacingIndex()
+    reader = make_upstash_client(index, cache_size=2, url="https://racing-index")
+    writer = make_upstash_client(index, url="https://racing-index")
+
+    reader.query_text("What are your skills?")
+    reader.query_text("What are your skills?")
+    assert index.calls == ["query"] * 3
+    reader.query_text("What are your skills?")
+    assert index.calls == ["query"] * 3
+
+
+def test_async_clients_share_pool_and_enforce_timeouts():
+    """Async clients on one loop share an AsyncIndex; slow calls time out, even with timeout=0"""
+    Settings.UPSTASH_VECTOR_REST_URL = Settings.UPSTASH_VECTOR_REST_URL or "https://example.upstash.io"
+    Settings.UPSTASH_VECTOR_REST_READONLY_TOKEN = Settings.UPSTASH_VECTOR_REST_READONLY_TOKEN or "test-token"
+
+    class SlowIndex:
+        async def query(self, **params):
+            await asyncio.sleep(1)
+
+        async def query_many(self, queries):
+            return [[{"id": q["data"]}] for q in queries]
+
+    async def scenario():
+        first = AsyncUpstashVectorClient(read_only=True)
+        second = AsyncUpstashVectorClient(read_only=True)
+        assert first.index is second.index
+
+        first.index = SlowIndex()
+        results = await first.query_many(["a", "b"], top_k=1)
+        assert [r[0]["id"] for r in results] == ["a", "b"]
+        for timeout in (0.05, 0):
+            try:
+                await first.query_text(f"slow {timeout}", timeout=timeout)
+            except TimeoutError as error:
+                assert f"after {timeout}s" in str(error)
+                continue
+            raise AssertionError(f"expected TimeoutError for timeout={timeout}")
+
+    asyncio.run(scenario())
+
+
+def main():
+    """Run all Upstash client tests"""
+    tests = [
+        ("Batched Upsert Retries", test_batched_upsert_retries_failed_batch_only),
+        ("Batched Upsert Failures", test_batched_upsert_reports_permanent_failures),
+        ("Invalid Batch Settings", test_upsert_rejects_invalid_batch_settings),
+        ("Batched Queries", test_query_many_batches_and_preserves_order),
+        ("Query Cache", test_query_cache_hits_evicts_and_invalidates),
+        ("Query Racing a Write", test_query_racing_a_write_is_not_cached),
+        ("Async Pool and Timeouts", test_async_clients_share_pool_and_enforce_timeouts),
+    ]
+
+    failed = 0
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            print(f"  ✓ PASS: {test_name}")
+        except Exception as e:
+            failed += 1
+            print(f"  ✗ FAIL: {test_name} ({e})")
+
+    print(f"\n  {len(tests) - failed}/{len(tests)} tests passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,61 @@ Upstash Vector Client
 Wrapper around Upstash Vector Database for automatic text embedding and semantic search
 """
 
-from typing import Iterable, Tuple, Dict, Any, List, Optional
-from upstash_vector import Index
+import asyncio
+import json
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence, Tuple, Dict, Any, List, Optional
+from cache import TTLCache
 from settings import Settings
+from single_flight import AsyncSingleFlight
+
+if TYPE_CHECKING:  # The SDK is imported when a client is created, keeping cold starts fast
+    from upstash_vector import AsyncIndex
+
+DEFAULT_UPSERT_BATCH_SIZE = 100
+DEFAULT_UPSERT_CONCURRENCY = 4
+UPSERT_MAX_RETRIES = 3
+UPSERT_RETRY_DELAY_MS = 1000
+DEFAULT_QUERY_CONCURRENCY = 8
+DEFAULT_ASYNC_TIMEOUT_S = 10.0
+
+# Bumped on every write to an index URL; query caches of all clients on
+# that index are cleared when they see a new generation
+_write_generations: Dict[str, int] = {}
+
+
+def _mark_written(url: str) -> None:
+    _write_generations[url] = _write_generations.get(url, 0) + 1
+
+
+# Identical concurrent async queries share one request
+_async_query_flight = AsyncSingleFlight()
+
+# One AsyncIndex (and so one keep-alive pool) per event loop and credential
+_async_indexes: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], AsyncIndex]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+class UpsertError(RuntimeError):
+    """Raised when one or more upsert batches fail after all retries"""
+    
+    def __init__(self, message: str, report: Dict[str, Any]):
+        super().__init__(message)
+        self.report = report
+
+
+def iter_batches(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Lazily split an iterable into lists of at most batch_size items"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
 
 
 class UpstashVectorClient:
@@ -14,41 +66,53 @@ class UpstashVectorClient:
     Handles automatic text embedding using mixedbread-ai/mxbai-embed-large-v1
     """
     
-    def __init__(self, read_only: bool = True):
+    def __init__(
+        self,
+        read_only: bool = True,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None
+    ):
         """
         Initialize Upstash Vector client
         
         Args:
             read_only: If True, uses read-only token; if False, uses read-write token
+            cache_size: Cached query_text results kept in an LRU (0 disables;
+                defaults to Settings.QUERY_CACHE_SIZE)
+            cache_ttl: Seconds a cached result stays valid (defaults to
+                Settings.QUERY_CACHE_TTL_S)
             
         Raises:
             ValueError: If credentials are missing
         """
-        url = Settings.UPSTASH_VECTOR_REST_URL
-        token = (
-            Settings.UPSTASH_VECTOR_REST_READONLY_TOKEN 
-            if read_only 
-            else Settings.UPSTASH_VECTOR_REST_TOKEN
-        )
-        
-        if not url:
-            raise ValueError("Missing UPSTASH_VECTOR_REST_URL in environment")
-        
-        if not token:
-            token_type = "READONLY_TOKEN" if read_only else "TOKEN"
-            raise ValueError(f"Missing UPSTASH_VECTOR_REST_{token_type} in environment")
+        url, token = _credentials(read_only)
         
         try:
+            from upstash_vector import Index
+            
             self.index = Index(url=url, token=token)
             self.read_only = read_only
             print(f"✓ Upstash Vector client initialized ({'read-only' if read_only else 'read-write'} mode)")
         except Exception as error:
             raise RuntimeError(f"Failed to initialize Upstash Vector client: {error}")
+        
+        self._init_cache(url, cache_size, cache_ttl)
+    
+    def _init_cache(self, url: str, cache_size: Optional[int], cache_ttl: Optional[float]) -> None:
+        self._url = url
+        cache_size = Settings.QUERY_CACHE_SIZE if cache_size is None else cache_size
+        cache_ttl = Settings.QUERY_CACHE_TTL_S if cache_ttl is None else cache_ttl
+        self._cache = TTLCache(cache_size, cache_ttl) if cache_size > 0 else None
+        self._cache_generation = _write_generations.get(url, 0)
     
     def upsert_texts(
         self, 
-        items: Iterable[Tuple[str, str, Dict[str, Any]]]
-    ) -> None:
+        items: Iterable[Tuple[str, str, Dict[str, Any]]],
+        batch_size: Optional[int] = None,
+        max_concurrency: int = DEFAULT_UPSERT_CONCURRENCY,
+        max_retries: int = UPSERT_MAX_RETRIES,
+        on_batch: Optional[Callable[[List[Tuple], Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Upsert text data with automatic embedding
         
@@ -57,10 +121,21 @@ class UpstashVectorClient:
                 - id: Unique identifier for the vector
                 - text: Raw text to embed (Upstash will auto-embed)
                 - metadata: Dictionary of metadata to store
+            batch_size: If set, consume items lazily and upsert them in batches
+                of this size instead of one request for everything
+            max_concurrency: Maximum batches in flight at once (batched mode)
+            max_retries: Attempts per batch before it is reported as failed
+            on_batch: Called in the calling thread with each batch's items and
+                timing as soon as that batch is stored (e.g. to checkpoint progress)
+        
+        Returns:
+            Summary dict with item/batch counts, total seconds, items_per_second
+            and per-batch timings
         
         Raises:
             RuntimeError: If client is in read-only mode
-            Exception: If upsert fails
+            ValueError: If batch_size, max_concurrency or max_retries is below 1
+            UpsertError: If any batch still fails after retries (carries the report)
         
         Example:
             >>> client = UpstashVectorClient(read_only=False)
@@ -69,19 +144,131 @@ class UpstashVectorClient:
             ...     ("doc2", "JavaScript is used for web development", {"source": "docs"})
             ... ]
             >>> client.upsert_texts(items)
+            >>> client.upsert_texts(large_generator, batch_size=100, max_concurrency=4)
         """
         if self.read_only:
             raise RuntimeError("Cannot upsert in read-only mode. Initialize with read_only=False")
-        
-        items_list = list(items)
-        print(f"📤 Upserting {len(items_list)} items to Upstash Vector...")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if max_retries < 1:
+            raise ValueError(f"max_retries must be at least 1, got {max_retries}")
         
         try:
-            self.index.upsert(items_list)
-            print(f"✓ Successfully upserted {len(items_list)} items")
-        except Exception as error:
-            print(f"❌ Upsert failed: {error}")
-            raise
+            return self._upsert(items, batch_size, max_concurrency, max_retries, on_batch)
+        finally:
+            self._invalidate_cache()
+    
+    def _upsert(
+        self,
+        items: Iterable[Tuple[str, str, Dict[str, Any]]],
+        batch_size: Optional[int],
+        max_concurrency: int,
+        max_retries: int,
+        on_batch: Optional[Callable[[List[Tuple], Dict[str, Any]], None]]
+    ) -> Dict[str, Any]:
+        if batch_size is None:
+            items_list = list(items)
+            print(f"📤 Upserting {len(items_list)} items to Upstash Vector...")
+            start_time = time.perf_counter()
+            
+            try:
+                self.index.upsert(items_list)
+                print(f"✓ Successfully upserted {len(items_list)} items")
+            except Exception as error:
+                print(f"❌ Upsert failed: {error}")
+                raise
+            
+            seconds = time.perf_counter() - start_time
+            timing = {"batch": 0, "size": len(items_list), "seconds": seconds, "attempts": 1}
+            if on_batch:
+                on_batch(items_list, timing)
+            return self._upsert_report([timing], [], seconds)
+        
+        return self._upsert_batched(items, batch_size, max_concurrency, max_retries, on_batch)
+    
+    def _upsert_batch(self, batch_number: int, batch: List[Tuple], max_retries: int) -> Dict[str, Any]:
+        """Upsert one batch, retrying it on its own with linear backoff"""
+        start_time = time.perf_counter()
+        for attempt in range(1, max_retries + 1):
+            try:
+                self.index.upsert(batch)
+                return {
+                    "batch": batch_number,
+                    "size": len(batch),
+                    "seconds": time.perf_counter() - start_time,
+                    "attempts": attempt
+                }
+            except Exception as error:
+                print(f"⚠️ Batch {batch_number} failed (attempt {attempt}/{max_retries}): {error}")
+                if attempt == max_retries:
+                    raise
+                time.sleep((UPSERT_RETRY_DELAY_MS * attempt) / 1000)
+    
+    def _upsert_batched(
+        self,
+        items: Iterable[Tuple[str, str, Dict[str, Any]]],
+        batch_size: int,
+        max_concurrency: int,
+        max_retries: int,
+        on_batch: Optional[Callable[[List[Tuple], Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Stream batches to Upstash with at most max_concurrency requests in flight"""
+        print(f"📤 Upserting to Upstash Vector in batches of {batch_size} (concurrency={max_concurrency})...")
+        start_time = time.perf_counter()
+        timings: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+        
+        def collect(done) -> None:
+            for future in done:
+                batch_number, batch = in_flight.pop(future)
+                try:
+                    timing = future.result()
+                except Exception as error:
+                    failed.append({"batch": batch_number, "size": len(batch), "error": str(error)})
+                    continue
+                timings.append(timing)
+                if on_batch:
+                    on_batch(batch, timing)
+        
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for batch_number, batch in enumerate(iter_batches(items, batch_size)):
+                # Bound memory: with max_concurrency batches in flight, this one
+                # waits for a slot, so at most max_concurrency + 1 are held
+                if len(in_flight) >= max_concurrency:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                future = executor.submit(self._upsert_batch, batch_number, batch, max_retries)
+                in_flight[future] = (batch_number, batch)
+            collect(wait(in_flight).done)
+        
+        report = self._upsert_report(timings, failed, time.perf_counter() - start_time)
+        
+        if failed:
+            print(f"❌ {len(failed)} of {report['batches']} batches failed")
+            raise UpsertError(f"{len(failed)} upsert batch(es) failed after {max_retries} attempts", report)
+        
+        print(f"✓ Successfully upserted {report['items']} items in {report['batches']} batches "
+              f"({report['items_per_second']:.1f} items/s)")
+        return report
+    
+    @staticmethod
+    def _upsert_report(
+        timings: List[Dict[str, Any]],
+        failed: List[Dict[str, Any]],
+        seconds: float
+    ) -> Dict[str, Any]:
+        items = sum(timing["size"] for timing in timings)
+        return {
+            "items": items,
+            "batches": len(timings) + len(failed),
+            "failed_batches": sorted(failed, key=lambda batch: batch["batch"]),
+            "seconds": seconds,
+            "items_per_second": items / seconds if seconds > 0 else 0.0,
+            "batch_timings": sorted(timings, key=lambda timing: timing["batch"])
+        }
     
     def query_text(
         self,
@@ -111,28 +298,141 @@ class UpstashVectorClient:
             >>> for result in results:
             ...     print(f"Score: {result['score']}, Text: {result['metadata']['content']}")
         """
+        cache_key = None
+        if self._cache is not None:
+            generation = self._sync_cache_generation()
+            cache_key = self._cache_key(query, top_k, include_metadata, include_vectors, filters)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                print(f"⚡ Cache hit: '{query[:50]}...' (top_k={top_k})")
+                return list(cached)
+        
         print(f"🔍 Querying Upstash Vector: '{query[:50]}...' (top_k={top_k})")
         
         try:
-            query_params = {
-                "data": query,
-                "top_k": top_k,
-                "include_metadata": include_metadata,
-                "include_vectors": include_vectors
-            }
-            
-            if filters:
-                query_params["filter"] = filters
-            
+            query_params = self._query_params(query, top_k, include_metadata, include_vectors, filters)
             results = self.index.query(**query_params)
             
             print(f"✓ Found {len(results)} results")
+            # A write that landed while the query ran may have changed these results
+            if cache_key is not None and _write_generations.get(self._url, 0) == generation:
+                self._cache.set(cache_key, list(results))
             return results
             
         except Exception as error:
             print(f"❌ Query failed: {error}")
             raise
     
+    @staticmethod
+    def _cache_key(
+        query: str,
+        top_k: int,
+        include_metadata: bool,
+        include_vectors: bool,
+        filters: Optional[Dict[str, Any]]
+    ) -> Tuple:
+        # Case and whitespace differences map to the same entry
+        normalized = " ".join(query.split()).casefold()
+        filter_key = json.dumps(filters, sort_keys=True, default=str) if filters else ""
+        return (normalized, top_k, include_metadata, include_vectors, filter_key)
+    
+    def _sync_cache_generation(self) -> int:
+        """Clear the cache if the index was written since; returns the current generation"""
+        generation = _write_generations.get(self._url, 0)
+        if generation != self._cache_generation:
+            self._cache.clear()
+            self._cache_generation = generation
+        return generation
+    
+    def _invalidate_cache(self) -> None:
+        """Mark the index as written so every client's query cache is cleared"""
+        _mark_written(self._url)
+        if self._cache is not None:
+            self._sync_cache_generation()
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Retrieval cache counters
+        
+        Returns:
+            Dictionary with enabled, size, hits, misses, evictions and hit_rate
+        """
+        if self._cache is None:
+            return {"enabled": False, "size": 0, "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0}
+        return {"enabled": True, **self._cache.stats()}
+    
+    @staticmethod
+    def _query_params(
+        query: str,
+        top_k: int,
+        include_metadata: bool,
+        include_vectors: bool,
+        filters: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        query_params = {
+            "data": query,
+            "top_k": top_k,
+            "include_metadata": include_metadata,
+            "include_vectors": include_vectors
+        }
+        
+        if filters:
+            query_params["filter"] = filters
+        
+        return query_params
+    
+    def query_many(
+        self,
+        queries: Sequence[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        include_vectors: bool = False,
+        max_concurrency: int = DEFAULT_QUERY_CONCURRENCY
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run many text queries, using one batched request when the SDK supports it
+        Falls back to a bounded parallel fan-out of single queries otherwise.
+        
+        Args:
+            queries: Raw text queries (auto-embedded by Upstash)
+            top_k: Number of results per query
+            filters: Optional metadata filters applied to every query
+            include_metadata: Whether to include metadata in results
+            include_vectors: Whether to include vector embeddings in results
+            max_concurrency: Maximum parallel requests in fan-out mode
+        
+        Returns:
+            One result list per query, in input order
+        
+        Example:
+            >>> client = UpstashVectorClient(read_only=True)
+            >>> skills, education = client.query_many(["Skills?", "Education?"], top_k=3)
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        
+        print(f"🔍 Querying Upstash Vector with {len(queries)} queries (top_k={top_k})")
+        requests = [
+            self._query_params(query, top_k, include_metadata, include_vectors, filters)
+            for query in queries
+        ]
+        
+        try:
+            if hasattr(self.index, "query_many"):
+                results = self.index.query_many(queries=requests)
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_concurrency, len(requests))) as executor:
+                    results = list(executor.map(lambda params: self.index.query(**params), requests))
+            
+            print(f"✓ Found {sum(len(result) for result in results)} results across {len(queries)} queries")
+            return results
+            
+        except Exception as error:
+            print(f"❌ Batch query failed: {error}")
+            raise
+    
     def info(self) -> Dict[str, Any]:
         """
         Get information about the vector database
@@ -152,6 +452,29 @@ class UpstashVectorClient:
             print(f"❌ Failed to get index info: {error}")
             raise
     
+    def list_ids(self, page_size: int = 1000) -> List[str]:
+        """
+        IDs of every vector in the index, paged through the range API
+        
+        Args:
+            page_size: IDs fetched per request
+            
+        Returns:
+            List of vector IDs
+        """
+        ids: List[str] = []
+        cursor = ""
+        try:
+            while True:
+                page = self.index.range(cursor=cursor, limit=page_size, include_vectors=False, include_metadata=False)
+                ids.extend(vector.id for vector in page.vectors)
+                cursor = page.next_cursor
+                if not cursor:
+                    return ids
+        except Exception as error:
+            print(f"❌ Failed to list vector IDs: {error}")
+            raise
+    
     def delete(self, ids: List[str]) -> None:
         """
         Delete vectors by ID
@@ -171,6 +494,8 @@ class UpstashVectorClient:
         except Exception as error:
             print(f"❌ Delete failed: {error}")
             raise
+        finally:
+            self._invalidate_cache()
     
     def reset(self) -> None:
         """
@@ -188,6 +513,179 @@ class UpstashVectorClient:
         except Exception as error:
             print(f"❌ Reset failed: {error}")
             raise
+        finally:
+            self._invalidate_cache()
+
+
+def _credentials(read_only: bool) -> Tuple[str, str]:
+    """Resolve the Upstash URL and token for the requested access mode"""
+    url = Settings.UPSTASH_VECTOR_REST_URL
+    token = (
+        Settings.UPSTASH_VECTOR_REST_READONLY_TOKEN
+        if read_only
+        else Settings.UPSTASH_VECTOR_REST_TOKEN
+    )
+    
+    if not url:
+        raise ValueError("Missing UPSTASH_VECTOR_REST_URL in environment")
+    
+    if not token:
+        token_type = "READONLY_TOKEN" if read_only else "TOKEN"
+        raise ValueError(f"Missing UPSTASH_VECTOR_REST_{token_type} in environment")
+    
+    return url, token
+
+
+class AsyncUpstashVectorClient:
+    """
+    asyncio-native client for Upstash Vector Database
+    Mirrors UpstashVectorClient. All clients created on the same event loop
+    with the same credentials share one AsyncIndex and therefore one
+    keep-alive HTTP connection pool. Every call accepts a timeout.
+    There is no query cache: concurrent identical queries are coalesced, but
+    every query reaches Upstash. Writes still clear the query caches of
+    UpstashVectorClient instances on the same index.
+    """
+    
+    def __init__(self, read_only: bool = True, timeout: Optional[float] = DEFAULT_ASYNC_TIMEOUT_S):
+        """
+        Initialize async Upstash Vector client
+        Must be called while an event loop is running.
+        
+        Args:
+            read_only: If True, uses read-only token; if False, uses read-write token
+            timeout: Default per-call timeout in seconds (None for no limit)
+            
+        Raises:
+            ValueError: If credentials are missing
+        """
+        url, token = _credentials(read_only)
+        loop_indexes = _async_indexes.setdefault(asyncio.get_running_loop(), {})
+        
+        if (url, token) not in loop_indexes:
+            from upstash_vector import AsyncIndex
+            
+            loop_indexes[(url, token)] = AsyncIndex(url=url, token=token)
+        
+        self.index = loop_indexes[(url, token)]
+        self.read_only = read_only
+        self.timeout = timeout
+        self._url = url
+    
+    async def _call(self, operation, timeout: Optional[float], **kwargs):
+        # None means the client default; 0 is a real (immediate) limit
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(operation(**kwargs), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Upstash Vector request timed out after {timeout}s")
+    
+    async def _write(self, operation, timeout: Optional[float], **kwargs):
+        try:
+            return await self._call(operation, timeout, **kwargs)
+        finally:
+            _mark_written(self._url)
+    
+    async def upsert_texts(
+        self,
+        items: Iterable[Tuple[str, str, Dict[str, Any]]],
+        timeout: Optional[float] = None
+    ) -> None:
+        """
+        Upsert text data with automatic embedding
+        
+        Raises:
+            RuntimeError: If client is in read-only mode
+            TimeoutError: If the call exceeds its timeout
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot upsert in read-only mode. Initialize with read_only=False")
+        
+        await self._write(self.index.upsert, timeout, vectors=list(items))
+    
+    async def query_text(
+        self,
+        query: str,
+        top_k: int = 5,
+        include_metadata: bool = True,
+        include_vectors: bool = False,
+        filters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the vector database with raw text
+        Identical queries already in flight on the same index share its result.
+        
+        Raises:
+            TimeoutError: If the call exceeds its timeout
+        """
+        query_params = UpstashVectorClient._query_params(query, top_k, include_metadata, include_vectors, filters)
+        flight_key = (
+            id(self.index), query, top_k, include_metadata, include_vectors,
+            json.dumps(filters, sort_keys=True, default=str)
+        )
+        return await _async_query_flight.do(
+            flight_key,
+            lambda: self._call(self.index.query, timeout, **query_params)
+        )
+    
+    async def query_many(
+        self,
+        queries: Sequence[str],
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        include_vectors: bool = False,
+        timeout: Optional[float] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run many text queries in one batched request, results in input order
+        
+        Raises:
+            TimeoutError: If the call exceeds its timeout
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        
+        requests = [
+            UpstashVectorClient._query_params(query, top_k, include_metadata, include_vectors, filters)
+            for query in queries
+        ]
+        return await self._call(self.index.query_many, timeout, queries=requests)
+    
+    async def info(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Get information about the vector database"""
+        info_result = await self._call(self.index.info, timeout)
+        return {
+            'dimension': getattr(info_result, 'dimension', None),
+            'vectorCount': getattr(info_result, 'vector_count', getattr(info_result, 'vectorCount', 0)),
+            'similarityFunction': getattr(info_result, 'similarity_function', getattr(info_result, 'similarityFunction', 'unknown'))
+        }
+    
+    async def delete(self, ids: List[str], timeout: Optional[float] = None) -> None:
+        """
+        Delete vectors by ID
+        
+        Raises:
+            RuntimeError: If client is in read-only mode
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot delete in read-only mode. Initialize with read_only=False")
+        
+        await self._write(self.index.delete, timeout, ids=ids)
+    
+    async def reset(self, timeout: Optional[float] = None) -> None:
+        """
+        Delete all vectors from the index
+        
+        Raises:
+            RuntimeError: If client is in read-only mode
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot reset in read-only mode. Initialize with read_only=False")
+        
+        await self._write(self.index.reset, timeout)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+"""
+Vector Client Factory
+Selects and shares the vector client for the configured backend
+Kept apart from local_vector_client so that importing the factory loads
+neither NumPy nor the Upstash SDK; only the selected backend is imported,
+when the client is first built.
+"""
+
+from client_registry import credentials_fingerprint, registry
+from settings import Settings
+
+
+def create_vector_client(read_only: bool = True):
+    """
+    Create the vector client selected by Settings.VECTOR_BACKEND
+
+    Args:
+        read_only: Passed through to the selected client
+
+    Returns:
+        UpstashVectorClient (default) or LocalVectorClient when VECTOR_BACKEND=local.
+        The local client opens the index saved at LOCAL_VECTOR_PATH, if any.
+    """
+    if Settings.VECTOR_BACKEND == "local":
+        from local_vector_client import LocalVectorClient
+        return LocalVectorClient(
+            read_only=read_only,
+            path=Settings.LOCAL_VECTOR_PATH or None,
+            index_type=Settings.LOCAL_VECTOR_INDEX,
+            storage=Settings.LOCAL_VECTOR_STORAGE,
+            rescore=Settings.LOCAL_VECTOR_RESCORE
+        )
+
+    from upstash_client import UpstashVectorClient
+    return UpstashVectorClient(read_only=read_only)
+
+
+def get_vector_client(read_only: bool = True):
+    """
+    Return the process-wide vector client for the configured backend
+    Built once on first use and shared by later calls and threads. It is
+    rebuilt automatically when the backend settings or credentials change.
+    On the local backend, readers and writers share one read-write index,
+    since separate instances would be independent in-memory indexes and
+    upserts would never reach queries.
+
+    Args:
+        read_only: Whether to use the read-only client (Upstash only)
+
+    Returns:
+        Shared UpstashVectorClient or LocalVectorClient
+    """
+    if Settings.VECTOR_BACKEND == "local":
+        fingerprint = credentials_fingerprint(
+            Settings.LOCAL_VECTOR_PATH,
+            Settings.LOCAL_VECTOR_INDEX,
+            Settings.LOCAL_VECTOR_STORAGE,
+            str(Settings.LOCAL_VECTOR_RESCORE)
+        )
+        return registry.get("vector:local", lambda: create_vector_client(read_only=False), fingerprint)
+
+    token = Settings.UPSTASH_VECTOR_REST_READONLY_TOKEN if read_only else Settings.UPSTASH_VECTOR_REST_TOKEN
+    fingerprint = credentials_fingerprint(Settings.UPSTASH_VECTOR_REST_URL, token)
+    name = "vector:read-only" if read_only else "vector:read-write"
+    return registry.get(name, lambda: create_vector_client(read_only), fingerprint)
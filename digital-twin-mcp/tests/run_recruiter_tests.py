@@ -2,12 +2,15 @@ import json
 import time
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 import urllib.request
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'recruiter_queries.json')
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), 'TEST_RESULTS.md')
 ENDPOINT_ENV = os.getenv('DIGITAL_TWIN_MCP_ENDPOINT')
+# Questions in flight at once; set to 1 for sequential runs
+CONCURRENCY = int(os.getenv('RECRUITER_TEST_CONCURRENCY', '4'))
 
 
 def post_json(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -18,6 +21,45 @@ def post_json(url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         return json.loads(body)
 
 
+def run_question(endpoint: str, cat_name: str, q: str) -> Dict[str, Any]:
+    payload = {
+        'jsonrpc': '2.0',
+        'id': int(time.time() * 1000),
+        'method': 'tools/call',
+        'params': {
+            'name': 'query_digital_twin',
+            'arguments': {
+                'question': q
+            }
+        }
+    }
+
+    start = time.monotonic()
+    error = None
+    answer = ''
+    try:
+        resp = post_json(endpoint, payload)
+        if 'result' in resp and 'content' in resp['result'] and resp['result']['content']:
+            answer = resp['result']['content'][0].get('text', '')
+        elif 'error' in resp:
+            error = resp['error'].get('message', 'Unknown error')
+        else:
+            error = 'No result content returned'
+    except Exception as e:
+        error = str(e)
+    latency_ms = int((time.monotonic() - start) * 1000)
+
+    print(f"[{'OK' if error is None else 'ERR'}] {latency_ms}ms | {cat_name}: {q}")
+    return {
+        'category': cat_name,
+        'question': q,
+        'latency_ms': latency_ms,
+        'ok': error is None,
+        'error': error,
+        'answer_preview': (answer[:220] + '…') if len(answer) > 220 else answer
+    }
+
+
 def run_tests():
     with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
         config = json.load(f)
@@ -28,49 +70,15 @@ def run_tests():
         sys.exit(1)
 
     categories = config.get('categories', [])
-    results: List[Dict[str, Any]] = []
+    questions = [(cat['name'], q) for cat in categories for q in cat['questions']]
 
     total_start = time.monotonic()
 
-    for cat in categories:
-        cat_name = cat['name']
-        for q in cat['questions']:
-            payload = {
-                'jsonrpc': '2.0',
-                'id': int(time.time() * 1000),
-                'method': 'tools/call',
-                'params': {
-                    'name': 'query_digital_twin',
-                    'arguments': {
-                        'question': q
-                    }
-                }
-            }
-
-            start = time.monotonic()
-            error = None
-            answer = ''
-            try:
-                resp = post_json(endpoint, payload)
-                if 'result' in resp and 'content' in resp['result'] and resp['result']['content']:
-                    answer = resp['result']['content'][0].get('text', '')
-                elif 'error' in resp:
-                    error = resp['error'].get('message', 'Unknown error')
-                else:
-                    error = 'No result content returned'
-            except Exception as e:
-                error = str(e)
-            latency_ms = int((time.monotonic() - start) * 1000)
-
-            results.append({
-                'category': cat_name,
-                'question': q,
-                'latency_ms': latency_ms,
-                'ok': error is None,
-                'error': error,
-                'answer_preview': (answer[:220] + '…') if len(answer) > 220 else answer
-            })
-            print(f"[{'OK' if error is None else 'ERR'}] {latency_ms}ms | {cat_name}: {q}")
+    # Fan out with bounded concurrency; map() keeps results in input order
+    with ThreadPoolExecutor(max_workers=max(1, CONCURRENCY)) as executor:
+        results: List[Dict[str, Any]] = list(
+            executor.map(lambda item: run_question(endpoint, *item), questions)
+        )
 
     total_ms = int((time.monotonic() - total_start) * 1000)
 